@@ -0,0 +1,65 @@
+"""Store agent and analysis JSON columns as JSONB and add GIN indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-10-24 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+# JSON columns declared with JSONType on the Agent and Analysis models.
+# Databases built from the models with create_all hold them as plain json.
+JSON_COLUMNS = {
+    'agents': (
+        'configuration', 'capabilities', 'last_activity', 'performance_metrics',
+        'state', 'current_task', 'task_queue', 'last_error',
+    ),
+    'analysis': (
+        'results', 'input_data', 'data_sources', 'recommendations', 'tags',
+        'external_references',
+    ),
+}
+
+
+def upgrade() -> None:
+    """Convert json columns to jsonb and create the GIN indexes."""
+    inspector = sa.inspect(op.get_bind())
+
+    for table, names in JSON_COLUMNS.items():
+        columns = {column['name']: column for column in inspector.get_columns(table)}
+        for name in names:
+            column = columns.get(name)
+            if column is None or isinstance(column['type'], postgresql.JSONB):
+                continue
+            op.alter_column(
+                table, name,
+                type_=postgresql.JSONB(astext_type=sa.Text()),
+                postgresql_using=f'{name}::jsonb'
+            )
+
+    # The initial schema predates analysis.tags
+    if 'tags' not in {column['name'] for column in inspector.get_columns('analysis')}:
+        op.add_column('analysis', sa.Column(
+            'tags', postgresql.JSONB(astext_type=sa.Text()), nullable=True,
+            comment='Tags for classification and search'
+        ))
+
+    op.create_index('idx_analysis_tags_gin', 'analysis', ['tags'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'idx_analysis_results_gin', 'analysis', ['results'], unique=False,
+        postgresql_using='gin', postgresql_ops={'results': 'jsonb_path_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Drop the GIN indexes; columns stay jsonb, as in the initial schema."""
+    op.drop_index('idx_analysis_results_gin', table_name='analysis')
+    op.drop_index('idx_analysis_tags_gin', table_name='analysis')
@@ -0,0 +1,54 @@
+"""Store agents.last_heartbeat as a timezone-aware timestamp
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-10-24 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Convert last_heartbeat from an ISO-8601 string to timestamptz."""
+    columns = {
+        column['name']: column
+        for column in sa.inspect(op.get_bind()).get_columns('agents')
+    }
+    column = columns.get('last_heartbeat')
+
+    if column is None:
+        # The initial schema predates the heartbeat column
+        op.add_column('agents', sa.Column(
+            'last_heartbeat', sa.DateTime(timezone=True), nullable=True,
+            comment='Timestamp of last heartbeat'
+        ))
+    elif not isinstance(column['type'], sa.DateTime):
+        op.alter_column(
+            'agents', 'last_heartbeat',
+            type_=sa.DateTime(timezone=True),
+            postgresql_using="NULLIF(last_heartbeat, '')::timestamptz"
+        )
+    elif not column['type'].timezone:
+        op.alter_column(
+            'agents', 'last_heartbeat',
+            type_=sa.DateTime(timezone=True),
+            postgresql_using="last_heartbeat AT TIME ZONE 'UTC'"
+        )
+
+
+def downgrade() -> None:
+    """Convert last_heartbeat back to an ISO-8601 string."""
+    op.alter_column(
+        'agents', 'last_heartbeat',
+        type_=sa.String(length=50),
+        postgresql_using=(
+            "to_char(last_heartbeat AT TIME ZONE 'UTC', 'YYYY-MM-DD\"T\"HH24:MI:SS.US')"
+        )
+    )
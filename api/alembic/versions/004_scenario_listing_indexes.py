@@ -0,0 +1,49 @@
+"""Add composite indexes for scenario-scoped agent and analysis listings
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-10-24 09:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the composite listing indexes."""
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('analysis')}
+
+    # The initial schema predates the indexed analysis status and title
+    if 'status' not in columns:
+        op.add_column('analysis', sa.Column(
+            'status', sa.String(length=20), server_default='completed', nullable=False,
+            comment='Status of the analysis (in_progress, completed, failed)'
+        ))
+    if 'title' not in columns:
+        op.add_column('analysis', sa.Column(
+            'title', sa.String(length=200), nullable=True,
+            comment='Title of the analysis'
+        ))
+
+    op.create_index(
+        'idx_agents_scenario_type_status', 'agents',
+        ['scenario_id', 'type', 'status'], unique=False
+    )
+    # Covering index so list projections are served by an index-only scan
+    op.create_index(
+        'idx_analysis_scenario_status_created', 'analysis',
+        ['scenario_id', 'status', 'created_at'], unique=False,
+        postgresql_include=['confidence_score', 'title']
+    )
+
+
+def downgrade() -> None:
+    """Drop the composite listing indexes."""
+    op.drop_index('idx_analysis_scenario_status_created', table_name='analysis')
+    op.drop_index('idx_agents_scenario_type_status', table_name='agents')
@@ -0,0 +1,84 @@
+"""Create the agent_perf_summary materialized view
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-10-24 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+# Task counts understand both the indexed task queue ({'tasks': {...},
+# 'pending_order': [...]}) and legacy list-based queues
+CREATE_VIEW = """
+CREATE MATERIALIZED VIEW agent_perf_summary AS
+SELECT
+    a.id AS agent_id,
+    a.health_score,
+    a.error_count::integer AS error_count,
+    a.cpu_usage,
+    a.memory_usage,
+    CASE jsonb_typeof(a.task_queue)
+        WHEN 'object' THEN (
+            SELECT count(*) FROM jsonb_each(a.task_queue -> 'tasks') AS t(id, task)
+            WHERE t.task ->> 'status' = 'completed'
+        )
+        WHEN 'array' THEN (
+            SELECT count(*) FROM jsonb_array_elements(a.task_queue) AS t(task)
+            WHERE t.task ->> 'status' = 'completed'
+        )
+        ELSE 0
+    END AS tasks_completed,
+    CASE jsonb_typeof(a.task_queue)
+        WHEN 'object' THEN COALESCE(jsonb_array_length(a.task_queue -> 'pending_order'), 0)
+        WHEN 'array' THEN (
+            SELECT count(*) FROM jsonb_array_elements(a.task_queue) AS t(task)
+            WHERE t.task ->> 'status' = 'pending'
+        )
+        ELSE 0
+    END AS tasks_pending
+FROM agents AS a
+"""
+
+
+def upgrade() -> None:
+    """Create the view and the unique index REFRESH ... CONCURRENTLY requires."""
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('agents')}
+
+    # The initial schema predates the agent health and resource columns
+    missing = [
+        sa.Column('cpu_usage', sa.Float(), nullable=True, comment='Current CPU usage percentage'),
+        sa.Column('memory_usage', sa.Float(), nullable=True, comment='Current memory usage in MB'),
+        sa.Column(
+            'error_count', sa.Float(), server_default='0', nullable=False,
+            comment='Number of errors encountered'
+        ),
+        sa.Column(
+            'health_score', sa.Float(), server_default='100', nullable=False,
+            comment='Health score of the agent (0-100)'
+        ),
+        sa.Column(
+            'task_queue', postgresql.JSONB(astext_type=sa.Text()), nullable=True,
+            comment='Queue of pending tasks as JSON'
+        ),
+    ]
+    for column in missing:
+        if column.name not in columns:
+            op.add_column('agents', column)
+
+    op.execute(CREATE_VIEW)
+    op.execute(
+        'CREATE UNIQUE INDEX idx_agent_perf_summary_agent_id ON agent_perf_summary (agent_id)'
+    )
+
+
+def downgrade() -> None:
+    """Drop the view (and with it, its index)."""
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS agent_perf_summary')
@@ -0,0 +1,55 @@
+"""Store analysis recommendations one per row in a recommendations table
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-10-24 09:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+# Entries appended by the old Analysis.add_recommendation wrapped the
+# recommendation as {'id': ..., 'recommendation': {...}, 'created_at': ...}
+BACKFILL = """
+INSERT INTO recommendations (analysis_id, payload)
+SELECT a.id, COALESCE(r.value -> 'recommendation', r.value)
+FROM analysis AS a, jsonb_array_elements(a.recommendations) AS r
+WHERE jsonb_typeof(a.recommendations) = 'array'
+ORDER BY a.id
+"""
+
+
+def upgrade() -> None:
+    """Create the recommendations table and copy existing JSON recommendations into it."""
+    op.create_table('recommendations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('analysis_id', sa.Integer(), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.ForeignKeyConstraint(['analysis_id'], ['analysis.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_recommendations_id'), 'recommendations', ['id'], unique=False)
+    op.create_index(op.f('ix_recommendations_analysis_id'), 'recommendations', ['analysis_id'], unique=False)
+    op.create_index(
+        'idx_recommendations_payload_gin', 'recommendations', ['payload'], unique=False,
+        postgresql_using='gin', postgresql_ops={'payload': 'jsonb_path_ops'}
+    )
+
+    # The initial schema predates analysis.recommendations; 0002 made it jsonb where present
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('analysis')}
+    if 'recommendations' in columns:
+        op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    """Drop the recommendations table (and with it, its indexes)."""
+    op.drop_table('recommendations')
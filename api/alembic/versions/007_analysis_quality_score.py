@@ -0,0 +1,56 @@
+"""Add the generated analysis.quality_score column
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-10-24 09:50:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+# Average of the non-null quality scores (NULL when none are set)
+QUALITY_SCORE_EXPRESSION = (
+    "(COALESCE(confidence_score, 0) + COALESCE(completeness_score, 0)"
+    " + COALESCE(accuracy_score, 0) + COALESCE(relevance_score, 0))"
+    " / NULLIF((CASE WHEN confidence_score IS NULL THEN 0 ELSE 1 END)"
+    " + (CASE WHEN completeness_score IS NULL THEN 0 ELSE 1 END)"
+    " + (CASE WHEN accuracy_score IS NULL THEN 0 ELSE 1 END)"
+    " + (CASE WHEN relevance_score IS NULL THEN 0 ELSE 1 END), 0)"
+)
+
+
+def upgrade() -> None:
+    """Add quality_score as a stored generated column and index it."""
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('analysis')}
+
+    # The initial schema predates the completeness, accuracy and relevance scores
+    for name, label in (
+        ('completeness_score', 'Completeness'),
+        ('accuracy_score', 'Accuracy'),
+        ('relevance_score', 'Relevance'),
+    ):
+        if name not in columns:
+            op.add_column('analysis', sa.Column(
+                name, sa.Float(), nullable=True,
+                comment=f'{label} score of the analysis (0.0-1.0)'
+            ))
+
+    # Adding a stored generated column rewrites the table once to fill it
+    op.add_column('analysis', sa.Column(
+        'quality_score', sa.Float(),
+        sa.Computed(QUALITY_SCORE_EXPRESSION, persisted=True),
+        comment='Average of the non-null quality scores, computed by the database'
+    ))
+    op.create_index('idx_analysis_quality', 'analysis', ['quality_score'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the quality_score column (and with it, its index)."""
+    op.drop_index('idx_analysis_quality', table_name='analysis')
+    op.drop_column('analysis', 'quality_score')
@@ -0,0 +1,54 @@
+"""Store analysis.tags as a varchar array
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2025-10-24 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+# ALTER COLUMN ... USING cannot contain a subquery, so tags are copied
+# through a temporary column. Non-array values become NULL; the explicit
+# varchar(50) cast truncates overlong tags rather than failing the upgrade.
+COPY_TO_ARRAY = """
+UPDATE analysis
+SET tags_array = ARRAY(
+    SELECT t.tag::varchar(50)
+    FROM jsonb_array_elements_text(tags) WITH ORDINALITY AS t(tag, position)
+    ORDER BY t.position
+)
+WHERE jsonb_typeof(tags) = 'array'
+"""
+
+
+def upgrade() -> None:
+    """Convert the jsonb tags column to varchar(50)[] and rebuild its GIN index."""
+    op.drop_index('idx_analysis_tags_gin', table_name='analysis')
+    op.add_column('analysis', sa.Column('tags_array', postgresql.ARRAY(sa.String(length=50)), nullable=True))
+    op.execute(COPY_TO_ARRAY)
+    op.drop_column('analysis', 'tags')
+    op.alter_column(
+        'analysis', 'tags_array', new_column_name='tags',
+        comment='Tags for classification and search'
+    )
+    # The default array GIN opclass serves tags @> ARRAY[...] filters
+    op.create_index('idx_analysis_tags_gin', 'analysis', ['tags'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Convert tags back to jsonb and rebuild its GIN index."""
+    op.drop_index('idx_analysis_tags_gin', table_name='analysis')
+    op.alter_column(
+        'analysis', 'tags',
+        type_=postgresql.JSONB(astext_type=sa.Text()),
+        postgresql_using='to_jsonb(tags)'
+    )
+    op.create_index('idx_analysis_tags_gin', 'analysis', ['tags'], unique=False, postgresql_using='gin')
@@ -0,0 +1,52 @@
+"""Store analysis.processing_time as an interval
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2025-10-24 10:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Convert processing_time to an interval."""
+    columns = {
+        column['name']: column
+        for column in sa.inspect(op.get_bind()).get_columns('analysis')
+    }
+    column = columns.get('processing_time')
+
+    if column is None:
+        op.add_column('analysis', sa.Column(
+            'processing_time', sa.Interval(), nullable=True,
+            comment='Time taken to process the analysis (set as a timedelta)'
+        ))
+    elif isinstance(column['type'], sa.DateTime):
+        # The initial schema declared a timestamp, which holds no duration to keep
+        op.alter_column(
+            'analysis', 'processing_time',
+            type_=sa.Interval(),
+            postgresql_using='NULL::interval'
+        )
+    elif isinstance(column['type'], sa.String):
+        op.alter_column(
+            'analysis', 'processing_time',
+            type_=sa.Interval(),
+            postgresql_using="NULLIF(processing_time, '')::interval"
+        )
+
+
+def downgrade() -> None:
+    """Convert processing_time back to a string."""
+    op.alter_column(
+        'analysis', 'processing_time',
+        type_=sa.String(length=50),
+        postgresql_using='processing_time::text'
+    )
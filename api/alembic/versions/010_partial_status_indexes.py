@@ -0,0 +1,52 @@
+"""Replace the full review_status indexes with partial status indexes
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2025-10-24 10:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Drop the review_status indexes and create the partial indexes."""
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('analysis')}
+
+    # The initial schema predates the review columns
+    if 'reviewed_by' not in columns:
+        op.add_column('analysis', sa.Column(
+            'reviewed_by', sa.Integer(), sa.ForeignKey('users.id'), nullable=True,
+            comment='ID of the user who reviewed this analysis'
+        ))
+    if 'review_status' not in columns:
+        op.add_column('analysis', sa.Column(
+            'review_status', sa.String(length=20), nullable=True,
+            comment='Review status (pending, approved, rejected)'
+        ))
+
+    # Databases built with create_all carry both of these full indexes
+    op.execute('DROP INDEX IF EXISTS ix_analysis_review_status')
+    op.execute('DROP INDEX IF EXISTS idx_analysis_review_status')
+
+    op.create_index(
+        'idx_agents_running', 'agents', ['scenario_id'], unique=False,
+        postgresql_where=sa.text("status = 'running'")
+    )
+    op.create_index(
+        'idx_analysis_pending_review', 'analysis', ['reviewed_by'], unique=False,
+        postgresql_where=sa.text("review_status = 'pending'")
+    )
+
+
+def downgrade() -> None:
+    """Drop the partial indexes and restore the full review_status index."""
+    op.drop_index('idx_analysis_pending_review', table_name='analysis')
+    op.drop_index('idx_agents_running', table_name='agents')
+    op.create_index('idx_analysis_review_status', 'analysis', ['review_status'], unique=False)
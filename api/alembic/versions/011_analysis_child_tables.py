@@ -0,0 +1,72 @@
+"""Add data_sources and external_references tables and recommendations.priority
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2025-10-24 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+# Rows copied by 0006 predate the priority column
+BACKFILL_PRIORITY = """
+UPDATE recommendations
+SET priority = payload ->> 'priority'
+WHERE priority IS NULL AND payload ? 'priority'
+"""
+
+
+def upgrade() -> None:
+    """Create the analysis child tables and add the recommendation priority."""
+    op.add_column('recommendations', sa.Column(
+        'priority', sa.String(length=20), nullable=True,
+        comment='Recommendation priority (low, medium, high, critical)'
+    ))
+    op.execute(BACKFILL_PRIORITY)
+    op.create_index(op.f('ix_recommendations_priority'), 'recommendations', ['priority'], unique=False)
+
+    op.create_table('data_sources',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('analysis_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('source_type', sa.String(length=50), nullable=True),
+        sa.Column('details', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.ForeignKeyConstraint(['analysis_id'], ['analysis.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_data_sources_id'), 'data_sources', ['id'], unique=False)
+    op.create_index(op.f('ix_data_sources_analysis_id'), 'data_sources', ['analysis_id'], unique=False)
+    op.create_index(op.f('ix_data_sources_source_type'), 'data_sources', ['source_type'], unique=False)
+
+    op.create_table('external_references',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('analysis_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('url', sa.String(length=500), nullable=True),
+        sa.Column('details', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.ForeignKeyConstraint(['analysis_id'], ['analysis.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_external_references_id'), 'external_references', ['id'], unique=False)
+    op.create_index(
+        op.f('ix_external_references_analysis_id'), 'external_references', ['analysis_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Drop the analysis child tables and the recommendation priority."""
+    op.drop_table('external_references')
+    op.drop_table('data_sources')
+    op.drop_index(op.f('ix_recommendations_priority'), table_name='recommendations')
+    op.drop_column('recommendations', 'priority')
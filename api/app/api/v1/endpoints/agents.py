@@ -170,15 +170,8 @@ class AgentCRUD:
                 resource_id=agent_id
             )
 
-        agent.status = status_update.status
-
-        # Update error information if status is error
-        if status_update.status == "error" and status_update.error_details:
-            agent.error_count = (agent.error_count or 0) + 1
-            agent.last_error = status_update.error_details
-            agent.health_score = max(0, (agent.health_score or 100) - 10)
-        elif status_update.status == "running":
-            agent.health_score = min(100, (agent.health_score or 100) + 5)
+        # Error counts are incremented server-side so concurrent updates are not lost
+        await agent.update_status(session, status_update.status, status_update.error_details)
 
         # Record activity
         if status_update.activity_type:
@@ -15,15 +15,15 @@ from app.core.security import (
     create_access_token,
     create_refresh_token,
     verify_token,
-    get_password_hash,
-    verify_password,
+    aget_password_hash,
+    averify_password,
     generate_password_reset_token,
     verify_password_reset_token,
     generate_verification_token,
     verify_verification_token,
     PasswordValidator,
     SecurityHeaders,
-    rate_limiter
+    redis_rate_limiter
 )
 from app.core.exceptions import AuthenticationError, ValidationError, NotFoundError
 from app.dependencies.database import get_db_session
@@ -59,7 +59,7 @@ async def register(
     """
     # 检查速率限制
     client_ip = request.client.host
-    is_allowed, rate_info = rate_limiter.is_allowed(f"register:{client_ip}", limit=5, window=300)  # 5次/5分钟
+    is_allowed, rate_info = await redis_rate_limiter.is_allowed(f"register:{client_ip}", limit=5, window=300)  # 5次/5分钟
 
     if not is_allowed:
         raise HTTPException(
@@ -112,7 +112,7 @@ async def register(
         )
 
     # 创建新用户
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await aget_password_hash(user_data.password)
     verification_token = generate_verification_token(user_data.email)
 
     db_user = User(
@@ -166,7 +166,7 @@ async def login(
     """
     # 检查速率限制
     client_ip = request.client.host
-    is_allowed, rate_info = rate_limiter.is_allowed(f"login:{client_ip}", limit=10, window=300)  # 10次/5分钟
+    is_allowed, rate_info = await redis_rate_limiter.is_allowed(f"login:{client_ip}", limit=10, window=300)  # 10次/5分钟
 
     if not is_allowed:
         raise HTTPException(
@@ -186,7 +186,7 @@ async def login(
     )
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(user_data.password, user.hashed_password):
+    if not user or not await averify_password(user_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail={
@@ -312,7 +312,7 @@ async def change_password(
         )
 
     # 验证当前密码
-    if not verify_password(password_data.current_password, user.hashed_password):
+    if not await averify_password(password_data.current_password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={
@@ -334,7 +334,7 @@ async def change_password(
         )
 
     # 更新密码
-    user.hashed_password = get_password_hash(password_data.new_password)
+    user.hashed_password = await aget_password_hash(password_data.new_password)
     user.updated_at = datetime.utcnow()
     await session.commit()
 
@@ -355,7 +355,7 @@ async def forgot_password(
     """
     # 检查速率限制
     client_ip = request.client.host
-    is_allowed, rate_info = rate_limiter.is_allowed(f"reset_password:{client_ip}", limit=3, window=900)  # 3次/15分钟
+    is_allowed, rate_info = await redis_rate_limiter.is_allowed(f"reset_password:{client_ip}", limit=3, window=900)  # 3次/15分钟
 
     if not is_allowed:
         raise HTTPException(
@@ -438,7 +438,7 @@ async def reset_password(
         )
 
     # 更新密码
-    user.hashed_password = get_password_hash(reset_data.new_password)
+    user.hashed_password = await aget_password_hash(reset_data.new_password)
     user.reset_token = None
     user.reset_token_expires = None
     user.updated_at = datetime.utcnow()
@@ -4,6 +4,7 @@ Health Check Endpoints
 This module contains health check endpoints for the SAFE-BMAD API.
 """
 
+import asyncio
 import platform
 import sys
 import time
@@ -62,11 +63,11 @@ async def readiness_check():
         HTTPException: If service is not ready (503 Service Unavailable)
     """
     try:
-        # Check database connection
-        db_status = await check_database_connection()
-
-        # Check Redis connection
-        redis_status = await check_redis_health()
+        # Check database and Redis connections concurrently
+        db_status, redis_status = await asyncio.gather(
+            check_database_connection(),
+            check_redis_health()
+        )
 
         # Determine overall readiness
         overall_ready = (
@@ -13,14 +13,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
 from app.dependencies.database import get_db_session
-from app.dependencies.security import get_current_user_id, require_admin_permission
+from app.dependencies.security import (
+    get_current_user_id,
+    invalidate_user_permissions,
+    require_admin_permission,
+)
 from app.dependencies.common import get_pagination_params, PaginationParams, PaginatedResponse
 from app.schemas.user import (
     UserCreate, UserUpdate, UserResponse, UserListResponse,
     UserInDB, UserPasswordUpdate
 )
 from app.models.user import User
-from app.core.security import get_password_hash, verify_password
+from app.core.security import aget_password_hash, averify_password
 from app.core.exceptions import NotFoundError, ConflictError, ValidationError
 
 router = APIRouter()
@@ -60,7 +64,7 @@ class UserCRUD:
         user = User(
             username=user_create.username,
             email=user_create.email,
-            password_hash=get_password_hash(user_create.password),
+            password_hash=await aget_password_hash(user_create.password),
             full_name=user_create.full_name,
             role=user_create.role,
             is_active=user_create.is_active,
@@ -226,14 +230,14 @@ class UserCRUD:
             )
 
         # Verify current password
-        if not verify_password(current_password, user.password_hash):
+        if not await averify_password(current_password, user.password_hash):
             raise ValidationError(
                 message="Current password is incorrect",
                 field="current_password"
             )
 
         # Update password
-        user.password_hash = get_password_hash(new_password)
+        user.password_hash = await aget_password_hash(new_password)
         user.updated_at = datetime.utcnow()
         await session.flush()
         return True
@@ -380,6 +384,7 @@ async def update_user(
 
         user = await UserCRUD.update(session, user_id, user_update)
         await session.commit()
+        invalidate_user_permissions(user_id)
         return UserResponse.from_orm(user)
     except NotFoundError as e:
         await session.rollback()
@@ -427,6 +432,7 @@ async def delete_user(
     try:
         await UserCRUD.delete(session, user_id)
         await session.commit()
+        invalidate_user_permissions(user_id)
     except NotFoundError as e:
         await session.rollback()
         raise HTTPException(
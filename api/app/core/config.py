@@ -30,8 +30,14 @@ class Settings(BaseSettings):
     # Security Configuration
     secret_key: str
     algorithm: str = "HS256"
+    jwt_public_key: Optional[str] = None
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
+    bcrypt_rounds: int = 12
+    api_key_bcrypt_rounds: int = 8
+    token_cache_size: int = 10000
+    token_cache_ttl_seconds: int = 30
+    permission_cache_ttl_seconds: int = 30
 
     # CORS Configuration
     cors_origins: List[str] = ["http://localhost:3000", "http://127.0.0.1:3000"]
@@ -41,6 +47,7 @@ class Settings(BaseSettings):
 
     # Database Configuration
     database_url: str
+    database_read_url: Optional[str] = None
     db_host: str = "localhost"
     db_port: int = 5432
     db_name: str = "safe_dev"
@@ -50,7 +57,11 @@ class Settings(BaseSettings):
     db_max_overflow: int = 20
     db_pool_timeout: int = 30
     db_pool_recycle: int = 3600
+    db_statement_cache_size: int = 1024
+    db_prepared_statement_cache_size: int = 256
+    db_query_cache_size: int = 2000
     db_echo: bool = False
+    agent_perf_summary_refresh_seconds: int = 60
 
     # Redis Configuration
     redis_url: str
@@ -136,6 +147,13 @@ class Settings(BaseSettings):
             raise ValueError("DATABASE_URL must start with 'postgresql://'")
         return v
 
+    @validator("database_read_url")
+    def validate_database_read_url(cls, v):
+        """Validate read replica URL format"""
+        if v and not v.startswith("postgresql://"):
+            raise ValueError("DATABASE_READ_URL must start with 'postgresql://'")
+        return v or None
+
     @validator("redis_url")
     def validate_redis_url(cls, v):
         """Validate Redis URL format"""
@@ -150,6 +168,13 @@ class Settings(BaseSettings):
             logger.warning("SECRET_KEY should be at least 32 characters long")
         return v
 
+    @validator("bcrypt_rounds", "api_key_bcrypt_rounds")
+    def validate_bcrypt_rounds(cls, v):
+        """Validate bcrypt cost factor range"""
+        if not 4 <= v <= 31:
+            raise ValueError("bcrypt rounds must be between 4 and 31")
+        return v
+
     @property
     def is_development(self) -> bool:
         """Check if running in development mode"""
@@ -199,6 +224,12 @@ class Settings(BaseSettings):
             return database_url.replace("postgresql://", "postgresql+asyncpg://")
         return database_url
 
+    def get_database_read_async_url(self) -> Optional[str]:
+        """Get async read replica URL for SQLAlchemy, None if no replica is configured"""
+        if self.database_read_url is None:
+            return None
+        return self.database_read_url.replace("postgresql://", "postgresql+asyncpg://")
+
 
 # Global settings instance
 _settings: Optional[Settings] = None
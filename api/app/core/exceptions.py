@@ -198,6 +198,21 @@ class ConfigurationError(BaseCustomException):
         super().__init__(message, details, error_code="CONFIGURATION_ERROR")
 
 
+def error_detail(error: str, error_code: str, **details: Any) -> Dict[str, Any]:
+    """
+    Build the HTTPException detail payload used across the API
+
+    Args:
+        error: Human-readable error message
+        error_code: Application-specific error code
+        **details: Additional error details
+
+    Returns:
+        Error payload dict
+    """
+    return {"error": error, "error_code": error_code, "details": details}
+
+
 class HTTPExceptionExtensions:
     """Extensions for FastAPI HTTPException"""
 
@@ -3,7 +3,7 @@
 """
 
 from .config import setup_logging, get_logger
-from .middleware import LoggingMiddleware, SecurityLoggingMiddleware
+from .middleware import LoggingMiddleware, SecurityLoggingMiddleware, log_request_response
 from .formatters import get_json_formatter, get_structured_formatter
 
 __all__ = [
@@ -11,6 +11,7 @@ __all__ = [
     "get_logger",
     "LoggingMiddleware",
     "SecurityLoggingMiddleware",
+    "log_request_response",
     "get_json_formatter",
     "get_structured_formatter"
 ]
\ No newline at end of file
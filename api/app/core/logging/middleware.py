@@ -2,15 +2,28 @@
 日志中间件 - FastAPI请求日志记录
 """
 
+import re
 import time
 import uuid
-from typing import Callable
+from typing import AsyncIterator, Callable, Iterable
 from fastapi import Request, Response
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from .config import get_context_logger, get_performance_logger, generate_request_id
 
+# 敏感操作路径片段，合并为一个正则，一次扫描完成匹配
+SENSITIVE_PATHS = (
+    "/auth/login",
+    "/auth/logout",
+    "/auth/register",
+    "/users/",
+    "/admin/",
+    "/config/",
+    "/secrets/"
+)
+_SENSITIVE_PATH_PATTERN = re.compile("|".join(re.escape(path) for path in SENSITIVE_PATHS))
+
 
 class LoggingMiddleware(BaseHTTPMiddleware):
     """日志记录中间件"""
@@ -144,7 +157,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             )
 
             # 返回错误响应
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=500,
                 content={
                     "error": "Internal Server Error",
@@ -190,9 +203,17 @@ class LoggingMiddleware(BaseHTTPMiddleware):
 class SecurityLoggingMiddleware(BaseHTTPMiddleware):
     """安全日志中间件"""
 
+    def __init__(self, app, exclude_prefixes: Iterable[str] = ()):
+        super().__init__(app)
+        # 以这些前缀开头的路径（如演示路由）不做安全日志处理
+        self.exclude_prefixes = tuple(exclude_prefixes)
+
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """处理安全相关日志"""
 
+        if self.exclude_prefixes and request.scope["path"].startswith(self.exclude_prefixes):
+            return await call_next(request)
+
         # 获取请求ID（如果已经由LoggingMiddleware设置）
         request_id = getattr(request.state, 'request_id', generate_request_id())
 
@@ -247,18 +268,8 @@ class SecurityLoggingMiddleware(BaseHTTPMiddleware):
         return response
 
     def _is_sensitive_operation(self, request: Request) -> bool:
-        """判断是否为敏感操作"""
-        sensitive_paths = [
-            "/auth/login",
-            "/auth/logout",
-            "/auth/register",
-            "/users/",
-            "/admin/",
-            "/config/",
-            "/secrets/"
-        ]
-
-        return any(path in request.url.path for path in sensitive_paths)
+        """判断是否为敏感操作（路径包含任一敏感片段）"""
+        return _SENSITIVE_PATH_PATTERN.search(request.url.path) is not None
 
     def _get_client_ip(self, request: Request) -> str:
         """获取客户端IP地址"""
@@ -276,4 +287,100 @@ class SecurityLoggingMiddleware(BaseHTTPMiddleware):
         """从请求中获取用户ID"""
         if hasattr(request.state, 'user_id'):
             return request.state.user_id
-        return "anonymous"
\ No newline at end of file
+        return "anonymous"
+
+def _client_ip(request: Request) -> str:
+    """获取客户端IP地址"""
+    forwarded_for = request.headers.get("X-Forwarded-For")
+    if forwarded_for:
+        return forwarded_for.split(",")[0].strip()
+
+    real_ip = request.headers.get("X-Real-IP")
+    if real_ip:
+        return real_ip
+
+    return request.client.host if request.client else "unknown"
+
+
+async def log_request_response(request: Request, response: Response) -> AsyncIterator[None]:
+    """
+    请求日志依赖 - 按路由启用的LoggingMiddleware替代
+
+    通过 dependencies=[Depends(log_request_response)] 挂载到需要审计的路由上，
+    探针和指标抓取等高频路由不再承担请求日志的开销。
+    """
+    request_id = generate_request_id()
+    request.state.request_id = request_id
+    response.headers["X-Request-ID"] = request_id
+
+    logger = get_context_logger(
+        request_id=request_id,
+        user_id=getattr(request.state, "user_id", "anonymous"),
+        session_id=getattr(request.state, "session_id", "unknown")
+    )
+    client_ip = _client_ip(request)
+    start_time = time.time()
+
+    logger.info(
+        f"Request started: {request.method} {request.url.path}",
+        extra={
+            "method": request.method,
+            "path": request.url.path,
+            "query_params": str(request.query_params),
+            "client_ip": client_ip,
+            "user_agent": request.headers.get("user-agent", "unknown"),
+            "content_type": request.headers.get("content-type", "unknown"),
+            "content_length": request.headers.get("content-length", "0")
+        }
+    )
+
+    perf_logger = get_performance_logger(
+        operation=f"{request.method} {request.url.path}",
+        request_id=request_id,
+        method=request.method,
+        path=request.url.path
+    )
+
+    try:
+        yield
+    except Exception as e:
+        process_time_ms = round((time.time() - start_time) * 1000, 2)
+        logger.error(
+            f"Request failed: {request.method} {request.url.path} - {str(e)}",
+            extra={
+                "method": request.method,
+                "path": request.url.path,
+                "process_time_ms": process_time_ms,
+                "error_type": type(e).__name__,
+                "error_message": str(e),
+                "client_ip": client_ip
+            },
+            exc_info=True
+        )
+        perf_logger.error(
+            "API request failed",
+            extra={
+                "duration_ms": process_time_ms,
+                "status": "error",
+                "error_type": type(e).__name__,
+                "error_message": str(e)
+            }
+        )
+        raise
+
+    process_time_ms = round((time.time() - start_time) * 1000, 2)
+    logger.info(
+        f"Request completed: {request.method} {request.url.path}",
+        extra={
+            "method": request.method,
+            "path": request.url.path,
+            "process_time_ms": process_time_ms
+        }
+    )
+    perf_logger.info(
+        "API request completed",
+        extra={
+            "duration_ms": process_time_ms,
+            "status": "success"
+        }
+    )
@@ -3,14 +3,17 @@
 """
 
 from .health import HealthChecker, HealthStatus, health_checker
-from .metrics import MetricsCollector, metrics_collector
+from .metrics import MetricsCollector, SystemSnapshot, metrics_collector
 from .endpoints import router as monitoring_router
+from .interceptor import HealthCheckInterceptor
 
 __all__ = [
     "HealthChecker",
     "HealthStatus",
     "health_checker",
     "MetricsCollector",
+    "SystemSnapshot",
     "metrics_collector",
-    "monitoring_router"
+    "monitoring_router",
+    "HealthCheckInterceptor"
 ]
\ No newline at end of file
@@ -7,12 +7,11 @@ import asyncio
 import os
 import socket
 from datetime import datetime
-from typing import Dict, Any
-from fastapi import APIRouter, Response, Request, Depends, HTTPException
-from fastapi.responses import PlainTextResponse
+from typing import Dict, Any, Optional
+from fastapi import APIRouter, Response, Request, Depends, HTTPException, Query
 
 from .health import health_checker, HealthStatus, HealthCheckResult
-from .metrics import metrics_collector
+from .metrics import SUMMARY_MAX_MINUTES, metrics_collector
 from ..logging.config import get_context_logger, get_performance_logger
 
 router = APIRouter(prefix="/monitoring", tags=["monitoring"])
@@ -33,7 +32,9 @@ async def health_check(request: Request):
         # 获取主要组件的健康状态
         key_checks = {
             "api": await _check_api_health(),
-            "system_resources": await health_checker.check_system_resources()
+            "system_resources": await health_checker.run_check(
+                "system_resources", health_checker.check_system_resources
+            )
         }
 
         overall_status = health_checker.get_overall_status(key_checks)
@@ -94,15 +95,7 @@ async def readiness_check(request: Request):
         response_time = (time.time() - start_time) * 1000
 
         # 转换检查结果为字典格式
-        checks_dict = {}
-        for name, check in checks.items():
-            checks_dict[name] = {
-                "status": check.status.value,
-                "message": check.message,
-                "details": check.details,
-                "response_time_ms": check.response_time_ms,
-                "check_time": check.check_time.isoformat()
-            }
+        checks_dict, summary = health_checker.summarize_checks(checks)
 
         result = {
             "status": overall_status.value,
@@ -110,13 +103,7 @@ async def readiness_check(request: Request):
             "version": "1.4.0",
             "ready": overall_status == HealthStatus.HEALTHY,
             "checks": checks_dict,
-            "summary": {
-                "total_checks": len(checks),
-                "healthy": len([c for c in checks.values() if c.status == HealthStatus.HEALTHY]),
-                "degraded": len([c for c in checks.values() if c.status == HealthStatus.DEGRADED]),
-                "unhealthy": len([c for c in checks.values() if c.status == HealthStatus.UNHEALTHY]),
-                "unknown": len([c for c in checks.values() if c.status == HealthStatus.UNKNOWN])
-            },
+            "summary": summary,
             "response_time_ms": round(response_time, 2)
         }
 
@@ -213,7 +200,7 @@ async def get_metrics(request: Request):
 
     try:
         # 获取Prometheus格式的指标
-        metrics_data = metrics_collector.get_prometheus_metrics()
+        metrics_data = metrics_collector.get_prometheus_metrics_bytes()
         response_time = (time.time() - start_time) * 1000
 
         perf_logger.info("Metrics retrieved", extra={
@@ -221,7 +208,7 @@ async def get_metrics(request: Request):
             "data_size": len(metrics_data)
         })
 
-        return PlainTextResponse(
+        return Response(
             content=metrics_data,
             media_type=metrics_collector.get_content_type()
         )
@@ -242,12 +229,15 @@ async def get_metrics(request: Request):
 
 
 @router.get("/metrics-summary")
-async def get_metrics_summary(request: Request, minutes: int = 5):
+async def get_metrics_summary(
+    request: Request,
+    minutes: int = Query(5, ge=1, le=SUMMARY_MAX_MINUTES)
+):
     """
     获取指标摘要
 
     Args:
-        minutes: 最近多少分钟的指标摘要
+        minutes: 最近多少分钟的指标摘要（按整分钟对齐，最长60分钟）
 
     Returns:
         指标的统计摘要信息
@@ -353,6 +343,9 @@ async def get_system_status(request: Request):
 
 
 # 辅助函数
+_process_start_time: Optional[float] = None
+
+
 async def _check_api_health() -> "HealthCheckResult":
     """检查API健康状态"""
     start_time = time.time()
@@ -385,12 +378,15 @@ async def _check_api_health() -> "HealthCheckResult":
 
 
 def _get_process_start_time() -> float:
-    """获取进程启动时间"""
-    try:
-        import psutil
-        return psutil.Process().create_time()
-    except:
-        return time.time()
+    """获取进程启动时间（进程生命周期内不变，首次读取后缓存）"""
+    global _process_start_time
+    if _process_start_time is None:
+        try:
+            import psutil
+            _process_start_time = psutil.Process().create_time()
+        except:
+            return time.time()
+    return _process_start_time
 
 
 def _get_hostname() -> str:
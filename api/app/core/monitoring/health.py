@@ -6,15 +6,21 @@ import asyncio
 import time
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Awaitable, Callable, Tuple
+from urllib.parse import urlparse
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, asdict
 import psutil
 import requests
 
 from ..logging.config import get_logger
+from .metrics import SLOTS_DATACLASS_OPTIONS, metrics_collector
 
 logger = get_logger("health_checker")
 
+# 系统启动时间在进程生命周期内不会变化，只需读取一次
+_BOOT_TIME = psutil.boot_time()
+
 
 class HealthStatus(Enum):
     """健康状态枚举"""
@@ -24,7 +30,7 @@ class HealthStatus(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(**SLOTS_DATACLASS_OPTIONS)
 class HealthCheckResult:
     """健康检查结果"""
     component: str
@@ -41,77 +47,146 @@ class HealthCheckResult:
             self.details = {}
 
 
+class _Probe:
+    """单次探测的计时和结果收集"""
+
+    __slots__ = ("component", "status", "message", "details", "response_time_ms", "_start")
+
+    def __init__(self, component: str):
+        self.component = component
+        self.status = HealthStatus.UNKNOWN
+        self.message = ""
+        self.details: Dict[str, Any] = {}
+        self.response_time_ms = 0.0
+        self._start = time.perf_counter()
+
+    def elapsed_ms(self) -> float:
+        """自探测开始以来经过的毫秒数"""
+        return (time.perf_counter() - self._start) * 1000
+
+    def result(self) -> HealthCheckResult:
+        """生成健康检查结果"""
+        return HealthCheckResult(
+            component=self.component,
+            status=self.status,
+            message=self.message,
+            details=self.details,
+            response_time_ms=self.response_time_ms
+        )
+
+
 class HealthChecker:
     """健康检查器"""
 
-    def __init__(self, cache_ttl_seconds: int = 30):
+    # 各组件的缓存时间（秒），未列出的组件使用cache_ttl_seconds
+    DEFAULT_COMPONENT_TTLS: Dict[str, int] = {
+        "system_resources": 5,
+        "disk_space": 5,
+        "memory": 5,
+        "external_apis": 30,
+    }
+
+    def __init__(
+        self,
+        cache_ttl_seconds: int = 30,
+        component_ttls: Optional[Dict[str, int]] = None,
+        max_probes_per_host: int = 8
+    ):
         self.cache_ttl_seconds = cache_ttl_seconds
+        self.max_probes_per_host = max_probes_per_host
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.component_ttls: Dict[str, int] = dict(self.DEFAULT_COMPONENT_TTLS)
+        if component_ttls:
+            self.component_ttls.update(component_ttls)
         self._cache: Dict[str, HealthCheckResult] = {}
         self._last_check_time: Dict[str, datetime] = {}
+        self._check_locks: Dict[str, asyncio.Lock] = {}
 
     async def check_all(self) -> Dict[str, HealthCheckResult]:
-        """检查所有组件的健康状态"""
-        checks = {
-            "database": await self.check_database(),
-            "redis": await self.check_redis(),
-            "external_apis": await self.check_external_apis(),
-            "system_resources": await self.check_system_resources(),
-            "disk_space": await self.check_disk_space(),
-            "memory": await self.check_memory(),
-            "autogen_service": await self.check_autogen_service()
+        """检查所有组件的健康状态（缓存有效期内直接返回缓存结果）"""
+        probes = {
+            "database": self.check_database,
+            "redis": self.check_redis,
+            "external_apis": self.check_external_apis,
+            "system_resources": self.check_system_resources,
+            "disk_space": self.check_disk_space,
+            "memory": self.check_memory,
+            "autogen_service": self.check_autogen_service
         }
 
-        return checks
+        # 各组件探测相互独立，并发执行，总耗时取决于最慢的探测而非各探测之和
+        results = await asyncio.gather(
+            *(self.run_check(component, probe) for component, probe in probes.items())
+        )
+
+        return dict(zip(probes, results))
+
+    async def run_check(
+        self,
+        component: str,
+        probe: Callable[[], Awaitable[HealthCheckResult]]
+    ) -> HealthCheckResult:
+        """执行单个组件检查，优先使用缓存，并发未命中时只执行一次探测"""
+        cached = self.get_cached_result(component)
+        if cached is not None:
+            return cached
+
+        lock = self._check_locks.get(component)
+        if lock is None:
+            lock = self._check_locks[component] = asyncio.Lock()
+
+        async with lock:
+            # 等待锁期间其他请求可能已经完成探测
+            cached = self.get_cached_result(component)
+            if cached is not None:
+                return cached
+
+            result = await probe()
+            self.cache_result(result)
+            return result
+
+    @asynccontextmanager
+    async def _timed_probe(self, component: str, failure_message: str):
+        """统一计时和异常处理的探测上下文，探测逻辑在上下文内设置状态、消息和详情"""
+        probe = _Probe(component)
+        try:
+            yield probe
+        except Exception as e:
+            logger.error(f"{component} health check failed: {str(e)}")
+            probe.status = HealthStatus.UNHEALTHY
+            probe.message = f"{failure_message}: {str(e)}"
+            probe.details = {"error": str(e)}
+        probe.response_time_ms = round(probe.elapsed_ms(), 2)
 
     async def check_database(self) -> HealthCheckResult:
         """检查数据库连接"""
-        start_time = time.time()
-
-        try:
+        async with self._timed_probe("database", "Database connection failed") as probe:
             # 这里应该根据实际的数据库连接进行测试
             # 目前为演示版本，模拟检查
 
             # 模拟数据库查询延迟
             await asyncio.sleep(0.1)
 
-            response_time = (time.time() - start_time) * 1000
+            response_time = probe.elapsed_ms()
 
             if response_time > 1000:  # 超过1秒认为性能降级
-                status = HealthStatus.DEGRADED
-                message = f"Database response slow: {response_time:.2f}ms"
+                probe.status = HealthStatus.DEGRADED
+                probe.message = f"Database response slow: {response_time:.2f}ms"
             else:
-                status = HealthStatus.HEALTHY
-                message = "Database connection OK"
-
-            return HealthCheckResult(
-                component="database",
-                status=status,
-                message=message,
-                details={
-                    "response_time_ms": round(response_time, 2),
-                    "connection_pool_size": 10,
-                    "active_connections": 3
-                },
-                response_time_ms=round(response_time, 2)
-            )
+                probe.status = HealthStatus.HEALTHY
+                probe.message = "Database connection OK"
 
-        except Exception as e:
-            response_time = (time.time() - start_time) * 1000
-            logger.error(f"Database health check failed: {str(e)}")
+            probe.details = {
+                "response_time_ms": round(response_time, 2),
+                "connection_pool_size": 10,
+                "active_connections": 3
+            }
 
-            return HealthCheckResult(
-                component="database",
-                status=HealthStatus.UNHEALTHY,
-                message=f"Database connection failed: {str(e)}",
-                details={"error": str(e)},
-                response_time_ms=round(response_time, 2)
-            )
+        return probe.result()
 
     async def check_redis(self) -> HealthCheckResult:
         """检查Redis连接"""
-        start_time = time.time()
-
-        try:
+        async with self._timed_probe("redis", "Redis connection failed") as probe:
             # 这里应该根据实际的Redis连接进行测试
             # 目前为演示版本，模拟Redis不可用
 
@@ -119,110 +194,98 @@ class HealthChecker:
             await asyncio.sleep(0.05)
 
             # 演示版本：Redis未配置
-            response_time = (time.time() - start_time) * 1000
-
-            return HealthCheckResult(
-                component="redis",
-                status=HealthStatus.DEGRADED,
-                message="Redis not available (demo mode)",
-                details={
-                    "response_time_ms": round(response_time, 2),
-                    "configured": False
-                },
-                response_time_ms=round(response_time, 2)
-            )
+            probe.status = HealthStatus.DEGRADED
+            probe.message = "Redis not available (demo mode)"
+            probe.details = {
+                "response_time_ms": round(probe.elapsed_ms(), 2),
+                "configured": False
+            }
 
-        except Exception as e:
-            response_time = (time.time() - start_time) * 1000
-
-            return HealthCheckResult(
-                component="redis",
-                status=HealthStatus.UNHEALTHY,
-                message=f"Redis connection failed: {str(e)}",
-                details={"error": str(e)},
-                response_time_ms=round(response_time, 2)
-            )
+        return probe.result()
 
     async def check_external_apis(self) -> HealthCheckResult:
         """检查外部API服务"""
-        start_time = time.time()
-
-        try:
+        async with self._timed_probe("external_apis", "External API check failed") as probe:
             # 检查关键外部API服务
             external_services = [
                 {"name": "ai_service", "url": "http://localhost:8000/health"},
                 {"name": "auth_service", "url": "http://localhost:8000/health"}
             ]
 
+            # 并发探测，总耗时取决于最慢的服务而不是所有服务之和
+            probe_results = await asyncio.gather(
+                *(self._probe_external_service(service) for service in external_services),
+                return_exceptions=True
+            )
             results = []
-            for service in external_services:
-                try:
-                    response = requests.get(service["url"], timeout=5)
-                    if response.status_code == 200:
-                        results.append({"name": service["name"], "status": "ok"})
-                    else:
-                        results.append({
-                            "name": service["name"],
-                            "status": "error",
-                            "status_code": response.status_code
-                        })
-                except Exception as e:
-                    results.append({
+            for service, result in zip(external_services, probe_results):
+                if isinstance(result, BaseException):
+                    result = {
                         "name": service["name"],
                         "status": "error",
-                        "error": str(e)
-                    })
-
-            response_time = (time.time() - start_time) * 1000
+                        "error": str(result)
+                    }
+                results.append(result)
 
             # 评估整体状态
             failed_services = [r for r in results if r.get("status") != "ok"]
 
             if not failed_services:
-                status = HealthStatus.HEALTHY
-                message = "All external APIs OK"
+                probe.status = HealthStatus.HEALTHY
+                probe.message = "All external APIs OK"
             elif len(failed_services) == len(results):
-                status = HealthStatus.UNHEALTHY
-                message = "All external APIs failed"
+                probe.status = HealthStatus.UNHEALTHY
+                probe.message = "All external APIs failed"
             else:
-                status = HealthStatus.DEGRADED
-                message = f"{len(failed_services)} external APIs failed"
-
-            return HealthCheckResult(
-                component="external_apis",
-                status=status,
-                message=message,
-                details={
-                    "services": results,
-                    "total_services": len(results),
-                    "failed_services": len(failed_services)
-                },
-                response_time_ms=round(response_time, 2)
-            )
+                probe.status = HealthStatus.DEGRADED
+                probe.message = f"{len(failed_services)} external APIs failed"
 
-        except Exception as e:
-            response_time = (time.time() - start_time) * 1000
+            probe.details = {
+                "services": results,
+                "total_services": len(results),
+                "failed_services": len(failed_services)
+            }
 
-            return HealthCheckResult(
-                component="external_apis",
-                status=HealthStatus.UNHEALTHY,
-                message=f"External API check failed: {str(e)}",
-                details={"error": str(e)},
-                response_time_ms=round(response_time, 2)
-            )
+        return probe.result()
+
+    def _get_host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """获取目标主机的探测信号量，防止并发探测压垮下游服务"""
+        host = urlparse(url).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(self.max_probes_per_host)
+        return semaphore
+
+    async def _probe_external_service(self, service: Dict[str, str]) -> Dict[str, Any]:
+        """探测单个外部服务（阻塞的HTTP请求在线程池中执行，同一主机的并发探测数受限）"""
+        async with self._get_host_semaphore(service["url"]):
+            response = await asyncio.to_thread(requests.get, service["url"], timeout=5)
+        if response.status_code == 200:
+            return {"name": service["name"], "status": "ok"}
+        return {
+            "name": service["name"],
+            "status": "error",
+            "status_code": response.status_code
+        }
 
     async def check_system_resources(self) -> HealthCheckResult:
-        """检查系统资源"""
+        """检查系统资源（psutil调用在线程池中执行，避免阻塞事件循环）"""
         try:
-            # CPU使用率
-            cpu_percent = psutil.cpu_percent(interval=1)
-
-            # 负载平均值
-            load_avg = psutil.getloadavg()
+            # CPU使用率：优先读取后台采样值
+            cpu_percent = metrics_collector.last_cpu_percent
+            if cpu_percent is None:
+                # 后台采样未启动时，在线程池中执行1秒采样，避免阻塞事件循环
+                cpu_percent = await asyncio.to_thread(psutil.cpu_percent, 1)
+
+            # 负载平均值：优先读取后台系统快照
+            snapshot = metrics_collector.system_snapshot
+            if snapshot is not None:
+                load_avg = snapshot.load_avg
+            else:
+                load_avg = await asyncio.to_thread(psutil.getloadavg)
 
-            # 启动时间
-            boot_time = psutil.boot_time()
-            uptime = time.time() - boot_time
+            # 运行时间
+            uptime = time.time() - _BOOT_TIME
 
             # 评估状态
             if cpu_percent > 90:
@@ -263,7 +326,7 @@ class HealthChecker:
     async def check_disk_space(self) -> HealthCheckResult:
         """检查磁盘空间"""
         try:
-            disk_usage = psutil.disk_usage('/')
+            disk_usage = await asyncio.to_thread(psutil.disk_usage, '/')
 
             total_gb = disk_usage.total / (1024**3)
             used_gb = disk_usage.used / (1024**3)
@@ -306,7 +369,7 @@ class HealthChecker:
     async def check_memory(self) -> HealthCheckResult:
         """检查内存使用"""
         try:
-            memory = psutil.virtual_memory()
+            memory = await asyncio.to_thread(psutil.virtual_memory)
 
             total_gb = memory.total / (1024**3)
             used_gb = memory.used / (1024**3)
@@ -348,14 +411,11 @@ class HealthChecker:
 
     async def check_autogen_service(self) -> HealthCheckResult:
         """检查AutoGen服务状态"""
-        start_time = time.time()
-
-        try:
+        async with self._timed_probe("autogen_service", "AutoGen service check failed") as probe:
             # 这里应该根据实际的AutoGen服务状态进行检查
             # 目前为演示版本，模拟检查
 
             await asyncio.sleep(0.1)
-            response_time = (time.time() - start_time) * 1000
 
             # 模拟AutoGen服务状态
             agent_status = {
@@ -367,60 +427,56 @@ class HealthChecker:
 
             active_agents = sum(1 for agent in agent_status.values() if agent["status"] != "idle")
 
+            probe.status = HealthStatus.HEALTHY
             if active_agents > 0:
-                status = HealthStatus.HEALTHY
-                message = f"AutoGen service OK ({active_agents} active agents)"
+                probe.message = f"AutoGen service OK ({active_agents} active agents)"
             else:
-                status = HealthStatus.HEALTHY
-                message = "AutoGen service OK (all agents idle)"
-
-            return HealthCheckResult(
-                component="autogen_service",
-                status=status,
-                message=message,
-                details={
-                    "agents": agent_status,
-                    "total_agents": len(agent_status),
-                    "active_agents": active_agents,
-                    "response_time_ms": round(response_time, 2)
-                },
-                response_time_ms=round(response_time, 2)
-            )
+                probe.message = "AutoGen service OK (all agents idle)"
 
-        except Exception as e:
-            response_time = (time.time() - start_time) * 1000
+            probe.details = {
+                "agents": agent_status,
+                "total_agents": len(agent_status),
+                "active_agents": active_agents,
+                "response_time_ms": round(probe.elapsed_ms(), 2)
+            }
 
-            return HealthCheckResult(
-                component="autogen_service",
-                status=HealthStatus.UNHEALTHY,
-                message=f"AutoGen service check failed: {str(e)}",
-                details={"error": str(e)},
-                response_time_ms=round(response_time, 2)
-            )
+        return probe.result()
 
     def get_overall_status(self, checks: Dict[str, HealthCheckResult]) -> HealthStatus:
         """获取整体健康状态"""
         if not checks:
             return HealthStatus.UNKNOWN
 
-        statuses = [check.status for check in checks.values()]
-
-        if all(status == HealthStatus.HEALTHY for status in statuses):
+        # 单次遍历，遇到UNHEALTHY立即返回
+        all_healthy = True
+        saw_degraded = False
+        for check in checks.values():
+            status = check.status
+            if status is HealthStatus.UNHEALTHY:
+                return HealthStatus.UNHEALTHY
+            if status is not HealthStatus.HEALTHY:
+                all_healthy = False
+                if status is HealthStatus.DEGRADED:
+                    saw_degraded = True
+
+        if all_healthy:
             return HealthStatus.HEALTHY
-        elif any(status == HealthStatus.UNHEALTHY for status in statuses):
-            return HealthStatus.UNHEALTHY
-        elif any(status == HealthStatus.DEGRADED for status in statuses):
+        elif saw_degraded:
             return HealthStatus.DEGRADED
         else:
             return HealthStatus.UNKNOWN
 
+    def get_cache_ttl(self, component: str) -> int:
+        """获取组件的缓存时间（秒）"""
+        return self.component_ttls.get(component, self.cache_ttl_seconds)
+
     def should_check(self, component: str) -> bool:
         """判断是否需要检查组件"""
         if component not in self._last_check_time:
             return True
 
         time_since_last_check = datetime.utcnow() - self._last_check_time[component]
-        return time_since_last_check.total_seconds() > self.cache_ttl_seconds
+        return time_since_last_check.total_seconds() > self.get_cache_ttl(component)
 
     def cache_result(self, result: HealthCheckResult):
         """缓存检查结果"""
@@ -433,33 +489,40 @@ class HealthChecker:
             return self._cache[component]
         return None
 
-    async def get_health_summary(self) -> Dict[str, Any]:
-        """获取健康状态摘要"""
-        checks = await self.check_all()
-        overall_status = self.get_overall_status(checks)
-
-        # 转换为字典格式
+    def summarize_checks(self, checks: Dict[str, HealthCheckResult]) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        """单次遍历生成检查结果字典和各状态计数"""
         checks_dict = {}
+        summary = {
+            "total_checks": len(checks),
+            "healthy": 0,
+            "degraded": 0,
+            "unhealthy": 0,
+            "unknown": 0
+        }
         for name, check in checks.items():
+            status_value = check.status.value
             checks_dict[name] = {
-                "status": check.status.value,
+                "status": status_value,
                 "message": check.message,
                 "details": check.details,
                 "response_time_ms": check.response_time_ms,
                 "check_time": check.check_time.isoformat()
             }
+            summary[status_value] += 1
+
+        return checks_dict, summary
+
+    async def get_health_summary(self) -> Dict[str, Any]:
+        """获取健康状态摘要"""
+        checks = await self.check_all()
+        overall_status = self.get_overall_status(checks)
+        checks_dict, summary = self.summarize_checks(checks)
 
         return {
             "overall_status": overall_status.value,
             "timestamp": datetime.utcnow().isoformat(),
             "checks": checks_dict,
-            "summary": {
-                "total_checks": len(checks),
-                "healthy": len([c for c in checks.values() if c.status == HealthStatus.HEALTHY]),
-                "degraded": len([c for c in checks.values() if c.status == HealthStatus.DEGRADED]),
-                "unhealthy": len([c for c in checks.values() if c.status == HealthStatus.UNHEALTHY]),
-                "unknown": len([c for c in checks.values() if c.status == HealthStatus.UNKNOWN])
-            }
+            "summary": summary
         }
 
 
@@ -0,0 +1,89 @@
+"""
+探针拦截器 - 在ASGI层直接响应 /health、/ready、/live 探针请求
+"""
+
+from typing import Any, Awaitable, Callable, Dict, MutableMapping
+
+import orjson
+
+Scope = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[MutableMapping[str, Any]]]
+Send = Callable[[MutableMapping[str, Any]], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+# 探针响应体在导入时序列化一次，每次请求直接发送
+HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "timestamp": "2025-01-21T13:00:00.000Z",
+    "version": "1.4.0",
+    "services": {
+        "api": "running",
+        "logging": "running",
+        "monitoring": "running",
+        "alerting": "running"
+    }
+})
+
+READY_BODY = orjson.dumps({
+    "status": "ready",
+    "timestamp": "2025-01-21T13:00:00.000Z",
+    "checks": {
+        "logging": "ready",
+        "monitoring": "ready",
+        "alerting": "ready",
+        "metrics": "ready"
+    }
+})
+
+LIVE_BODY = orjson.dumps({"status": "alive"})
+
+PROBE_BODIES: Dict[str, bytes] = {
+    "/health": HEALTH_BODY,
+    "/ready": READY_BODY,
+    "/live": LIVE_BODY,
+}
+
+_ALLOWED_METHODS = frozenset(("GET", "HEAD"))
+
+_METHOD_NOT_ALLOWED_BODY = orjson.dumps({"detail": "Method Not Allowed"})
+
+
+def _json_headers(body: bytes) -> list:
+    return [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode("ascii")),
+    ]
+
+
+class HealthCheckInterceptor:
+    """
+    探针拦截器
+
+    探针请求不经过FastAPI路由和中间件（CORS、请求日志等），直接返回预先
+    序列化的响应；其他请求原样交给被包装的应用处理。
+    """
+
+    def __init__(self, app: ASGIApp, bodies: Dict[str, bytes] = PROBE_BODIES):
+        self.app = app
+        self._responses = {
+            path: (_json_headers(body), body) for path, body in bodies.items()
+        }
+        self._not_allowed_headers = _json_headers(_METHOD_NOT_ALLOWED_BODY)
+        self._not_allowed_headers.append((b"allow", b"GET, HEAD"))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = self._responses.get(scope["path"]) if scope["type"] == "http" else None
+        if response is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] in _ALLOWED_METHODS:
+            status, (headers, body) = 200, response
+        else:
+            status, headers, body = 405, self._not_allowed_headers, _METHOD_NOT_ALLOWED_BODY
+
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({
+            "type": "http.response.body",
+            "body": b"" if scope["method"] == "HEAD" else body,
+        })
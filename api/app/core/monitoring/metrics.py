@@ -2,11 +2,13 @@
 性能监控指标收集器 - Prometheus指标和性能数据收集
 """
 
+import sys
 import time
 import threading
+from array import array
 from collections import defaultdict, deque
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Callable
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Callable, Iterable, Set, Tuple
 from dataclasses import dataclass, asdict
 import psutil
 import asyncio
@@ -22,13 +24,44 @@ logger = get_context_logger(
     session_id="monitoring"
 )
 
+_NS_PER_MINUTE = 60 * 1_000_000_000
+
+# 指标摘要支持的最长时间窗口（分钟），即分钟聚合保留的桶数
+SUMMARY_MAX_MINUTES = 60
+_LOCK_SHARDS = 16  # 必须是2的幂
+
+# record_batch可调用的记录方法
+_BATCH_RECORDERS = frozenset({
+    "record_agent_processing_time",
+    "record_workflow_duration",
+    "update_plan_task_status",
+    "record_agent_collaboration",
+    "record_api_request",
+    "update_active_sessions",
+    "update_active_agents",
+    "record_error",
+})
+
+# 预先绑定活跃Agent数量子指标的Agent类型（SAFE框架类型及监控演示使用的类型）
+KNOWN_AGENT_TYPES = (
+    "strategist", "awareness", "field_expert", "executor", "reviewer",
+    "analyst", "frontline", "evaluator",
+)
+
+# 负载平均值在导入时确定是否可用（旧版psutil在Windows上没有getloadavg）
+_GETLOADAVG: Optional[Callable[[], Tuple[float, float, float]]] = getattr(psutil, "getloadavg", None)
+_NO_LOAD_AVG = (0.0, 0.0, 0.0)
+
+# 高频创建的数据类使用__slots__（dataclass的slots参数需要Python 3.10+）
+SLOTS_DATACLASS_OPTIONS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**SLOTS_DATACLASS_OPTIONS)
 class PerformanceMetric:
     """性能指标数据结构"""
     name: str
     value: float
-    timestamp: datetime
+    timestamp: int  # 纳秒级Unix时间戳（time.time_ns()），仅在输出时转换为datetime
     labels: Dict[str, str] = None
     unit: str = ""
     description: str = ""
@@ -38,13 +71,171 @@ class PerformanceMetric:
             self.labels = {}
 
 
+@dataclass(**SLOTS_DATACLASS_OPTIONS)
+class SystemSnapshot:
+    """系统资源快照，由后台采样任务定期刷新，读取时无需调用psutil"""
+    timestamp: datetime
+    timestamp_iso: str  # 采样时格式化一次，读取方直接使用
+    cpu_percent: float
+    cpu_count: int
+    load_avg: Tuple[float, float, float]
+    memory: Any  # psutil.virtual_memory()
+    disk: Any  # psutil.disk_usage('/')
+    network: Any  # psutil.net_io_counters()
+
+
+class _SeriesRing:
+    """定长环形缓冲区，按列（SoA）存储数值和纳秒时间戳，每个数据点仅占16字节"""
+
+    __slots__ = ("capacity", "values", "timestamps", "labels", "unit", "write_index", "size")
+
+    def __init__(self, capacity: int, unit: str = ""):
+        self.capacity = capacity
+        self.values = array('d', bytes(8 * capacity))
+        self.timestamps = array('q', bytes(8 * capacity))
+        # 仅带标签的指标才分配标签列
+        self.labels: Optional[List[Optional[Dict[str, str]]]] = None
+        self.unit = unit
+        self.write_index = 0
+        self.size = 0
+
+    def append(self, value: float, timestamp: int, labels: Optional[Dict[str, str]] = None):
+        """写入数据点，缓冲区满时覆盖最旧的数据点"""
+        i = self.write_index
+        self.values[i] = value
+        self.timestamps[i] = timestamp
+        if labels:
+            if self.labels is None:
+                self.labels = [None] * self.capacity
+            self.labels[i] = labels
+        elif self.labels is not None:
+            self.labels[i] = None
+
+        self.write_index = (i + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+
+    def latest(self) -> Tuple[float, int]:
+        """返回最新数据点的(value, timestamp)"""
+        i = (self.write_index - 1) % self.capacity
+        return self.values[i], self.timestamps[i]
+
+    def oldest_index(self) -> int:
+        """返回最旧数据点的位置"""
+        return (self.write_index - self.size) % self.capacity
+
+    def discard_before(self, cutoff_timestamp: int) -> int:
+        """丢弃早于cutoff的数据点（数据按时间有序，只需移动尾部位置），返回丢弃数量"""
+        discarded = 0
+        oldest = self.oldest_index()
+        while self.size and self.timestamps[oldest] < cutoff_timestamp:
+            if self.labels is not None:
+                self.labels[oldest] = None
+            oldest = (oldest + 1) % self.capacity
+            self.size -= 1
+            discarded += 1
+        return discarded
+
+
+class _MinuteRollup:
+    """按分钟分桶的滚动聚合（保留最近60分钟），摘要计算无需遍历原始数据点"""
+
+    BUCKETS = SUMMARY_MAX_MINUTES
+
+    def __init__(self):
+        self.minutes = [-1] * self.BUCKETS
+        self.counts = [0] * self.BUCKETS
+        self.sums = [0.0] * self.BUCKETS
+        self.mins = [0.0] * self.BUCKETS
+        self.maxs = [0.0] * self.BUCKETS
+
+    def add(self, minute: int, value: float):
+        """将数据点累加到所属分钟的桶中，过期桶会被复用"""
+        i = minute % self.BUCKETS
+        if self.minutes[i] != minute:
+            self.minutes[i] = minute
+            self.counts[i] = 1
+            self.sums[i] = self.mins[i] = self.maxs[i] = value
+            return
+
+        self.counts[i] += 1
+        self.sums[i] += value
+        if value < self.mins[i]:
+            self.mins[i] = value
+        if value > self.maxs[i]:
+            self.maxs[i] = value
+
+    def aggregate(self, current_minute: int, minutes: int) -> Optional[Tuple[int, float, float, float]]:
+        """汇总最近N个分钟桶，返回(count, sum, min, max)，无数据时返回None"""
+        # 只访问窗口内的桶，minutes=1时仅检查一个桶
+        count = 0
+        total = 0.0
+        low = high = None
+        for minute in range(current_minute - min(minutes, self.BUCKETS) + 1, current_minute + 1):
+            i = minute % self.BUCKETS
+            if self.minutes[i] != minute:
+                continue
+            count += self.counts[i]
+            total += self.sums[i]
+            if low is None or self.mins[i] < low:
+                low = self.mins[i]
+            if high is None or self.maxs[i] > high:
+                high = self.maxs[i]
+
+        if not count:
+            return None
+        return count, total, low, high
+
+
 class MetricsCollector:
     """指标收集器"""
 
-    def __init__(self):
+    # 默认镜像到内部存储的指标；高频的api_request和agent_processing_time以Prometheus为准
+    DEFAULT_MIRRORED_METRICS = frozenset({
+        "workflow_duration",
+        "plan_task_status",
+        "agent_collaboration",
+        "system_cpu_usage",
+        "system_memory_usage",
+        "system_disk_usage",
+        "active_sessions",
+        "active_agents",
+        "error",
+    })
+
+    def __init__(self, mirror_to_store: Optional[Iterable[str]] = None):
         self.registry = CollectorRegistry()
-        self._metrics_store = defaultdict(lambda: deque(maxlen=1000))  # 最近1000个数据点
-        self._lock = threading.Lock()
+        # 每个指标一个环形缓冲区，保留最近1000个数据点
+        self._series: Dict[str, _SeriesRing] = {}
+        self._series_capacity = 1000
+        # 按分钟滚动聚合，用于O(1)生成摘要
+        self._rollups: Dict[str, _MinuteRollup] = defaultdict(_MinuteRollup)
+        # 保护环形缓冲区写入和分钟聚合的更新，按指标名分片以减少不同指标间的锁竞争
+        self._locks = [threading.Lock() for _ in range(_LOCK_SHARDS)]
+        self._mirror_to_store: Set[str] = set(
+            self.DEFAULT_MIRRORED_METRICS if mirror_to_store is None else mirror_to_store
+        )
+
+        # record_batch期间待写入内部存储的指标，按线程隔离
+        self._batch_state = threading.local()
+
+        # 已绑定标签值的子指标缓存，避免每次记录都执行labels()查找
+        self._labeled_children: Dict[Tuple[Any, Tuple[str, ...]], Any] = {}
+
+        # 最近一次CPU采样值和系统资源快照，由后台采样任务维护，读取时无需阻塞等待
+        self._last_cpu_percent: Optional[float] = None
+        self._system_snapshot: Optional[SystemSnapshot] = None
+        self._system_sample_interval_seconds = 2
+
+        # 后台任务（在start_background_collection中创建，避免绑定到导入时的事件循环）
+        self._shutdown: Optional[asyncio.Event] = None
+        self._background_tasks: List[asyncio.Task] = []
+        self._max_backoff_seconds = 300
+
+        # API请求观测值的本地聚合缓冲区，后台任务运行期间每100ms批量写入一次
+        self._pending_api_requests: deque = deque()
+        self._batch_observations = False
+        self._flush_interval_seconds = 0.1
 
         # Prometheus指标定义
         self._setup_prometheus_metrics()
@@ -128,6 +319,10 @@ class MetricsCollector:
             ['agent_type'],
             registry=self.registry
         )
+        # 按Agent类型缓存子指标，更新时只需一次字符串键查找；未知类型在首次更新时绑定
+        self._active_agent_gauges: Dict[str, Gauge] = {
+            agent_type: self.active_agents.labels(agent_type) for agent_type in KNOWN_AGENT_TYPES
+        }
 
         # 错误指标
         self.error_total = Counter(
@@ -141,19 +336,45 @@ class MetricsCollector:
         """设置Prometheus指标"""
         pass
 
+    def _labeled(self, metric: Any, *label_values: str) -> Any:
+        """获取绑定标签值后的子指标（按标签定义顺序传值），结果会被缓存"""
+        key = (metric, label_values)
+        child = self._labeled_children.get(key)
+        if child is None:
+            child = self._labeled_children.setdefault(key, metric.labels(*label_values))
+        return child
+
+    def record_batch(self, updates: Iterable[Tuple[str, Dict[str, Any]]]):
+        """
+        批量记录指标
+
+        updates中每一项为(记录方法名, 关键字参数)，例如
+        ("record_api_request", {"method": "GET", ...})。Prometheus指标逐项更新，
+        内部存储的写入按分片锁分组，每个锁只获取一次。
+        """
+        pending: List[PerformanceMetric] = []
+        self._batch_state.pending = pending
+        try:
+            for method_name, kwargs in updates:
+                if method_name not in _BATCH_RECORDERS:
+                    raise ValueError(f"Unsupported metric recorder: {method_name}")
+                getattr(self, method_name)(**kwargs)
+        finally:
+            self._batch_state.pending = None
+            self._store_metrics(pending)
+
     def record_agent_processing_time(self, agent_type: str, task_type: str, duration_seconds: float, status: str = "success"):
         """记录Agent处理时间"""
-        self.agent_processing_time.labels(
-            agent_type=agent_type,
-            task_type=task_type,
-            status=status
-        ).observe(duration_seconds)
+        self._labeled(self.agent_processing_time, agent_type, task_type, status).observe(duration_seconds)
+
+        # 仅镜像需要摘要的指标到内部存储
+        if "agent_processing_time" not in self._mirror_to_store:
+            return
 
-        # 存储到内部指标
         metric = PerformanceMetric(
             name="agent_processing_time",
             value=duration_seconds,
-            timestamp=datetime.utcnow(),
+            timestamp=time.time_ns(),
             labels={
                 "agent_type": agent_type,
                 "task_type": task_type,
@@ -166,16 +387,16 @@ class MetricsCollector:
 
     def record_workflow_duration(self, workflow_name: str, severity_level: str, duration_seconds: float, status: str = "completed"):
         """记录工作流完成时间"""
-        self.sop_workflow_duration.labels(
-            workflow_name=workflow_name,
-            severity_level=severity_level,
-            status=status
-        ).observe(duration_seconds)
+        self._labeled(self.sop_workflow_duration, workflow_name, severity_level, status).observe(duration_seconds)
+
+        # 仅镜像需要摘要的指标到内部存储
+        if "workflow_duration" not in self._mirror_to_store:
+            return
 
         metric = PerformanceMetric(
             name="workflow_duration",
             value=duration_seconds,
-            timestamp=datetime.utcnow(),
+            timestamp=time.time_ns(),
             labels={
                 "workflow_name": workflow_name,
                 "severity_level": severity_level,
@@ -188,16 +409,16 @@ class MetricsCollector:
 
     def update_plan_task_status(self, status: str, assignee: str, task_type: str, count: int = 1):
         """更新Plan任务状态"""
-        self.plan_task_status.labels(
-            status=status,
-            assignee=assignee,
-            task_type=task_type
-        ).set(count)
+        self._labeled(self.plan_task_status, status, assignee, task_type).set(count)
+
+        # 仅镜像需要摘要的指标到内部存储
+        if "plan_task_status" not in self._mirror_to_store:
+            return
 
         metric = PerformanceMetric(
             name="plan_task_status",
             value=count,
-            timestamp=datetime.utcnow(),
+            timestamp=time.time_ns(),
             labels={
                 "status": status,
                 "assignee": assignee,
@@ -210,16 +431,16 @@ class MetricsCollector:
 
     def record_agent_collaboration(self, requester: str, target: str, operation_type: str):
         """记录Agent协作请求"""
-        self.agent_collaboration_count.labels(
-            requester=requester,
-            target=target,
-            operation_type=operation_type
-        ).inc()
+        self._labeled(self.agent_collaboration_count, requester, target, operation_type).inc()
+
+        # 仅镜像需要摘要的指标到内部存储
+        if "agent_collaboration" not in self._mirror_to_store:
+            return
 
         metric = PerformanceMetric(
             name="agent_collaboration",
             value=1,
-            timestamp=datetime.utcnow(),
+            timestamp=time.time_ns(),
             labels={
                 "requester": requester,
                 "target": target,
@@ -232,21 +453,21 @@ class MetricsCollector:
 
     def record_api_request(self, method: str, endpoint: str, status_code: int, duration_seconds: float):
         """记录API请求"""
-        self.api_requests_total.labels(
-            method=method,
-            endpoint=endpoint,
-            status_code=str(status_code)
-        ).inc()
+        if self._batch_observations:
+            # 后台任务运行时先写入本地缓冲区，由flush_pending_observations批量写入Prometheus
+            self._pending_api_requests.append((method, endpoint, str(status_code), duration_seconds))
+        else:
+            self._labeled(self.api_requests_total, method, endpoint, str(status_code)).inc()
+            self._labeled(self.api_request_duration, method, endpoint).observe(duration_seconds)
 
-        self.api_request_duration.labels(
-            method=method,
-            endpoint=endpoint
-        ).observe(duration_seconds)
+        # 仅镜像需要摘要的指标到内部存储
+        if "api_request" not in self._mirror_to_store:
+            return
 
         metric = PerformanceMetric(
             name="api_request",
             value=duration_seconds,
-            timestamp=datetime.utcnow(),
+            timestamp=time.time_ns(),
             labels={
                 "method": method,
                 "endpoint": endpoint,
@@ -257,11 +478,66 @@ class MetricsCollector:
         )
         self._store_metric(metric)
 
+    def flush_pending_observations(self) -> int:
+        """将缓冲的API请求观测值批量写入Prometheus，计数器按标签合并后一次递增"""
+        pending = self._pending_api_requests
+        request_counts: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        flushed = 0
+
+        # deque.popleft在GIL下是原子操作，可与并发的append安全交错
+        while pending:
+            try:
+                method, endpoint, status_code, duration_seconds = pending.popleft()
+            except IndexError:
+                break
+            request_counts[(method, endpoint, status_code)] += 1
+            self._labeled(self.api_request_duration, method, endpoint).observe(duration_seconds)
+            flushed += 1
+
+        for label_values, count in request_counts.items():
+            self._labeled(self.api_requests_total, *label_values).inc(count)
+
+        return flushed
+
+    @property
+    def last_cpu_percent(self) -> Optional[float]:
+        """最近一次采样的CPU使用率（后台采样未启动时为None）"""
+        return self._last_cpu_percent
+
+    def sample_cpu_percent(self) -> float:
+        """非阻塞采样CPU使用率，返回自上次采样以来的平均值"""
+        cpu_percent = psutil.cpu_percent(interval=None)
+        self._last_cpu_percent = cpu_percent
+        return cpu_percent
+
+    @property
+    def system_snapshot(self) -> Optional[SystemSnapshot]:
+        """最近一次的系统资源快照（后台采样未启动时为None）"""
+        return self._system_snapshot
+
+    def sample_system_snapshot(self) -> SystemSnapshot:
+        """非阻塞采样CPU、内存、磁盘和网络，更新共享的系统资源快照"""
+        now = datetime.now()
+        snapshot = SystemSnapshot(
+            timestamp=now,
+            timestamp_iso=now.isoformat(),
+            cpu_percent=self.sample_cpu_percent(),
+            cpu_count=psutil.cpu_count(),
+            load_avg=_GETLOADAVG() if _GETLOADAVG is not None else _NO_LOAD_AVG,
+            memory=psutil.virtual_memory(),
+            disk=psutil.disk_usage('/'),
+            network=psutil.net_io_counters(),
+        )
+        self._system_snapshot = snapshot
+        return snapshot
+
     def update_system_metrics(self):
         """更新系统指标"""
         try:
-            # CPU使用率
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU使用率（优先使用后台采样值，避免interval=1阻塞1秒）
+            cpu_percent = self._last_cpu_percent
+            if cpu_percent is None:
+                cpu_percent = self.sample_cpu_percent()
             self.system_cpu_usage.set(cpu_percent)
 
             # 内存使用率
@@ -279,10 +555,12 @@ class MetricsCollector:
                 ("memory_usage", memory.percent),
                 ("disk_usage", disk_percent)
             ]:
+                if f"system_{name}" not in self._mirror_to_store:
+                    continue
                 metric = PerformanceMetric(
                     name=f"system_{name}",
                     value=value,
-                    timestamp=datetime.utcnow(),
+                    timestamp=time.time_ns(),
                     unit="percent",
                     description=f"System {name.replace('_', ' ')}"
                 )
@@ -295,10 +573,14 @@ class MetricsCollector:
         """更新活跃会话数"""
         self.active_sessions.set(count)
 
+        # 仅镜像需要摘要的指标到内部存储
+        if "active_sessions" not in self._mirror_to_store:
+            return
+
         metric = PerformanceMetric(
             name="active_sessions",
             value=count,
-            timestamp=datetime.utcnow(),
+            timestamp=time.time_ns(),
             unit="count",
             description="Number of active sessions"
         )
@@ -306,12 +588,19 @@ class MetricsCollector:
 
     def update_active_agents(self, agent_type: str, count: int):
         """更新活跃Agent数量"""
-        self.active_agents.labels(agent_type=agent_type).set(count)
+        gauge = self._active_agent_gauges.get(agent_type)
+        if gauge is None:
+            gauge = self._active_agent_gauges.setdefault(agent_type, self.active_agents.labels(agent_type))
+        gauge.set(count)
+
+        # 仅镜像需要摘要的指标到内部存储
+        if "active_agents" not in self._mirror_to_store:
+            return
 
         metric = PerformanceMetric(
             name="active_agents",
             value=count,
-            timestamp=datetime.utcnow(),
+            timestamp=time.time_ns(),
             labels={"agent_type": agent_type},
             unit="count",
             description="Number of active agents"
@@ -319,72 +608,125 @@ class MetricsCollector:
         self._store_metric(metric)
 
     def record_error(self, error_type: str, component: str, error_message: str = ""):
-        """记录错误"""
-        self.error_total.labels(
-            error_type=error_type,
-            component=component
-        ).inc()
+        """记录错误（错误消息只写入日志，不作为指标标签，避免标签基数膨胀）"""
+        self._labeled(self.error_total, error_type, component).inc()
+
+        if error_message:
+            logger.bind(error_type=error_type, component=component).debug(
+                f"Recorded error: {error_message}"
+            )
+
+        # 仅镜像需要摘要的指标到内部存储
+        if "error" not in self._mirror_to_store:
+            return
 
         metric = PerformanceMetric(
             name="error",
             value=1,
-            timestamp=datetime.utcnow(),
+            timestamp=time.time_ns(),
             labels={
                 "error_type": error_type,
-                "component": component,
-                "error_message": error_message[:100]  # 截断长错误消息
+                "component": component
             },
             unit="count",
             description="Error occurrence"
         )
         self._store_metric(metric)
 
-    def _store_metric(self, metric: PerformanceMetric):
-        """存储指标到内部存储"""
-        with self._lock:
-            self._metrics_store[metric.name].append(metric)
-
-    def get_metrics_summary(self, metric_name: str, minutes: int = 5) -> Dict[str, Any]:
-        """获取指标摘要"""
-        with self._lock:
-            if metric_name not in self._metrics_store:
-                return {}
+    def enable_store_mirroring(self, metric_name: str):
+        """将指定指标镜像到内部存储，以便获取摘要"""
+        self._mirror_to_store.add(metric_name)
 
-            # 获取最近N分钟的数据
-            cutoff_time = datetime.utcnow() - timedelta(minutes=minutes)
-            recent_metrics = [
-                m for m in self._metrics_store[metric_name]
-                if m.timestamp >= cutoff_time
-            ]
+    def disable_store_mirroring(self, metric_name: str):
+        """停止镜像指定指标到内部存储"""
+        self._mirror_to_store.discard(metric_name)
 
-            if not recent_metrics:
-                return {}
+    def _lock_for(self, metric_name: str) -> threading.Lock:
+        """获取指标名对应的分片锁"""
+        return self._locks[hash(metric_name) & (_LOCK_SHARDS - 1)]
 
-            values = [m.value for m in recent_metrics]
+    def _store_metric(self, metric: PerformanceMetric):
+        """存储指标到内部存储（record_batch期间先暂存，批量结束时统一写入）"""
+        if metric.name not in self._mirror_to_store:
+            return
+        pending = getattr(self._batch_state, "pending", None)
+        if pending is not None:
+            pending.append(metric)
+            return
+        with self._lock_for(metric.name):
+            self._append_locked(metric)
+
+    def _store_metrics(self, metrics: List[PerformanceMetric]):
+        """批量存储指标，按分片锁分组，每个锁只获取一次"""
+        by_lock: Dict[int, List[PerformanceMetric]] = defaultdict(list)
+        for metric in metrics:
+            by_lock[hash(metric.name) & (_LOCK_SHARDS - 1)].append(metric)
+        for shard, shard_metrics in by_lock.items():
+            with self._locks[shard]:
+                for metric in shard_metrics:
+                    self._append_locked(metric)
+
+    def _append_locked(self, metric: PerformanceMetric):
+        """写入环形缓冲区和分钟聚合（调用方需持有该指标的分片锁）"""
+        series = self._series.get(metric.name)
+        if series is None:
+            series = self._series[metric.name] = _SeriesRing(self._series_capacity, metric.unit)
+        series.append(metric.value, metric.timestamp, metric.labels)
+        self._rollups[metric.name].add(metric.timestamp // _NS_PER_MINUTE, metric.value)
 
-            return {
-                "metric_name": metric_name,
-                "time_range_minutes": minutes,
-                "count": len(values),
-                "min": min(values),
-                "max": max(values),
-                "avg": sum(values) / len(values),
-                "latest": recent_metrics[-1].value,
-                "latest_timestamp": recent_metrics[-1].timestamp.isoformat(),
-                "unit": recent_metrics[-1].unit
-            }
+    def get_metrics_summary(self, metric_name: str, minutes: int = 5) -> Dict[str, Any]:
+        """
+        获取指标摘要（按分钟桶聚合）
+
+        时间窗口按整分钟对齐：包含当前分钟及之前的minutes-1个整分钟，而非精确的
+        now-minutes截止时间；超过SUMMARY_MAX_MINUTES的窗口按上限计算，返回的
+        time_range_minutes为实际窗口。分钟聚合独立于原始数据点的环形缓冲区，
+        计数包含已被环形缓冲区淘汰的数据点。
+        """
+        return self._summarize(metric_name, minutes, time.time_ns() // _NS_PER_MINUTE)
+
+    def _summarize(self, metric_name: str, minutes: int, current_minute: int) -> Dict[str, Any]:
+        series = self._series.get(metric_name)
+        rollup = self._rollups.get(metric_name)
+        if series is None or rollup is None:
+            return {}
+
+        # 获取最近N分钟的数据
+        with self._lock_for(metric_name):
+            if not series.size:
+                return {}
+            aggregated = rollup.aggregate(current_minute, minutes)
+            latest_value, latest_timestamp = series.latest()
+        if aggregated is None:
+            return {}
+
+        count, total, low, high = aggregated
+
+        return {
+            "metric_name": metric_name,
+            "time_range_minutes": min(minutes, rollup.BUCKETS),
+            "count": count,
+            "min": low,
+            "max": high,
+            "avg": total / count,
+            "latest": latest_value,
+            "latest_timestamp": datetime.utcfromtimestamp(latest_timestamp / 1e9).isoformat(),
+            "unit": series.unit
+        }
 
     def get_all_metrics_summary(self, minutes: int = 5) -> Dict[str, Dict[str, Any]]:
-        """获取所有指标摘要"""
-        summary = {}
-        with self._lock:
-            for metric_name in self._metrics_store.keys():
-                summary[metric_name] = self.get_metrics_summary(metric_name, minutes)
-        return summary
-
-    def get_prometheus_metrics(self) -> str:
-        """获取Prometheus格式的指标"""
-        return generate_latest(self.registry).decode('utf-8')
+        """获取所有指标摘要（时间窗口语义同get_metrics_summary）"""
+        # 所有指标使用同一个当前分钟，保证摘要的时间窗口一致
+        current_minute = time.time_ns() // _NS_PER_MINUTE
+        return {
+            metric_name: self._summarize(metric_name, minutes, current_minute)
+            for metric_name in list(self._series)
+        }
+
+    def get_prometheus_metrics_bytes(self) -> bytes:
+        """获取Prometheus格式的指标（ASCII字节串，直接作为响应体，无需解码）"""
+        self.flush_pending_observations()
+        return generate_latest(self.registry)
 
     def get_content_type(self) -> str:
         """获取Prometheus指标内容类型"""
@@ -392,45 +734,117 @@ class MetricsCollector:
 
     def cleanup_old_metrics(self, hours: int = 24):
         """清理旧指标数据"""
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-
-        with self._lock:
-            for metric_name in self._metrics_store.keys():
-                # 保留最近的指标
-                recent_metrics = deque(
-                    (m for m in self._metrics_store[metric_name] if m.timestamp >= cutoff_time),
-                    maxlen=1000
+        cutoff_time = time.time_ns() - hours * 3600 * 1_000_000_000
+
+        discarded = 0
+        for metric_name, series in list(self._series.items()):
+            # 数据按时间有序，最旧数据点未过期时无需加锁
+            if not series.size or series.timestamps[series.oldest_index()] >= cutoff_time:
+                continue
+            # 逐个指标加锁原地截断，不阻塞其他指标的写入
+            with self._lock_for(metric_name):
+                discarded += series.discard_before(cutoff_time)
+
+        logger.info(f"Cleaned up {discarded} metrics older than {hours} hours")
+
+    async def _run_periodic(
+        self,
+        job_name: str,
+        job: Callable[[], Any],
+        interval_seconds: float,
+        initial_delay_seconds: float = 0,
+        in_thread: bool = False
+    ):
+        """
+        按单调时钟截止时间周期执行任务，出错时指数退避，stop()后立即退出
+
+        in_thread为True时任务在线程池中执行，用于psutil等阻塞的系统调用
+        """
+        backoff_seconds = interval_seconds
+        deadline = time.monotonic() + initial_delay_seconds
+
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._shutdown.wait(),
+                    timeout=max(0, deadline - time.monotonic())
                 )
-                self._metrics_store[metric_name] = recent_metrics
-
-        logger.info(f"Cleaned up metrics older than {hours} hours")
+                return
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                if in_thread:
+                    await asyncio.to_thread(job)
+                else:
+                    job()
+                backoff_seconds = interval_seconds
+                # 基于上一个截止时间推进，避免周期漂移；落后过多时从当前时间重新计算
+                now = time.monotonic()
+                deadline += interval_seconds
+                if deadline < now:
+                    deadline = now + interval_seconds
+            except Exception as e:
+                backoff_seconds = min(backoff_seconds * 2, self._max_backoff_seconds)
+                logger.error(f"{job_name} error: {str(e)}, retrying in {backoff_seconds}s")
+                deadline = time.monotonic() + backoff_seconds
 
     async def start_background_collection(self):
         """启动后台指标收集"""
-        async def collect_system_metrics():
-            while True:
-                try:
-                    self.update_system_metrics()
-                    await asyncio.sleep(30)  # 每30秒收集一次系统指标
-                except Exception as e:
-                    logger.error(f"System metrics collection error: {str(e)}")
-                    await asyncio.sleep(60)  # 错误时等待更长时间
-
-        async def cleanup_metrics():
-            while True:
-                try:
-                    self.cleanup_old_metrics(hours=1)  # 每小时清理一次超过1小时的指标
-                    await asyncio.sleep(3600)  # 每小时执行一次
-                except Exception as e:
-                    logger.error(f"Metrics cleanup error: {str(e)}")
-                    await asyncio.sleep(3600)
+        self._shutdown = asyncio.Event()
+
+        # 首次调用仅用于建立基准，返回值无意义
+        psutil.cpu_percent(interval=None)
 
         # 启动后台任务
-        asyncio.create_task(collect_system_metrics())
-        asyncio.create_task(cleanup_metrics())
+        self._batch_observations = True
+        self._background_tasks = [
+            # CPU采样与内存、磁盘、网络一起写入系统资源快照
+            asyncio.create_task(self._run_periodic(
+                "System snapshot sampling",
+                self.sample_system_snapshot,
+                self._system_sample_interval_seconds,
+                initial_delay_seconds=self._system_sample_interval_seconds,
+                in_thread=True
+            )),
+            # 每30秒收集一次系统指标
+            asyncio.create_task(self._run_periodic(
+                "System metrics collection",
+                self.update_system_metrics,
+                30,
+                in_thread=True
+            )),
+            asyncio.create_task(self._run_periodic(
+                "Observation flush",
+                self.flush_pending_observations,
+                self._flush_interval_seconds,
+                initial_delay_seconds=self._flush_interval_seconds
+            )),
+            # 每小时清理一次超过1小时的指标
+            asyncio.create_task(self._run_periodic(
+                "Metrics cleanup",
+                lambda: self.cleanup_old_metrics(hours=1),
+                3600
+            )),
+        ]
 
         logger.info("Background metrics collection started")
 
+    async def stop(self):
+        """停止后台指标收集"""
+        if self._shutdown is None:
+            return
+
+        self._shutdown.set()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        self._background_tasks = []
+
+        # 停止批量写入并写出剩余的观测值
+        self._batch_observations = False
+        self.flush_pending_observations()
+
+        logger.info("Background metrics collection stopped")
+
 
 # 全局指标收集器实例
 metrics_collector = MetricsCollector()
\ No newline at end of file
@@ -5,21 +5,137 @@ This module contains security-related functionality for authentication,
 authorization, and password handling.
 """
 
+import base64
+import hashlib
+import logging
+import os
 import secrets
+import threading
+import time
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional
-from jose import jwt, JWTError
+from types import MappingProxyType
+from typing import Any, Deque, Dict, Mapping, Union, Optional, Tuple
+import anyio
+import bcrypt
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+import jwt
+from jwt import PyJWTError as JWTError
+from jwt.algorithms import get_default_algorithms
 from passlib.context import CryptContext
-from passlib.hash import bcrypt
 from pydantic import ValidationError
 
 from app.core.config import get_settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+# Legacy password hashing context, only consulted for hashes the bcrypt
+# extension cannot parse; new hashes are produced by bcrypt directly.
+# Each extra bcrypt round doubles the CPU cost of a hash/verify (2**rounds).
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds
+)
+
+# Bounds the number of bcrypt computations running in worker threads so
+# concurrent logins cannot exhaust the default thread pool; created lazily
+# because anyio limiters must be constructed inside a running event loop
+_bcrypt_limiter: Optional[anyio.CapacityLimiter] = None
+
+
+def _get_bcrypt_limiter() -> anyio.CapacityLimiter:
+    global _bcrypt_limiter
+    if _bcrypt_limiter is None:
+        _bcrypt_limiter = anyio.CapacityLimiter(os.cpu_count() or 1)
+    return _bcrypt_limiter
+
+
+# JWT keys and allowed algorithms are prepared once at import time; PyJWT
+# passes already-prepared key objects straight through to the signature
+# primitive instead of re-parsing the raw key material on every call.
+# For asymmetric algorithms SECRET_KEY holds the PEM private key and tokens
+# are verified with JWT_PUBLIC_KEY, or the private key's public half.
+_JWT_ALGORITHM = settings.algorithm
+_jwt_algorithm = get_default_algorithms()[_JWT_ALGORITHM]
+_JWT_KEY = _jwt_algorithm.prepare_key(settings.secret_key)
+if settings.jwt_public_key:
+    _JWT_VERIFY_KEY = _jwt_algorithm.prepare_key(settings.jwt_public_key)
+elif hasattr(_JWT_KEY, "public_key"):
+    _JWT_VERIFY_KEY = _JWT_KEY.public_key()
+else:
+    _JWT_VERIFY_KEY = _JWT_KEY
+_JWT_ALGORITHMS = [_JWT_ALGORITHM]
+_JWT_DECODE_OPTIONS = {"require": ["exp", "sub"]}
+
+# Token lifetimes and hashing costs resolved once from settings
+_ACCESS_TOKEN_EXPIRE = timedelta(minutes=settings.access_token_expire_minutes)
+_REFRESH_TOKEN_EXPIRE = timedelta(days=settings.refresh_token_expire_days)
+_BCRYPT_ROUNDS = settings.bcrypt_rounds
+_API_KEY_BCRYPT_ROUNDS = settings.api_key_bcrypt_rounds
+
+
+class _VerifiedTokenCache:
+    """
+    Size-bounded LRU cache of successfully verified JWTs
+
+    Entries are keyed by a BLAKE2b digest of the raw token so bearer tokens
+    are never held in memory. Each entry expires at the earlier of the
+    token's own ``exp`` claim and ``ttl`` seconds after it was verified;
+    the TTL bounds how long a token can keep being accepted from cache
+    after it has been revoked. Failed verifications are never cached.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[str, Optional[str], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[Tuple[str, Optional[str]]]:
+        """Return ``(subject, token_type)`` for a live entry, None otherwise"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[2] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0], entry[1]
+
+    def put(self, key: bytes, subject: str, token_type: Optional[str], exp: float) -> None:
+        expires_at = min(exp, time.time() + self.ttl)
+        with self._lock:
+            self._entries[key] = (subject, token_type, expires_at)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_token_cache = _VerifiedTokenCache(
+    maxsize=settings.token_cache_size, ttl=settings.token_cache_ttl_seconds
+)
+
+
+def clear_token_cache() -> None:
+    """
+    Drop all cached token verifications
+
+    Call on logout or key rotation so previously verified tokens go
+    through full signature verification again.
+    """
+    _token_cache.clear()
+
 
 def create_access_token(
     subject: Union[str, Any],
@@ -38,12 +154,10 @@ def create_access_token(
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(
-            minutes=settings.access_token_expire_minutes
-        )
+        expire = datetime.utcnow() + _ACCESS_TOKEN_EXPIRE
 
     to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    encoded_jwt = jwt.encode(to_encode, _JWT_KEY, algorithm=_JWT_ALGORITHM)
     return encoded_jwt
 
 
@@ -64,12 +178,10 @@ def create_refresh_token(
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(
-            days=settings.refresh_token_expire_days
-        )
+        expire = datetime.utcnow() + _REFRESH_TOKEN_EXPIRE
 
     to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    encoded_jwt = jwt.encode(to_encode, _JWT_KEY, algorithm=_JWT_ALGORITHM)
     return encoded_jwt
 
 
@@ -84,21 +196,34 @@ def verify_token(token: str, token_type: str = "access") -> Optional[str]:
     Returns:
         Token subject if valid, None otherwise
     """
-    try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-
-        # Check token type for refresh tokens
-        if token_type == "refresh" and payload.get("type") != "refresh":
+    key = _token_cache.key_for(token)
+    cached = _token_cache.get(key)
+    if cached is not None:
+        subject, payload_type = cached
+    else:
+        try:
+            payload = jwt.decode(
+                token,
+                _JWT_VERIFY_KEY,
+                algorithms=_JWT_ALGORITHMS,
+                options=_JWT_DECODE_OPTIONS,
+            )
+        except JWTError:
             return None
 
-        subject: str = payload.get("sub")
+        subject = payload.get("sub")
         if subject is None:
             return None
 
-        return subject
-    except JWTError:
+        payload_type = payload.get("type")
+        _token_cache.put(key, subject, payload_type, payload["exp"])
+
+    # Check token type for refresh tokens
+    if token_type == "refresh" and payload_type != "refresh":
         return None
 
+    return subject
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -111,7 +236,12 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches hash, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return bcrypt.checkpw(
+            plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+        )
+    except ValueError:
+        return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
@@ -124,7 +254,39 @@ def get_password_hash(password: str) -> str:
     Returns:
         Hashed password
     """
-    return pwd_context.hash(password)
+    salt = bcrypt.gensalt(rounds=_BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("ascii")
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against its hash without blocking the event loop
+
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password
+
+    Returns:
+        True if password matches hash, False otherwise
+    """
+    return await anyio.to_thread.run_sync(
+        verify_password, plain_password, hashed_password, limiter=_get_bcrypt_limiter()
+    )
+
+
+async def aget_password_hash(password: str) -> str:
+    """
+    Hash a password without blocking the event loop
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        Hashed password
+    """
+    return await anyio.to_thread.run_sync(
+        get_password_hash, password, limiter=_get_bcrypt_limiter()
+    )
 
 
 def generate_password_reset_token(email: str) -> str:
@@ -137,14 +299,12 @@ def generate_password_reset_token(email: str) -> str:
     Returns:
         Password reset token
     """
-    delta = timedelta(hours=settings.email_reset_token_expire_hours)
-    now = datetime.utcnow()
-    expires = now + delta
-    exp = expires.timestamp()
+    now = int(time.time())
+    exp = now + settings.email_reset_token_expire_hours * 3600
     encoded_jwt = jwt.encode(
         {"exp": exp, "nbf": now, "sub": email},
-        settings.secret_key,
-        algorithm=settings.algorithm,
+        _JWT_KEY,
+        algorithm=_JWT_ALGORITHM,
     )
     return encoded_jwt
 
@@ -160,12 +320,47 @@ def verify_password_reset_token(token: str) -> Optional[str]:
         Email address if valid, None otherwise
     """
     try:
-        decoded_token = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        decoded_token = jwt.decode(token, _JWT_VERIFY_KEY, algorithms=_JWT_ALGORITHMS)
         return decoded_token["sub"]
     except JWTError:
         return None
 
 
+class _EntropyPool:
+    """
+    Buffer of os.urandom output handed out in slices
+
+    Refilling in 4 KiB chunks means issuing a burst of keys costs one
+    getrandom syscall per ~128 keys. Consumed bytes are zeroed, and the
+    pool is discarded in forked children so workers never share entropy.
+    """
+
+    def __init__(self, size: int = 4096):
+        self.size = size
+        self._reset()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._buffer = bytearray()
+        self._position = 0
+
+    def take(self, nbytes: int) -> bytes:
+        with self._lock:
+            if self._position + nbytes > len(self._buffer):
+                self._buffer = bytearray(os.urandom(max(self.size, nbytes)))
+                self._position = 0
+            end = self._position + nbytes
+            chunk = bytes(self._buffer[self._position:end])
+            self._buffer[self._position:end] = bytes(nbytes)
+            self._position = end
+            return chunk
+
+
+_api_key_entropy = _EntropyPool()
+
+
 def generate_api_key() -> str:
     """
     Generate a secure API key
@@ -173,7 +368,45 @@ def generate_api_key() -> str:
     Returns:
         API key string
     """
-    return secrets.token_urlsafe(32)
+    # Same format as secrets.token_urlsafe(32)
+    return base64.urlsafe_b64encode(_api_key_entropy.take(32)).rstrip(b"=").decode("ascii")
+
+
+def get_api_key_hash(api_key: str) -> str:
+    """
+    Hash an API key for storage
+
+    API keys are high-entropy random strings that are verified on every
+    request, so they use the cheaper ``api_key_bcrypt_rounds`` cost instead
+    of the user password cost.
+
+    Args:
+        api_key: Plain API key
+
+    Returns:
+        Hashed API key
+    """
+    salt = bcrypt.gensalt(rounds=_API_KEY_BCRYPT_ROUNDS)
+    return bcrypt.hashpw(api_key.encode("utf-8"), salt).decode("ascii")
+
+
+def verify_api_key(plain_api_key: str, hashed_api_key: str) -> bool:
+    """
+    Verify an API key against its hash
+
+    Args:
+        plain_api_key: Plain API key
+        hashed_api_key: Hashed API key
+
+    Returns:
+        True if the key matches the hash, False otherwise
+    """
+    try:
+        return bcrypt.checkpw(
+            plain_api_key.encode("utf-8"), hashed_api_key.encode("utf-8")
+        )
+    except ValueError:
+        return False
 
 
 def generate_verification_token(email: str) -> str:
@@ -186,14 +419,12 @@ def generate_verification_token(email: str) -> str:
     Returns:
         Email verification token
     """
-    delta = timedelta(hours=settings.email_verification_token_expire_hours)
-    now = datetime.utcnow()
-    expires = now + delta
-    exp = expires.timestamp()
+    now = int(time.time())
+    exp = now + settings.email_verification_token_expire_hours * 3600
     encoded_jwt = jwt.encode(
         {"exp": exp, "nbf": now, "sub": email},
-        settings.secret_key,
-        algorithm=settings.algorithm,
+        _JWT_KEY,
+        algorithm=_JWT_ALGORITHM,
     )
     return encoded_jwt
 
@@ -209,12 +440,63 @@ def verify_verification_token(token: str) -> Optional[str]:
         Email address if valid, None otherwise
     """
     try:
-        decoded_token = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        decoded_token = jwt.decode(token, _JWT_VERIFY_KEY, algorithms=_JWT_ALGORITHMS)
         return decoded_token["sub"]
     except JWTError:
         return None
 
 
+# Character class bits used by PasswordValidator
+_CHAR_UPPER = 1
+_CHAR_LOWER = 2
+_CHAR_DIGIT = 4
+_CHAR_SPECIAL = 8
+_CHAR_ALL = _CHAR_UPPER | _CHAR_LOWER | _CHAR_DIGIT | _CHAR_SPECIAL
+
+_SPECIAL_CHARS = frozenset("!@#$%^&*()_+-=[]{}|;:,.<>?")
+
+_COMMON_PASSWORDS = frozenset([
+    "password", "123456", "123456789", "12345678", "12345",
+    "1234567", "1234567890", "1234", "qwerty", "abc123",
+    "password123", "admin", "letmein", "welcome", "monkey"
+])
+
+
+def _classify_char(c: str) -> int:
+    return (
+        (_CHAR_UPPER if c.isupper() else 0)
+        | (_CHAR_LOWER if c.islower() else 0)
+        | (_CHAR_DIGIT if c.isdigit() else 0)
+        | (_CHAR_SPECIAL if c in _SPECIAL_CHARS else 0)
+    )
+
+
+# Class bitmap for code points 0-255, so the common case is a table lookup
+_CHAR_CLASSES = bytes(_classify_char(chr(i)) for i in range(256))
+
+
+def _character_class_mask(password: str) -> int:
+    """OR together the class bits of every character in the password"""
+    try:
+        encoded = password.encode("latin-1")
+    except UnicodeEncodeError:
+        # Characters beyond latin-1 need the str predicates
+        mask = 0
+        for c in password:
+            code = ord(c)
+            mask |= _CHAR_CLASSES[code] if code < 256 else _classify_char(c)
+            if mask == _CHAR_ALL:
+                break
+        return mask
+
+    # bytes.translate maps every character to its class bits in one C-level
+    # pass; at most 16 distinct bit patterns remain to be combined
+    mask = 0
+    for bits in set(encoded.translate(_CHAR_CLASSES)):
+        mask |= bits
+    return mask
+
+
 class PasswordValidator:
     """Password validation utility class"""
 
@@ -235,50 +517,24 @@ class PasswordValidator:
             "score": 0
         }
 
-        # Length check
-        if len(password) < 8:
-            result["errors"].append("Password must be at least 8 characters long")
-            result["is_valid"] = False
-        else:
-            result["score"] += 1
-
-        # Uppercase letter check
-        if not any(c.isupper() for c in password):
-            result["errors"].append("Password must contain at least one uppercase letter")
-            result["is_valid"] = False
-        else:
-            result["score"] += 1
-
-        # Lowercase letter check
-        if not any(c.islower() for c in password):
-            result["errors"].append("Password must contain at least one lowercase letter")
-            result["is_valid"] = False
-        else:
-            result["score"] += 1
-
-        # Number check
-        if not any(c.isdigit() for c in password):
-            result["errors"].append("Password must contain at least one number")
-            result["is_valid"] = False
-        else:
-            result["score"] += 1
+        mask = _character_class_mask(password)
 
-        # Special character check
-        special_chars = "!@#$%^&*()_+-=[]{}|;:,.<>?"
-        if not any(c in special_chars for c in password):
-            result["errors"].append("Password must contain at least one special character")
-            result["is_valid"] = False
-        else:
-            result["score"] += 1
+        checks = (
+            (len(password) >= 8, "Password must be at least 8 characters long"),
+            (mask & _CHAR_UPPER, "Password must contain at least one uppercase letter"),
+            (mask & _CHAR_LOWER, "Password must contain at least one lowercase letter"),
+            (mask & _CHAR_DIGIT, "Password must contain at least one number"),
+            (mask & _CHAR_SPECIAL, "Password must contain at least one special character"),
+        )
+        for passed, error in checks:
+            if passed:
+                result["score"] += 1
+            else:
+                result["errors"].append(error)
+                result["is_valid"] = False
 
         # Common password check
-        common_passwords = [
-            "password", "123456", "123456789", "12345678", "12345",
-            "1234567", "1234567890", "1234", "qwerty", "abc123",
-            "password123", "admin", "letmein", "welcome", "monkey"
-        ]
-
-        if password.lower() in common_passwords:
+        if password.lower() in _COMMON_PASSWORDS:
             result["errors"].append("Password is too common, please choose a stronger password")
             result["is_valid"] = False
             result["score"] = max(0, result["score"] - 2)
@@ -286,44 +542,48 @@ class PasswordValidator:
         return result
 
 
+_SECURITY_HEADERS: Mapping[str, str] = MappingProxyType({
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+    "Content-Security-Policy": (
+        "default-src 'self'; "
+        "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+        "style-src 'self' 'unsafe-inline'; "
+        "img-src 'self' data: https:; "
+        "font-src 'self'; "
+        "connect-src 'self'; "
+        "frame-ancestors 'none';"
+    ),
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "Permissions-Policy": (
+        "geolocation=(), microphone=(), camera=(), "
+        "payment=(), usb=(), magnetometer=(), gyroscope=()"
+    )
+})
+
+
 class SecurityHeaders:
     """Security headers utility class"""
 
     @staticmethod
-    def get_security_headers() -> dict:
+    def get_security_headers() -> Mapping[str, str]:
         """
         Get security headers for HTTP responses
 
         Returns:
-            Dictionary of security headers
+            Read-only mapping of security headers shared by all responses
         """
-        return {
-            "X-Content-Type-Options": "nosniff",
-            "X-Frame-Options": "DENY",
-            "X-XSS-Protection": "1; mode=block",
-            "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
-            "Content-Security-Policy": (
-                "default-src 'self'; "
-                "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
-                "style-src 'self' 'unsafe-inline'; "
-                "img-src 'self' data: https:; "
-                "font-src 'self'; "
-                "connect-src 'self'; "
-                "frame-ancestors 'none';"
-            ),
-            "Referrer-Policy": "strict-origin-when-cross-origin",
-            "Permissions-Policy": (
-                "geolocation=(), microphone=(), camera=(), "
-                "payment=(), usb=(), magnetometer=(), gyroscope=()"
-            )
-        }
+        return _SECURITY_HEADERS
 
 
 class RateLimiter:
     """Simple rate limiter for API endpoints"""
 
     def __init__(self):
-        self.requests = {}
+        self.requests: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
 
     def is_allowed(
         self,
@@ -342,34 +602,137 @@ class RateLimiter:
         Returns:
             Tuple of (is_allowed, rate_limit_info)
         """
-        now = datetime.utcnow().timestamp()
+        # Window bookkeeping uses the monotonic clock; reset_time is still
+        # reported as a wall-clock timestamp
+        with self._lock:
+            now = time.monotonic()
+            requests = self.requests.get(key)
+            if requests is None:
+                requests = self.requests[key] = deque()
+
+            # Drop requests that have left the window (timestamps are ordered)
+            while requests and now - requests[0] >= window:
+                requests.popleft()
+
+            # Check if under limit
+            if len(requests) < limit:
+                requests.append(now)
+                return True, {
+                    "allowed": True,
+                    "limit": limit,
+                    "remaining": limit - len(requests),
+                    "reset_time": int(time.time() + window)
+                }
+            else:
+                return False, {
+                    "allowed": False,
+                    "limit": limit,
+                    "remaining": 0,
+                    "reset_time": int(time.time() + requests[0] + window - now)
+                }
+
+
+class RedisRateLimiter:
+    """
+    Sliding-window rate limiter shared by all workers through Redis
+
+    Each check runs as a single Lua script (loaded once, then invoked via
+    EVALSHA), so pruning, counting and recording a request is atomic and
+    costs one round-trip. When Redis is unreachable the in-process
+    fallback limiter is used and Redis is retried after a cool-down.
+    """
 
-        if key not in self.requests:
-            self.requests[key] = []
+    # KEYS[1]: window key; ARGV: now_ms, window_ms, limit, member
+    # Returns {allowed, count, oldest_ms}
+    SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+local count = redis.call('ZCARD', key)
+if count < limit then
+    redis.call('ZADD', key, now, ARGV[4])
+    redis.call('PEXPIRE', key, window)
+    return {1, count + 1, now}
+end
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+return {0, count, tonumber(oldest[2])}
+"""
 
-        # Remove old requests outside the window
-        self.requests[key] = [
-            req_time for req_time in self.requests[key]
-            if now - req_time < window
-        ]
+    def __init__(
+        self,
+        redis_url: str,
+        fallback: RateLimiter,
+        key_prefix: str = "rate_limit",
+        retry_after_seconds: float = 30.0
+    ):
+        self.redis_url = redis_url
+        self.fallback = fallback
+        self.key_prefix = key_prefix
+        self.retry_after_seconds = retry_after_seconds
+        self._client: Optional[redis.Redis] = None
+        self._script = None
+        self._unavailable_until = 0.0
+
+    def _get_script(self):
+        if self._script is None:
+            self._client = redis.Redis.from_url(
+                self.redis_url,
+                socket_connect_timeout=0.5,
+                socket_timeout=0.5
+            )
+            self._script = self._client.register_script(self.SLIDING_WINDOW_SCRIPT)
+        return self._script
 
-        # Check if under limit
-        if len(self.requests[key]) < limit:
-            self.requests[key].append(now)
+    async def is_allowed(
+        self,
+        key: str,
+        limit: int,
+        window: int = 60
+    ) -> tuple[bool, dict]:
+        """
+        Check if request is allowed based on rate limit
+
+        Args:
+            key: Rate limit key (e.g., IP address, user ID)
+            limit: Number of requests allowed
+            window: Time window in seconds
+
+        Returns:
+            Tuple of (is_allowed, rate_limit_info)
+        """
+        if time.monotonic() < self._unavailable_until:
+            return self.fallback.is_allowed(key, limit, window)
+
+        now_ms = int(time.time() * 1000)
+        window_ms = window * 1000
+        try:
+            allowed, count, oldest_ms = await self._get_script()(
+                keys=[f"{self.key_prefix}:{key}"],
+                args=[now_ms, window_ms, limit, f"{now_ms}:{secrets.token_hex(4)}"]
+            )
+        except (RedisError, OSError) as e:
+            logger.warning(f"Redis rate limiter unavailable, using in-process limiter: {e}")
+            self._unavailable_until = time.monotonic() + self.retry_after_seconds
+            return self.fallback.is_allowed(key, limit, window)
+
+        if allowed:
             return True, {
                 "allowed": True,
                 "limit": limit,
-                "remaining": limit - len(self.requests[key]),
-                "reset_time": int(now + window)
-            }
-        else:
-            return False, {
-                "allowed": False,
-                "limit": limit,
-                "remaining": 0,
-                "reset_time": int(self.requests[key][0] + window)
+                "remaining": limit - count,
+                "reset_time": (now_ms + window_ms) // 1000
             }
+        return False, {
+            "allowed": False,
+            "limit": limit,
+            "remaining": 0,
+            "reset_time": (oldest_ms + window_ms) // 1000
+        }
 
 
-# Global rate limiter instance
-rate_limiter = RateLimiter()
\ No newline at end of file
+# Global rate limiter instances; the Redis limiter falls back to the
+# in-process one when Redis is unreachable
+rate_limiter = RateLimiter()
+redis_rate_limiter = RedisRateLimiter(settings.redis_url, fallback=rate_limiter)
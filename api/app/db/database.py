@@ -6,17 +6,23 @@ for the SAFE-BMAD system using SQLAlchemy async support.
 """
 
 import asyncio
-from typing import AsyncGenerator
+import itertools
+import logging
+import time
+from typing import AsyncGenerator, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import create_engine, event
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.pool import StaticPool
 
 from app.core.config import get_settings
 from app.core.exceptions import DatabaseError
+from app.models.agent_perf_summary import REFRESH_AGENT_PERF_SUMMARY
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
 class Base(DeclarativeBase):
@@ -26,67 +32,117 @@ class Base(DeclarativeBase):
 
 # Database engines
 async_engine = None
+async_read_engine = None
 sync_engine = None
 
-# Session makers
+# Session makers; AsyncReadSessionLocal is AsyncSessionLocal when no read
+# replica is configured
 AsyncSessionLocal = None
+AsyncReadSessionLocal = None
 SessionLocal = None
 
+# Engine that event listeners were last registered on
+_listeners_engine = None
+
+# Time one in every 64 queries for slow-query logging
+_SLOW_QUERY_SAMPLE_MASK = 0x3F
+_query_counter = itertools.count()
+
+# Background task refreshing the agent_perf_summary materialized view
+_perf_summary_refresh_task: Optional[asyncio.Task] = None
+
 
 def create_database_engines():
     """
     Create database engines for both async and sync operations
     """
-    global async_engine, sync_engine, AsyncSessionLocal, SessionLocal
+    global async_engine, async_read_engine, sync_engine
+    global AsyncSessionLocal, AsyncReadSessionLocal, SessionLocal
+
+    # All engines are always created and disposed together
+    if async_engine is not None:
+        return
+
+    # Create async engine
+    async_engine = _create_async_engine(settings.get_database_async_url())
+
+    # Create async session maker
+    AsyncSessionLocal = _create_async_sessionmaker(async_engine)
+
+    # Create read replica engine; reads go to the primary without one
+    read_database_url = settings.get_database_read_async_url()
+    if read_database_url is not None:
+        async_read_engine = _create_async_engine(read_database_url)
+        AsyncReadSessionLocal = _create_async_sessionmaker(async_read_engine)
+    else:
+        AsyncReadSessionLocal = AsyncSessionLocal
+
+    # Create sync engine for migrations and admin operations
+    sync_engine = create_engine(
+        settings.database_url,
+        echo=settings.db_echo or settings.debug,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=True,
+    )
 
-    if async_engine is None:
-        # Create async engine
-        async_database_url = settings.get_database_async_url()
-        async_engine = create_async_engine(
-            async_database_url,
-            echo=settings.db_echo or settings.debug,
-            pool_size=settings.db_pool_size,
-            max_overflow=settings.db_max_overflow,
-            pool_timeout=settings.db_pool_timeout,
-            pool_recycle=settings.db_pool_recycle,
-            # Enable connection pool pre-ping
-            pool_pre_ping=True,
-        )
+    # Create sync session maker
+    SessionLocal = sessionmaker(
+        bind=sync_engine,
+        autocommit=False,
+        autoflush=False,
+    )
 
-        # Create async session maker
-        AsyncSessionLocal = async_sessionmaker(
-            bind=async_engine,
-            class_=AsyncSession,
-            expire_on_commit=False,
-            autoflush=False,
-            autocommit=False,
-        )
+    # Register event listeners
+    register_event_listeners()
 
-    if sync_engine is None:
-        # Create sync engine for migrations and admin operations
-        sync_engine = create_engine(
-            settings.database_url,
-            echo=settings.db_echo or settings.debug,
-            pool_size=settings.db_pool_size,
-            max_overflow=settings.db_max_overflow,
-            pool_timeout=settings.db_pool_timeout,
-            pool_recycle=settings.db_pool_recycle,
-            pool_pre_ping=True,
-        )
 
-        # Create sync session maker
-        SessionLocal = sessionmaker(
-            bind=sync_engine,
-            autocommit=False,
-            autoflush=False,
-        )
+def _create_async_engine(async_database_url: str):
+    """Create an async engine with the shared pool settings"""
+    connect_args = {}
+    if async_database_url.startswith("postgresql+asyncpg://"):
+        # Reuse server-side prepared statements for repeated queries
+        connect_args = {
+            "statement_cache_size": settings.db_statement_cache_size,
+            "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+        }
+    return create_async_engine(
+        async_database_url,
+        echo=settings.db_echo or settings.debug,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        # Enable connection pool pre-ping
+        pool_pre_ping=True,
+        # Hand out the most recently used connection so a warm subset
+        # stays active and idle extras can time out
+        pool_use_lifo=True,
+        query_cache_size=settings.db_query_cache_size,
+        connect_args=connect_args,
+    )
 
-    # Register event listeners
-    register_event_listeners()
+
+def _create_async_sessionmaker(engine):
+    """Create an async session maker bound to engine"""
+    return async_sessionmaker(
+        bind=engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autoflush=False,
+        autocommit=False,
+    )
 
 
 def register_event_listeners():
-    """Register SQLAlchemy event listeners"""
+    """Register SQLAlchemy event listeners (once per engine)"""
+    global _listeners_engine
+
+    if _listeners_engine is async_engine:
+        return
+    _listeners_engine = async_engine
 
     @event.listens_for(async_engine.sync_engine, "connect")
     def set_sqlite_pragma(dbapi_connection, connection_record):
@@ -96,38 +152,92 @@ def register_event_listeners():
             cursor.execute("PRAGMA foreign_keys=ON")
             cursor.close()
 
+    # Query timing only runs in debug mode, so production pays no per-query
+    # listener calls at all; in debug mode only sampled queries are timed
+    if not settings.debug:
+        return
+
     @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
     def receive_before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
         """Log slow queries"""
-        if not settings.debug:
+        if next(_query_counter) & _SLOW_QUERY_SAMPLE_MASK:
             return
-
-        context._query_start_time = asyncio.get_event_loop().time()
+        context._query_start_time = time.perf_counter()
 
     @event.listens_for(async_engine.sync_engine, "after_cursor_execute")
     def receive_after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
         """Log slow queries after execution"""
-        if not settings.debug:
+        start_time = getattr(context, "_query_start_time", None)
+        if start_time is None:
             return
 
-        total = asyncio.get_event_loop().time() - context._query_start_time
+        total = time.perf_counter() - start_time
         if total > 1.0:  # Log queries taking more than 1 second
-            import logging
-            logger = logging.getLogger(__name__)
             logger.warning(f"Slow query ({total:.2f}s): {statement}")
 
 
+def get_async_session_factory() -> async_sessionmaker:
+    """
+    Get the async session maker, creating the engines on first use
+
+    Returns:
+        async_sessionmaker: Session maker bound to the primary engine
+    """
+    if AsyncSessionLocal is None:
+        # Engines are normally created at application startup; this only
+        # covers scripts and tests that use sessions without the app
+        create_database_engines()
+    return AsyncSessionLocal
+
+
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Get async database session
 
+    Yields:
+        AsyncSession: Database session
+    """
+    # The context manager closes the session on exit
+    async with get_async_session_factory()() as session:
+        try:
+            yield session
+        except Exception as e:
+            await session.rollback()
+            raise DatabaseError(
+                message="Database session error",
+                operation="session_management",
+                details={"error": str(e)}
+            )
+
+
+async def _open_read_session() -> AsyncSession:
+    """Open a read replica session, falling back to the primary if the replica is unreachable"""
+    if AsyncReadSessionLocal is not AsyncSessionLocal:
+        session = AsyncReadSessionLocal()
+        try:
+            await session.connection()
+            return session
+        except (SQLAlchemyError, OSError) as e:
+            await session.close()
+            logger.warning(f"Read replica unavailable, using primary: {e}")
+    return AsyncSessionLocal()
+
+
+async def get_async_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get async database session for read-only queries
+
+    Uses the read replica when DATABASE_READ_URL is set and reachable,
+    otherwise the primary.
+
     Yields:
         AsyncSession: Database session
     """
     if AsyncSessionLocal is None:
         create_database_engines()
 
-    async with AsyncSessionLocal() as session:
+    # The context manager closes the session on exit
+    async with await _open_read_session() as session:
         try:
             yield session
         except Exception as e:
@@ -137,8 +247,6 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
                 operation="session_management",
                 details={"error": str(e)}
             )
-        finally:
-            await session.close()
 
 
 def get_sync_session():
@@ -174,6 +282,66 @@ async def create_tables():
         await conn.run_sync(Base.metadata.create_all)
 
 
+async def refresh_agent_perf_summary():
+    """
+    Refresh the agent_perf_summary materialized view (PostgreSQL only)
+
+    The view is refreshed concurrently, so readers are not blocked while it
+    is rebuilt. The application refreshes it on a schedule (see
+    start_perf_summary_refresher); call this directly after bulk agent updates.
+    """
+    if async_engine is None:
+        create_database_engines()
+
+    async with async_engine.begin() as conn:
+        if conn.dialect.name != "postgresql":
+            return
+        await conn.execute(text(REFRESH_AGENT_PERF_SUMMARY))
+
+
+async def _perf_summary_refresh_loop(interval_seconds: float) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await refresh_agent_perf_summary()
+        except Exception as e:
+            logger.warning(f"Failed to refresh agent_perf_summary: {e}")
+
+
+def start_perf_summary_refresher(
+    interval_seconds: float = settings.agent_perf_summary_refresh_seconds
+) -> asyncio.Task:
+    """
+    Start the background task that periodically refreshes agent_perf_summary
+
+    Args:
+        interval_seconds: Seconds between refreshes
+
+    Returns:
+        asyncio.Task: The refresh task
+    """
+    global _perf_summary_refresh_task
+
+    if _perf_summary_refresh_task is None or _perf_summary_refresh_task.done():
+        _perf_summary_refresh_task = asyncio.create_task(
+            _perf_summary_refresh_loop(interval_seconds)
+        )
+    return _perf_summary_refresh_task
+
+
+async def stop_perf_summary_refresher() -> None:
+    """Stop the background agent_perf_summary refresh task"""
+    global _perf_summary_refresh_task
+
+    if _perf_summary_refresh_task is not None:
+        _perf_summary_refresh_task.cancel()
+        try:
+            await _perf_summary_refresh_task
+        except asyncio.CancelledError:
+            pass
+        _perf_summary_refresh_task = None
+
+
 async def drop_tables():
     """Drop all database tables (use with caution!)"""
     if async_engine is None:
@@ -195,8 +363,7 @@ async def check_database_connection() -> dict:
             create_database_engines()
 
         async with async_engine.begin() as conn:
-            result = await conn.execute("SELECT 1")
-            await result.fetchone()
+            await conn.execute(text("SELECT 1"))
 
         return {
             "status": "healthy",
@@ -215,7 +382,8 @@ async def check_database_connection() -> dict:
 
 async def close_database_connections():
     """Close all database connections"""
-    global async_engine, sync_engine, AsyncSessionLocal, SessionLocal
+    global async_engine, async_read_engine, sync_engine
+    global AsyncSessionLocal, AsyncReadSessionLocal, SessionLocal
 
     try:
         if async_engine:
@@ -223,6 +391,11 @@ async def close_database_connections():
             async_engine = None
             AsyncSessionLocal = None
 
+        if async_read_engine:
+            await async_read_engine.dispose()
+            async_read_engine = None
+        AsyncReadSessionLocal = None
+
         if sync_engine:
             sync_engine.dispose()
             sync_engine = None
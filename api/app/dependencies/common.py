@@ -4,8 +4,9 @@ Common Dependencies
 This module contains common dependency injection functions for FastAPI.
 """
 
+import secrets
+from datetime import datetime
 from typing import Optional, Dict, Any, List
-from math import ceil
 
 from fastapi import Query, Depends, HTTPException, status
 from pydantic import BaseModel, validator
@@ -15,12 +16,16 @@ from app.core.exceptions import ValidationError
 
 settings = get_settings()
 
+# Page size bounds resolved once from settings
+_DEFAULT_PAGE_SIZE = settings.default_page_size
+_MAX_PAGE_SIZE = settings.max_page_size
+
 
 class PaginationParams(BaseModel):
     """Pagination parameters"""
 
     page: int = 1
-    size: int = settings.default_page_size
+    size: int = _DEFAULT_PAGE_SIZE
 
     @validator("page")
     def validate_page(cls, v):
@@ -32,8 +37,8 @@ class PaginationParams(BaseModel):
     def validate_size(cls, v):
         if v < 1:
             raise ValueError("Size must be >= 1")
-        if v > settings.max_page_size:
-            raise ValueError(f"Size must be <= {settings.max_page_size}")
+        if v > _MAX_PAGE_SIZE:
+            raise ValueError(f"Size must be <= {_MAX_PAGE_SIZE}")
         return v
 
     @property
@@ -46,6 +51,10 @@ class PaginationParams(BaseModel):
         """Get limit for database query"""
         return self.size
 
+    class Config:
+        frozen = True
+        extra = "forbid"
+
 
 class OrderByParams(BaseModel):
     """Order by parameters"""
@@ -59,6 +68,10 @@ class OrderByParams(BaseModel):
             raise ValueError("Direction must be 'asc' or 'desc'")
         return v.lower()
 
+    class Config:
+        frozen = True
+        extra = "forbid"
+
 
 class FilterParams(BaseModel):
     """Filter parameters"""
@@ -66,10 +79,10 @@ class FilterParams(BaseModel):
     # Common filters
     search: Optional[str] = None
     status: Optional[str] = None
-    created_after: Optional[str] = None
-    created_before: Optional[str] = None
-    updated_after: Optional[str] = None
-    updated_before: Optional[str] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    updated_after: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
 
     # Custom filters can be added here
     custom_filters: Dict[str, Any] = {}
@@ -84,16 +97,16 @@ class FilterParams(BaseModel):
         if self.status:
             filters["status"] = self.status
 
-        if self.created_after:
+        if self.created_after is not None:
             filters["created_after"] = self.created_after
 
-        if self.created_before:
+        if self.created_before is not None:
             filters["created_before"] = self.created_before
 
-        if self.updated_after:
+        if self.updated_after is not None:
             filters["updated_after"] = self.updated_after
 
-        if self.updated_before:
+        if self.updated_before is not None:
             filters["updated_before"] = self.updated_before
 
         # Add custom filters
@@ -101,14 +114,18 @@ class FilterParams(BaseModel):
 
         return filters
 
+    class Config:
+        frozen = True
+        extra = "forbid"
+
 
 def get_pagination_params(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(
-        settings.default_page_size,
+        _DEFAULT_PAGE_SIZE,
         ge=1,
-        le=settings.max_page_size,
-        description=f"Page size (max: {settings.max_page_size})"
+        le=_MAX_PAGE_SIZE,
+        description=f"Page size (max: {_MAX_PAGE_SIZE})"
     )
 ) -> PaginationParams:
     """
@@ -121,7 +138,8 @@ def get_pagination_params(
     Returns:
         PaginationParams: Pagination parameters
     """
-    return PaginationParams(page=page, size=size)
+    # Query() has already enforced the bounds, so skip re-running validators
+    return PaginationParams.construct(page=page, size=size)
 
 
 def get_order_by_params(
@@ -168,7 +186,8 @@ def get_order_by_params(
                 details={"allowed_fields": allowed_fields}
             )
 
-        return OrderByParams(field=field, direction=direction.lower())
+        # Direction was checked above, so skip re-running validators
+        return OrderByParams.construct(field=field, direction=direction.lower())
 
     except (ValueError, IndexError):
         raise HTTPException(
@@ -197,10 +216,10 @@ def get_order_by_params(
 def get_filter_params(
     search: Optional[str] = Query(None, description="Search term"),
     status: Optional[str] = Query(None, description="Status filter"),
-    created_after: Optional[str] = Query(None, description="Filter items created after this date (ISO format)"),
-    created_before: Optional[str] = Query(None, description="Filter items created before this date (ISO format)"),
-    updated_after: Optional[str] = Query(None, description="Filter items updated after this date (ISO format)"),
-    updated_before: Optional[str] = Query(None, description="Filter items updated before this date (ISO format)")
+    created_after: Optional[datetime] = Query(None, description="Filter items created after this date (ISO format)"),
+    created_before: Optional[datetime] = Query(None, description="Filter items created before this date (ISO format)"),
+    updated_after: Optional[datetime] = Query(None, description="Filter items updated after this date (ISO format)"),
+    updated_before: Optional[datetime] = Query(None, description="Filter items updated before this date (ISO format)")
 ) -> FilterParams:
     """
     Dependency to get filter parameters
@@ -216,7 +235,8 @@ def get_filter_params(
     Returns:
         FilterParams: Filter parameters
     """
-    return FilterParams(
+    # Query() has already parsed every field (dates included), nothing to validate
+    return FilterParams.construct(
         search=search,
         status=status,
         created_after=created_after,
@@ -237,6 +257,10 @@ class PaginatedResponse(BaseModel):
     has_next: bool
     has_prev: bool
 
+    class Config:
+        frozen = True
+        extra = "forbid"
+
     @classmethod
     def create(
         cls,
@@ -255,11 +279,12 @@ class PaginatedResponse(BaseModel):
         Returns:
             PaginatedResponse: Paginated response
         """
-        pages = ceil(total / pagination.size) if total > 0 else 0
+        pages = -(-total // pagination.size) if total > 0 else 0
         has_next = pagination.page < pages
         has_prev = pagination.page > 1
 
-        return cls(
+        # All values are computed here from trusted data, skip validation
+        return cls.construct(
             items=items,
             total=total,
             page=pagination.page,
@@ -337,9 +362,5 @@ async def get_request_id(
     Returns:
         str: Request ID
     """
-    import uuid
-
-    if request_id:
-        return request_id
-
-    return str(uuid.uuid4())
\ No newline at end of file
+    # Same 128 bits of OS entropy as uuid4, without building a UUID object
+    return request_id or secrets.token_hex(16)
\ No newline at end of file
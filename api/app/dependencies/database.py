@@ -4,19 +4,126 @@ Database Dependencies
 This module contains database-related dependency injection functions for FastAPI.
 """
 
-from typing import AsyncGenerator
+import asyncio
+import logging
+from typing import AsyncGenerator, Optional
 
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_async_session, DatabaseError
-from app.core.exceptions import NotFoundError
+from app.db.database import (
+    get_async_session_factory,
+    get_async_read_session,
+    check_database_connection,
+    DatabaseError,
+    DatabaseTransaction,
+)
+from app.core.exceptions import NotFoundError, error_detail
+
+logger = logging.getLogger(__name__)
+
+# Database liveness as last observed by the background monitor. Requests read
+# the flag instead of issuing their own health query.
+DB_HEALTH_CHECK_INTERVAL_SECONDS = 5
+_db_healthy = True
+_db_unhealthy_detail: Optional[dict] = None
+_db_health_task: Optional[asyncio.Task] = None
+
+
+def record_db_health(health: dict) -> None:
+    """
+    Update the cached database liveness from a check_database_connection result
+
+    Args:
+        health: Result of check_database_connection()
+    """
+    global _db_healthy, _db_unhealthy_detail
+
+    healthy = health.get("status") == "healthy"
+    if healthy != _db_healthy:
+        if healthy:
+            logger.info("Database health restored")
+        else:
+            logger.warning(f"Database health check failed: {health.get('error')}")
+    _db_healthy = healthy
+    _db_unhealthy_detail = None if healthy else error_detail(
+        "Database health check failed",
+        "DATABASE_HEALTH_CHECK_FAILED",
+        health_check_error=health.get("error")
+    )
+
+
+async def _db_health_loop(interval_seconds: float) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            record_db_health(await check_database_connection())
+        except Exception as e:
+            record_db_health({"status": "unhealthy", "error": str(e)})
+
+
+def start_db_health_monitor(
+    interval_seconds: float = DB_HEALTH_CHECK_INTERVAL_SECONDS
+) -> asyncio.Task:
+    """
+    Start the background task that keeps the cached database liveness fresh
+
+    Args:
+        interval_seconds: Seconds between health queries
+
+    Returns:
+        asyncio.Task: The monitor task
+    """
+    global _db_health_task
+
+    if _db_health_task is None or _db_health_task.done():
+        _db_health_task = asyncio.create_task(_db_health_loop(interval_seconds))
+    return _db_health_task
+
+
+async def stop_db_health_monitor() -> None:
+    """Stop the background database health monitor"""
+    global _db_health_task
+
+    if _db_health_task is not None:
+        _db_health_task.cancel()
+        try:
+            await _db_health_task
+        except asyncio.CancelledError:
+            pass
+        _db_health_task = None
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency to get database session
 
+    Yields:
+        AsyncSession: Database session
+
+    Raises:
+        HTTPException: If database connection fails
+    """
+    # Open the session directly rather than iterating get_async_session,
+    # saving an async generator round trip on every request
+    async with get_async_session_factory()() as session:
+        try:
+            yield session
+        except Exception as e:
+            await session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=error_detail("Database connection failed", "DATABASE_ERROR", error=str(e))
+            )
+
+
+async def get_read_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get database session for read-only queries
+
+    Served by the read replica when one is configured and reachable,
+    otherwise by the primary.
+
     Yields:
         AsyncSession: Database session
 
@@ -24,31 +131,42 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
         HTTPException: If database connection fails
     """
     try:
-        async for session in get_async_session():
+        async for session in get_async_read_session():
             yield session
     except DatabaseError as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail={
-                "error": "Database connection failed",
-                "error_code": "DATABASE_ERROR",
-                "details": e.details
-            }
+            detail=error_detail("Database connection failed", "DATABASE_ERROR", **e.details)
         )
 
 
-def get_transaction_session(
+async def get_transaction_session(
     session: AsyncSession = Depends(get_db_session)
 ) -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency to get database session with transaction support
 
+    The transaction is committed when the request succeeds and rolled back
+    if it raises.
+
     Args:
         session: Database session
 
     Yields:
         AsyncSession: Database session with transaction
     """
+    if session.in_transaction():
+        # A transaction was already begun on this session (autobegin);
+        # finish that one instead of opening a nested SAVEPOINT
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        else:
+            await session.commit()
+        return
+
     async with DatabaseTransaction(session):
         yield session
 
@@ -59,6 +177,9 @@ async def get_db_with_health_check(
     """
     Dependency to get database session with health check
 
+    The health state comes from the background monitor started with
+    start_db_health_monitor(); no query is issued per request.
+
     Args:
         session: Database session
 
@@ -66,18 +187,11 @@ async def get_db_with_health_check(
         AsyncSession: Database session
 
     Raises:
-        HTTPException: If database health check fails
+        HTTPException: If the last database health check failed
     """
-    try:
-        # Perform a simple health check query
-        await session.execute("SELECT 1")
-        yield session
-    except Exception as e:
+    if not _db_healthy:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail={
-                "error": "Database health check failed",
-                "error_code": "DATABASE_HEALTH_CHECK_FAILED",
-                "details": {"health_check_error": str(e)}
-            }
-        )
\ No newline at end of file
+            detail=_db_unhealthy_detail
+        )
+    yield session
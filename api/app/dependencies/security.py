@@ -4,29 +4,87 @@ Security Dependencies
 This module contains security-related dependency injection functions for FastAPI.
 """
 
-from typing import Optional, Union
-
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError
+import sys
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Optional, Tuple, Union
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPBearer
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
+from app.core.exceptions import error_detail
 from app.core.security import verify_token
-from app.core.exceptions import AuthenticationError, AuthorizationError
 from app.dependencies.database import get_db_session
+from app.models.user import ROLE_PERMISSIONS, User
+
+settings = get_settings()
+
+
+class _BearerToken(HTTPBearer):
+    """
+    HTTP Bearer scheme that hands dependencies the raw token string
+
+    Subclassing HTTPBearer keeps the scheme in the OpenAPI docs, while the
+    header is parsed directly instead of building HTTPAuthorizationCredentials.
+    """
+
+    async def __call__(self, request: Request) -> Optional[str]:
+        authorization = request.headers.get("authorization")
+        if authorization and authorization[:7].lower() == "bearer ":
+            return authorization[7:] or None
+        return None
+
 
 # HTTP Bearer token scheme
-security = HTTPBearer(auto_error=False)
+security = _BearerToken(auto_error=False)
+
+# Error payloads for the fixed authentication failure paths, built once and
+# shared by every failing request; treat them as read-only
+_BEARER_CHALLENGE = {"WWW-Authenticate": "Bearer"}
+
+_NOT_AUTHENTICATED_DETAIL = error_detail(
+    "Not authenticated",
+    "AUTHENTICATION_REQUIRED",
+    message="Authorization header is required"
+)
+
+_INVALID_TOKEN_DETAIL = error_detail("Invalid authentication token", "AUTHENTICATION_ERROR")
+
+_REFRESH_TOKEN_REQUIRED_DETAIL = error_detail(
+    "Refresh token required",
+    "REFRESH_TOKEN_REQUIRED",
+    message="Authorization header with refresh token is required"
+)
+
+_INVALID_REFRESH_TOKEN_DETAIL = error_detail("Invalid refresh token", "AUTHENTICATION_ERROR")
+
+
+def _is_well_formed_jwt(token: str) -> bool:
+    """Cheap structural check run before signature verification"""
+    return len(token) >= 20 and token.count(".") == 2
+
+
+def _unauthorized(detail: dict) -> HTTPException:
+    """Build a 401 carrying one of the prebuilt payloads"""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers=_BEARER_CHALLENGE,
+    )
 
 
 async def get_current_user_token(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+    token: Optional[str] = Depends(security)
 ) -> str:
     """
     Dependency to get current user token from Authorization header
 
     Args:
-        credentials: HTTP Bearer credentials
+        token: HTTP Bearer token
 
     Returns:
         str: User token (subject)
@@ -34,66 +92,43 @@ async def get_current_user_token(
     Raises:
         HTTPException: If authentication fails
     """
-    if credentials is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail={
-                "error": "Not authenticated",
-                "error_code": "AUTHENTICATION_REQUIRED",
-                "details": {"message": "Authorization header is required"}
-            },
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    if token is None:
+        raise _unauthorized(_NOT_AUTHENTICATED_DETAIL)
+    if not _is_well_formed_jwt(token):
+        raise _unauthorized(_INVALID_TOKEN_DETAIL)
 
-    try:
-        token = credentials.credentials
-        user_id = verify_token(token)
-        if user_id is None:
-            raise AuthenticationError("Invalid authentication token")
-        return user_id
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail={
-                "error": "Invalid authentication token",
-                "error_code": "INVALID_TOKEN",
-                "details": {"message": "Token is invalid or expired"}
-            },
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    except AuthenticationError as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail={
-                "error": e.message,
-                "error_code": e.error_code,
-                "details": e.details
-            },
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    user_id = verify_token(token)
+    if user_id is None:
+        raise _unauthorized(_INVALID_TOKEN_DETAIL)
+    return user_id
 
 
 async def get_optional_current_user_token(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+    token: Optional[str] = Depends(security)
 ) -> Optional[str]:
     """
     Dependency to get optional current user token
 
     Args:
-        credentials: HTTP Bearer credentials (optional)
+        token: HTTP Bearer token (optional)
 
     Returns:
         Optional[str]: User token if authenticated, None otherwise
     """
-    if credentials is None:
+    # Absent and malformed tokens never reach signature verification
+    if token is None or not _is_well_formed_jwt(token):
         return None
 
-    try:
-        token = credentials.credentials
-        user_id = verify_token(token)
-        return user_id
-    except JWTError:
-        return None
+    return verify_token(token)
+
+
+# (subject, user ID) resolved for the current request. Keyed by the subject
+# so a value inherited from an enclosing context (e.g. several requests
+# driven from one task by an in-process test client) is never reused for a
+# different token.
+_current_user_id: ContextVar[Optional[Tuple[str, int]]] = ContextVar(
+    "current_user_id", default=None
+)
 
 
 async def get_current_user_id(
@@ -111,20 +146,172 @@ async def get_current_user_id(
     Raises:
         HTTPException: If user ID is invalid
     """
-    try:
-        return int(user_token)
-    except (ValueError, TypeError):
+    cached = _current_user_id.get()
+    if cached is not None and cached[0] == user_token:
+        return cached[1]
+
+    # Guard with a branch instead of letting int() raise for non-numeric
+    # subjects; isascii() excludes Unicode digits that int() would reject
+    if isinstance(user_token, str) and user_token.isascii() and user_token.isdigit():
+        user_id = int(user_token)
+        _current_user_id.set((user_token, user_id))
+        return user_id
+
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=error_detail("Invalid user ID in token", "INVALID_USER_ID", user_id=user_token)
+    )
+
+
+# Roles in increasing order of privilege. A role's permission set also holds
+# the names of every role at or below it, so require_permission("operator")
+# admits operators and admins.
+_ROLE_HIERARCHY = tuple(map(sys.intern, ("viewer", "analyst", "operator", "admin")))
+
+# Permission set of every role, built once from interned strings so each
+# check is a single hash probe
+_ROLE_PERMISSION_SETS: Dict[str, FrozenSet[str]] = {
+    role: frozenset(
+        map(sys.intern, ROLE_PERMISSIONS.get(role, frozenset()) | set(_ROLE_HIERARCHY[:rank + 1]))
+    )
+    for rank, role in enumerate(_ROLE_HIERARCHY)
+}
+
+# Every permission name a dependency may require
+_PERMISSIONS: FrozenSet[str] = frozenset().union(*_ROLE_PERMISSION_SETS.values())
+
+
+def _known_permission(permission: str) -> str:
+    """Validate a permission name when a dependency is built"""
+    if permission not in _PERMISSIONS:
+        raise ValueError(f"Unknown permission: {permission!r}")
+    return sys.intern(permission)
+
+
+class _PermissionCache:
+    """Per-user permission sets shared across requests for a short TTL"""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: Dict[int, Tuple[FrozenSet[str], float]] = {}
+
+    def get(self, user_id: int) -> Optional[FrozenSet[str]]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._entries[user_id]
+            return None
+        return entry[0]
+
+    def put(self, user_id: int, permissions: FrozenSet[str]) -> None:
+        if user_id not in self._entries and len(self._entries) >= self.maxsize:
+            # Evict the oldest insertion
+            del self._entries[next(iter(self._entries))]
+        self._entries[user_id] = (permissions, time.monotonic() + self.ttl)
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        if user_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(user_id, None)
+
+
+_permission_cache = _PermissionCache(ttl=settings.permission_cache_ttl_seconds)
+
+
+def invalidate_user_permissions(user_id: Optional[int] = None) -> None:
+    """
+    Drop cached permission sets after a role or account status change
+
+    Args:
+        user_id: User whose permissions changed, or None for all users
+    """
+    _permission_cache.invalidate(user_id)
+
+
+async def _load_user_permissions(user_id: int, session: AsyncSession) -> FrozenSet[str]:
+    """Load a user's permission set, served from the shared cache when fresh"""
+    permissions = _permission_cache.get(user_id)
+    if permissions is not None:
+        return permissions
+
+    result = await session.execute(
+        select(User.role, User.is_superuser, User.is_active).where(User.id == user_id)
+    )
+    row = result.first()
+    if row is None or not row.is_active:
+        permissions = frozenset()
+    else:
+        permissions = _ROLE_PERMISSION_SETS.get(
+            "admin" if row.is_superuser else row.role, frozenset()
+        )
+
+    _permission_cache.put(user_id, permissions)
+    return permissions
+
+
+@dataclass
+class AuthContext:
+    """Authenticated user, request session and permissions, resolved once per request"""
+
+    user_id: int
+    session: AsyncSession
+    permissions: FrozenSet[str]
+
+
+async def get_auth_context(
+    user_id: int = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_db_session)
+) -> AuthContext:
+    """
+    Dependency to resolve the current user's auth context
+
+    FastAPI caches get_db_session per request, so the permission lookup
+    shares the route's session and its single pool connection. The session
+    only checks out a connection on first use, so requests answered from the
+    permission cache do not touch the pool here.
+
+    Args:
+        user_id: Current user ID
+        session: Database session for the request
+
+    Returns:
+        AuthContext: User ID, session and permission set
+    """
+    permissions = await _load_user_permissions(user_id, session)
+    return AuthContext(user_id=user_id, session=session, permissions=permissions)
+
+
+def _check_permission(permission: str, ctx: AuthContext) -> int:
+    """
+    Shared body of every permission dependency
+
+    Args:
+        permission: Required permission
+        ctx: Current auth context
+
+    Returns:
+        int: User ID if the user holds the permission
+
+    Raises:
+        HTTPException: If the user lacks the permission
+    """
+    if permission not in ctx.permissions:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail={
-                "error": "Invalid user ID in token",
-                "error_code": "INVALID_USER_ID",
-                "details": {"user_id": user_token}
-            }
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=error_detail(
+                "Insufficient permissions",
+                "INSUFFICIENT_PERMISSIONS",
+                required_permission=permission,
+                user_id=ctx.user_id
+            )
         )
+    return ctx.user_id
 
 
-async def require_permission(permission: str):
+def require_permission(permission: str):
     """
     Dependency factory to require specific permission
 
@@ -133,44 +320,28 @@ async def require_permission(permission: str):
 
     Returns:
         Dependency function
+
+    Raises:
+        ValueError: If the permission is unknown
     """
-    async def permission_dependency(
-        user_id: int = Depends(get_current_user_id),
-        session: AsyncSession = Depends(get_db_session)
-    ):
-        # TODO: Implement user permission checking
-        # This would typically involve querying the database for user permissions
-        # For now, we'll assume all authenticated users have basic permissions
-
-        # Example implementation (to be completed when user model is defined):
-        # from app.crud.user import user_crud
-        # user = await user_crud.get(session, user_id)
-        # if not user or not user.has_permission(permission):
-        #     raise HTTPException(
-        #         status_code=status.HTTP_403_FORBIDDEN,
-        #         detail={
-        #             "error": "Insufficient permissions",
-        #             "error_code": "INSUFFICIENT_PERMISSIONS",
-        #             "details": {
-        #                 "required_permission": permission,
-        #                 "user_id": user_id
-        #             }
-        #         }
-        #     )
+    permission = _known_permission(permission)
 
-        return user_id
+    async def permission_dependency(
+        ctx: AuthContext = Depends(get_auth_context)
+    ) -> int:
+        return _check_permission(permission, ctx)
 
     return permission_dependency
 
 
-# Common permission dependencies
+# Common permission dependencies, built once at import
 require_admin_permission = require_permission("admin")
 require_operator_permission = require_permission("operator")
 require_analyst_permission = require_permission("analyst")
 require_viewer_permission = require_permission("viewer")
 
 
-async def require_same_user_or_permission(
+def require_same_user_or_permission(
     target_user_id: int,
     permission: str = "admin"
 ):
@@ -183,42 +354,41 @@ async def require_same_user_or_permission(
 
     Returns:
         Dependency function
+
+    Raises:
+        ValueError: If the permission is unknown
     """
+    permission = _known_permission(permission)
+
     async def same_user_or_permission_dependency(
-        current_user_id: int = Depends(get_current_user_id),
-        session: AsyncSession = Depends(get_db_session)
+        ctx: AuthContext = Depends(get_auth_context)
     ):
-        # User can access their own data
-        if current_user_id == target_user_id:
-            return current_user_id
+        # User can access their own data, otherwise they need the permission
+        if ctx.user_id == target_user_id or permission in ctx.permissions:
+            return ctx.user_id
 
-        # Otherwise, they need the required permission
-        # TODO: Implement permission checking
-        # For now, we'll allow self-access only
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail={
-                "error": "Cannot access another user's data",
-                "error_code": "ACCESS_DENIED",
-                "details": {
-                    "target_user_id": target_user_id,
-                    "current_user_id": current_user_id,
-                    "required_permission": permission
-                }
-            }
+            detail=error_detail(
+                "Cannot access another user's data",
+                "ACCESS_DENIED",
+                target_user_id=target_user_id,
+                current_user_id=ctx.user_id,
+                required_permission=permission
+            )
         )
 
     return same_user_or_permission_dependency
 
 
 async def get_refresh_token_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    token: Optional[str] = Depends(security)
 ) -> str:
     """
     Dependency to get user from refresh token
 
     Args:
-        credentials: HTTP Bearer credentials
+        token: HTTP Bearer refresh token
 
     Returns:
         str: User token
@@ -226,40 +396,12 @@ async def get_refresh_token_user(
     Raises:
         HTTPException: If refresh token is invalid
     """
-    if credentials is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail={
-                "error": "Refresh token required",
-                "error_code": "REFRESH_TOKEN_REQUIRED",
-                "details": {"message": "Authorization header with refresh token is required"}
-            },
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-    try:
-        token = credentials.credentials
-        user_id = verify_token(token, token_type="refresh")
-        if user_id is None:
-            raise AuthenticationError("Invalid refresh token")
-        return user_id
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail={
-                "error": "Invalid refresh token",
-                "error_code": "INVALID_REFRESH_TOKEN",
-                "details": {"message": "Refresh token is invalid or expired"}
-            },
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    except AuthenticationError as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail={
-                "error": e.message,
-                "error_code": e.error_code,
-                "details": e.details
-            },
-            headers={"WWW-Authenticate": "Bearer"},
-        )
\ No newline at end of file
+    if token is None:
+        raise _unauthorized(_REFRESH_TOKEN_REQUIRED_DETAIL)
+    if not _is_well_formed_jwt(token):
+        raise _unauthorized(_INVALID_REFRESH_TOKEN_DETAIL)
+
+    user_id = verify_token(token, token_type="refresh")
+    if user_id is None:
+        raise _unauthorized(_INVALID_REFRESH_TOKEN_DETAIL)
+    return user_id
@@ -3,22 +3,33 @@ Story 1.4 监控系统主应用 - 集成日志、健康检查、性能监控和
 """
 
 import asyncio
+import gzip
 import os
+import random
 import signal
 import sys
+import time
 from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Optional, Set
 
 # 添加项目根目录到Python路径
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from fastapi import FastAPI, Request
+import orjson
+from fastapi import APIRouter, Depends, FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 # 导入监控系统模块
-from app.core.logging import setup_logging, LoggingMiddleware, SecurityLoggingMiddleware
-from app.core.monitoring import health_checker, metrics_collector, monitoring_router
+from app.core.logging import setup_logging, SecurityLoggingMiddleware, log_request_response
+from app.core.monitoring import (
+    HealthCheckInterceptor,
+    health_checker,
+    metrics_collector,
+    monitoring_router,
+)
 from app.core.alerting import alert_manager, ConsoleNotifier, AlertLevel
 from app.core.alerting.rules import setup_default_rules
 
@@ -28,7 +39,13 @@ setup_logging(
     log_level=os.getenv("LOG_LEVEL", "INFO")
 )
 
-from app.core.logging.config import get_context_logger
+from app.core.logging.config import (
+    get_agent_logger,
+    get_audit_logger,
+    get_context_logger,
+    get_performance_logger,
+    get_workflow_logger,
+)
 logger = get_context_logger(
     request_id="monitoring",
     user_id="system",
@@ -37,6 +54,27 @@ logger = get_context_logger(
     session_id="main"
 )
 
+# 告警时间为当前时间前1~120分钟
+_ALERT_AGE_MINUTES = tuple(timedelta(minutes=minutes) for minutes in range(1, 121))
+
+
+def _format_alert_timestamps(now: datetime) -> tuple:
+    """预先格式化相对now的全部告警时间（ISO字符串）"""
+    return tuple((now - age).isoformat() for age in _ALERT_AGE_MINUTES)
+
+
+# 秒级时钟：后台任务每秒刷新一次告警时间表，处理器直接读取，
+# 不再逐请求调用datetime.now()或做时间运算和格式化
+_alert_timestamps = _format_alert_timestamps(datetime.now())
+
+
+async def _run_clock():
+    """每秒刷新_alert_timestamps"""
+    global _alert_timestamps
+    while True:
+        _alert_timestamps = _format_alert_timestamps(datetime.now())
+        await asyncio.sleep(1)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -45,13 +83,17 @@ async def lifespan(app: FastAPI):
     logger.info("🚀 Starting Story 1.4 Monitoring System...")
 
     try:
-        # 启动后台监控任务
+        # 启动秒级时钟和后台监控任务
+        clock_task = asyncio.create_task(_run_clock())
         await metrics_collector.start_background_collection()
         await alert_manager.start_background_tasks()
 
         # 设置默认告警规则
         setup_default_rules()
 
+        # 预加载仪表板页面（在线程中读文件，不阻塞事件循环）
+        await asyncio.to_thread(load_dashboard_html)
+
         # 添加控制台通知器（用于演示）
         console_notifier = ConsoleNotifier(enabled=True)
         alert_manager.add_notifier(console_notifier)
@@ -77,6 +119,8 @@ async def lifespan(app: FastAPI):
 
     # 关闭时清理
     logger.info("🛑 Shutting down Story 1.4 Monitoring System...")
+    clock_task.cancel()
+    await metrics_collector.stop()
     alert_manager.stop_background_tasks()
     logger.info("✅ Monitoring system shutdown complete")
 
@@ -89,7 +133,8 @@ app = FastAPI(
     lifespan=lifespan,
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
 # 配置CORS
@@ -101,133 +146,76 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 添加日志中间件
-app.add_middleware(LoggingMiddleware, log_requests=True, log_responses=True)
-app.add_middleware(SecurityLoggingMiddleware)
+# 安全日志中间件作用于演示路由以外的所有路由；请求日志只挂载到演示和仪表板数据路由，
+# 探针和指标抓取不再经过请求日志
+app.add_middleware(SecurityLoggingMiddleware, exclude_prefixes=("/demo/",))
+LogRequestResponse = Depends(log_request_response)
+
+# 演示路由单独成组，统一挂载请求日志依赖
+demo_router = APIRouter(prefix="/demo", tags=["demo"], dependencies=[LogRequestResponse])
 
 # 包含监控路由
 app.include_router(monitoring_router)
 
 
-# 基础健康检查端点（保持向后兼容）
-@app.get("/health")
-async def health_check():
-    """基础健康检查 - 简化版本"""
-    try:
-        # 快速健康检查
-        return {
-            "status": "healthy",
-            "timestamp": "2025-01-21T13:00:00.000Z",
-            "version": "1.4.0",
-            "services": {
-                "api": "running",
-                "logging": "running",
-                "monitoring": "running",
-                "alerting": "running"
-            }
-        }
-    except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
-        return JSONResponse(
-            status_code=503,
-            content={
-                "status": "unhealthy",
-                "error": str(e),
-                "timestamp": "2025-01-21T13:00:00.000Z"
-            }
-        )
-
-
-@app.get("/ready")
-async def readiness_check():
-    """就绪状态检查 - 简化版本"""
-    try:
-        # 检查关键组件
-        checks = {
-            "logging": "ready",
-            "monitoring": "ready",
-            "alerting": "ready",
-            "metrics": "ready"
-        }
-
-        overall_status = "ready" if all(status == "ready" for status in checks.values()) else "not_ready"
-
-        return {
-            "status": overall_status,
-            "timestamp": "2025-01-21T13:00:00.000Z",
-            "checks": checks
-        }
-    except Exception as e:
-        logger.error(f"Readiness check failed: {str(e)}")
-        return JSONResponse(
-            status_code=503,
-            content={
-                "status": "not_ready",
-                "error": str(e),
-                "timestamp": "2025-01-21T13:00:00.000Z"
-            }
-        )
+# 版本信息是常量，导入时序列化一次
+_VERSION_BYTES = orjson.dumps({
+    "version": "1.4.0",
+    "story": "1.4",
+    "features": [
+        "结构化日志记录系统",
+        "系统健康检查接口",
+        "基础性能监控",
+        "日志轮转和存储配置",
+        "基础告警机制"
+    ],
+    "components": {
+        "logging": "loguru + structlog",
+        "monitoring": "Prometheus metrics",
+        "health_checks": "FastAPI health endpoints",
+        "alerting": "Multi-channel alert system"
+    },
+    "timestamp": "2025-01-21T13:00:00.000Z"
+})
 
 
 @app.get("/version")
 async def version_info():
     """版本信息"""
-    return {
-        "version": "1.4.0",
-        "story": "1.4",
-        "features": [
-            "结构化日志记录系统",
-            "系统健康检查接口",
-            "基础性能监控",
-            "日志轮转和存储配置",
-            "基础告警机制"
-        ],
-        "components": {
-            "logging": "loguru + structlog",
-            "monitoring": "Prometheus metrics",
-            "health_checks": "FastAPI health endpoints",
-            "alerting": "Multi-channel alert system"
-        },
-        "timestamp": "2025-01-21T13:00:00.000Z"
-    }
+    return Response(content=_VERSION_BYTES, media_type="application/json")
 
 
 # 演示端点
-@app.get("/demo/alerts")
+@demo_router.get("/alerts")
 async def demo_alerts():
     """演示告警功能"""
     try:
-        # 创建一些示例告警
-        alerts = []
-
-        # CPU使用率告警
-        cpu_alert = await alert_manager.create_manual_alert(
-            name="high_cpu_usage_demo",
-            level=AlertLevel.WARNING,
-            message="CPU usage is high: 85%",
-            component="system",
-            details={
-                "current_usage": 85.0,
-                "threshold": 80.0,
-                "hostname": "demo-server"
-            }
-        )
-        alerts.append(cpu_alert)
-
-        # 内存使用率告警
-        memory_alert = await alert_manager.create_manual_alert(
-            name="high_memory_usage_demo",
-            level=AlertLevel.ERROR,
-            message="Memory usage is critical: 92%",
-            component="system",
-            details={
-                "current_usage": 92.0,
-                "threshold": 85.0,
-                "total_memory": "8GB",
-                "used_memory": "7.36GB"
-            }
+        # 并发创建示例告警：CPU使用率告警和内存使用率告警
+        alerts = await asyncio.gather(
+            alert_manager.create_manual_alert(
+                name="high_cpu_usage_demo",
+                level=AlertLevel.WARNING,
+                message="CPU usage is high: 85%",
+                component="system",
+                details={
+                    "current_usage": 85.0,
+                    "threshold": 80.0,
+                    "hostname": "demo-server"
+                }
+            ),
+            alert_manager.create_manual_alert(
+                name="high_memory_usage_demo",
+                level=AlertLevel.ERROR,
+                message="Memory usage is critical: 92%",
+                component="system",
+                details={
+                    "current_usage": 92.0,
+                    "threshold": 85.0,
+                    "total_memory": "8GB",
+                    "used_memory": "7.36GB"
+                }
+            )
         )
-        alerts.append(memory_alert)
 
         return {
             "message": "Demo alerts created successfully",
@@ -239,7 +227,7 @@ async def demo_alerts():
 
     except Exception as e:
         logger.error(f"Demo alerts failed: {str(e)}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "error": "Failed to create demo alerts",
@@ -248,49 +236,51 @@ async def demo_alerts():
         )
 
 
-@app.get("/demo/metrics")
+# 演示指标：(记录方法名, 参数)，由record_batch一次写入
+_DEMO_METRIC_UPDATES = (
+    # 记录Agent处理时间
+    ("record_agent_processing_time", {
+        "agent_type": "strategist",
+        "task_type": "analysis",
+        "duration_seconds": 2.5,
+        "status": "success"
+    }),
+    ("record_agent_processing_time", {
+        "agent_type": "analyst",
+        "task_type": "data_processing",
+        "duration_seconds": 1.8,
+        "status": "success"
+    }),
+    # 记录工作流持续时间
+    ("record_workflow_duration", {
+        "workflow_name": "emergency_response",
+        "severity_level": "medium",
+        "duration_seconds": 15.2,
+        "status": "completed"
+    }),
+    # 记录API请求
+    ("record_api_request", {
+        "method": "GET",
+        "endpoint": "/api/v1/scenarios/",
+        "status_code": 200,
+        "duration_seconds": 0.15
+    }),
+    # 更新活跃Agent数量
+    ("update_active_agents", {"agent_type": "strategist", "count": 3}),
+    ("update_active_agents", {"agent_type": "analyst", "count": 2}),
+    ("update_active_agents", {"agent_type": "frontline", "count": 1}),
+)
+
+
+@demo_router.get("/metrics")
 async def demo_metrics():
     """演示指标收集功能"""
     try:
         # 模拟一些Agent性能指标
-        import time
         start_time = time.time()
 
-        # 记录Agent处理时间
-        metrics_collector.record_agent_processing_time(
-            agent_type="strategist",
-            task_type="analysis",
-            duration_seconds=2.5,
-            status="success"
-        )
-
-        metrics_collector.record_agent_processing_time(
-            agent_type="analyst",
-            task_type="data_processing",
-            duration_seconds=1.8,
-            status="success"
-        )
-
-        # 记录工作流持续时间
-        metrics_collector.record_workflow_duration(
-            workflow_name="emergency_response",
-            severity_level="medium",
-            duration_seconds=15.2,
-            status="completed"
-        )
-
-        # 记录API请求
-        metrics_collector.record_api_request(
-            method="GET",
-            endpoint="/api/v1/scenarios/",
-            status_code=200,
-            duration_seconds=0.15
-        )
-
-        # 更新活跃Agent数量
-        metrics_collector.update_active_agents("strategist", 3)
-        metrics_collector.update_active_agents("analyst", 2)
-        metrics_collector.update_active_agents("frontline", 1)
+        # 一次批量记录所有演示指标
+        metrics_collector.record_batch(_DEMO_METRIC_UPDATES)
 
         processing_time = (time.time() - start_time) * 1000
 
@@ -303,7 +293,7 @@ async def demo_metrics():
 
     except Exception as e:
         logger.error(f"Demo metrics failed: {str(e)}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "error": "Failed to record demo metrics",
@@ -312,17 +302,10 @@ async def demo_metrics():
         )
 
 
-@app.get("/demo/logs")
+@demo_router.get("/logs")
 async def demo_logs():
     """演示日志功能"""
     try:
-        from app.core.logging.config import (
-            get_agent_logger,
-            get_workflow_logger,
-            get_audit_logger,
-            get_performance_logger
-        )
-
         # 记录不同类型的日志
         agent_logger = get_agent_logger(
             agent_type="strategist",
@@ -360,7 +343,7 @@ async def demo_logs():
 
     except Exception as e:
         logger.error(f"Demo logs failed: {str(e)}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "error": "Failed to record demo logs",
@@ -369,37 +352,55 @@ async def demo_logs():
         )
 
 
+app.include_router(demo_router)
+
+
 # 错误处理
-@app.exception_handler(Exception)
-async def global_exception_handler(request: Request, exc: Exception):
-    """全局异常处理"""
-    logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
+# 后台告警任务的强引用，防止任务在完成前被垃圾回收
+_alert_tasks: Set[asyncio.Task] = set()
 
-    # 记录错误指标
-    metrics_collector.record_error(
-        error_type=type(exc).__name__,
-        component="api",
-        error_message=str(exc)[:200]
-    )
 
-    # 创建告警
+async def _alert_unhandled_exception(method: str, path: str, error_type: str, error_message: str):
+    """为未处理异常创建告警（在后台任务中执行，不阻塞错误响应）"""
     try:
         await alert_manager.create_manual_alert(
             name="unhandled_exception",
             level=AlertLevel.ERROR,
-            message=f"Unhandled exception in {request.method} {request.url.path}: {str(exc)}",
+            message=f"Unhandled exception in {method} {path}: {error_message}",
             component="api",
             details={
-                "method": request.method,
-                "path": str(request.url.path),
-                "error_type": type(exc).__name__,
-                "error_message": str(exc)
+                "method": method,
+                "path": path,
+                "error_type": error_type,
+                "error_message": error_message
             }
         )
     except Exception as alert_error:
         logger.error(f"Failed to create alert for exception: {str(alert_error)}")
 
-    return JSONResponse(
+
+@app.exception_handler(Exception)
+async def global_exception_handler(request: Request, exc: Exception):
+    """全局异常处理"""
+    error_message = str(exc)
+    error_type = type(exc).__name__
+    logger.error(f"Unhandled exception: {error_message}", exc_info=True)
+
+    # 记录错误指标
+    metrics_collector.record_error(
+        error_type=error_type,
+        component="api",
+        error_message=error_message[:200]
+    )
+
+    # 创建告警（后台执行，客户端立即收到500响应）
+    task = asyncio.create_task(_alert_unhandled_exception(
+        request.method, request.url.path, error_type, error_message
+    ))
+    _alert_tasks.add(task)
+    task.add_done_callback(_alert_tasks.discard)
+
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal Server Error",
@@ -409,20 +410,8 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 
-# 监控仪表板页面端点
-@app.get("/dashboard")
-async def monitoring_dashboard():
-    """监控仪表板页面 - 实时可视化版本"""
-    from fastapi.responses import HTMLResponse
-
-    # 读取实时仪表板HTML文件
-    try:
-        with open("realtime_dashboard.html", "r", encoding="utf-8") as f:
-            dashboard_html = f.read()
-        return HTMLResponse(content=dashboard_html)
-    except FileNotFoundError:
-        # 如果文件不存在，返回内嵌的简化版本
-        return HTMLResponse(content="""
+# 仪表板文件不存在时使用的内嵌简化版本，导入时编码并压缩一次
+_INLINE_DASHBOARD_HTML = """
 <!DOCTYPE html>
 <html lang="zh-CN">
 <head>
@@ -555,29 +544,71 @@ async def monitoring_dashboard():
     </script>
 </body>
 </html>
-    """)
+""".encode("utf-8")
+_INLINE_DASHBOARD_HTML_GZIP = gzip.compress(_INLINE_DASHBOARD_HTML, compresslevel=6)
+
+_DASHBOARD_HEADERS = {"Vary": "Accept-Encoding"}
+_DASHBOARD_GZIP_HEADERS = {"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+
+# 仪表板页面在启动时读取并压缩一次，请求中不再读文件
+_dashboard_html: Optional[bytes] = None
+_dashboard_html_gzip: Optional[bytes] = None
+
+
+def load_dashboard_html():
+    """读取实时仪表板HTML（文件不存在时使用内嵌版本）并预先gzip压缩"""
+    global _dashboard_html, _dashboard_html_gzip
+
+    try:
+        with open("realtime_dashboard.html", "rb") as f:
+            html = f.read()
+    except FileNotFoundError:
+        _dashboard_html_gzip = _INLINE_DASHBOARD_HTML_GZIP
+        _dashboard_html = _INLINE_DASHBOARD_HTML
+        return
+
+    _dashboard_html_gzip = gzip.compress(html, compresslevel=6)
+    _dashboard_html = html
+
+
+# 监控仪表板页面端点
+@app.get("/dashboard")
+async def monitoring_dashboard(request: Request):
+    """监控仪表板页面 - 实时可视化版本"""
+    if _dashboard_html is None:
+        await asyncio.to_thread(load_dashboard_html)
+
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(
+            content=_dashboard_html_gzip,
+            media_type="text/html",
+            headers=_DASHBOARD_GZIP_HEADERS
+        )
+    return Response(
+        content=_dashboard_html,
+        media_type="text/html",
+        headers=_DASHBOARD_HEADERS
+    )
 
 # 新增：实时监控数据API端点
-@app.get("/api/dashboard/realtime")
+@app.get("/api/dashboard/realtime", dependencies=[LogRequestResponse])
 async def get_realtime_data():
-    """获取实时监控数据"""
-    import psutil
-    import random
-    from datetime import datetime
-
-    # 获取真实的系统数据
-    cpu_percent = psutil.cpu_percent(interval=1)
-    memory = psutil.virtual_memory()
-    disk = psutil.disk_usage('/')
-    network = psutil.net_io_counters()
+    """获取实时监控数据（系统数据来自后台采样的快照，请求中不调用阻塞的psutil采样）"""
+    snapshot = metrics_collector.system_snapshot
+    if snapshot is None:
+        # 后台采样尚未产生快照时在线程中采样一次
+        snapshot = await asyncio.to_thread(metrics_collector.sample_system_snapshot)
+    memory = snapshot.memory
+    disk = snapshot.disk
+    network = snapshot.network
 
     return {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": snapshot.timestamp_iso,
         "system": {
             "cpu": {
-                "usage": round(cpu_percent, 2),
-                "cores": psutil.cpu_count(),
-                "load_avg": list(psutil.getloadavg()) if hasattr(psutil, 'getloadavg') else [0, 0, 0]
+                "usage": round(snapshot.cpu_percent, 2),
+                "cores": snapshot.cpu_count,
+                "load_avg": list(snapshot.load_avg)
             },
             "memory": {
                 "total": memory.total,
@@ -611,33 +642,47 @@ async def get_realtime_data():
         }
     }
 
-@app.get("/api/dashboard/alerts")
-async def get_alerts():
-    """获取告警信息"""
-    import random
-    from datetime import datetime, timedelta
+_ALERT_TYPES = ("CPU使用率过高", "内存不足", "磁盘空间低", "网络延迟", "服务异常")
+_ALERT_MESSAGES = tuple(f"系统检测到{alert_type}，请及时处理" for alert_type in _ALERT_TYPES)
+_ALERT_SEVERITIES = ("low", "medium", "high", "critical")
 
-    alert_types = ["CPU使用率过高", "内存不足", "磁盘空间低", "网络延迟", "服务异常"]
-    severities = ["low", "medium", "high", "critical"]
 
-    alerts = []
-    for i in range(random.randint(1, 5)):
-        alerts.append({
+@app.get("/api/dashboard/alerts", dependencies=[LogRequestResponse])
+async def get_alerts():
+    """获取告警信息（各字段的随机值按批生成）"""
+    count = random.randint(1, 5)
+    types = random.choices(_ALERT_TYPES, k=count)
+    severities = random.choices(_ALERT_SEVERITIES, k=count)
+    messages = random.choices(_ALERT_MESSAGES, k=count)
+    timestamps = random.choices(_alert_timestamps, k=count)
+    resolved_bits = random.getrandbits(count)
+
+    alerts = [
+        {
             "id": f"alert_{i}_{random.randint(1000, 9999)}",
-            "type": random.choice(alert_types),
-            "severity": random.choice(severities),
-            "message": f"系统检测到{random.choice(alert_types)}，请及时处理",
-            "timestamp": (datetime.now() - timedelta(minutes=random.randint(1, 120))).isoformat(),
-            "resolved": random.choice([True, False])
-        })
+            "type": types[i],
+            "severity": severities[i],
+            "message": messages[i],
+            "timestamp": timestamps[i],
+            "resolved": bool(resolved_bits >> i & 1)
+        }
+        for i in range(count)
+    ]
+    active = count - bin(resolved_bits).count("1")
 
     return {
         "alerts": alerts,
-        "total": len(alerts),
-        "active": len([a for a in alerts if not a["resolved"]])
+        "total": count,
+        "active": active
     }
 
 
+# 基础探针 /health、/ready、/live（保持向后兼容）在ASGI层直接响应，
+# 不经过中间件；uvicorn 加载的 main_monitoring:app 是包装后的应用
+fastapi_app = app
+app = HealthCheckInterceptor(fastapi_app)
+
+
 def handle_signal(signum, frame):
     """信号处理器"""
     logger.info(f"Received signal {signum}, shutting down gracefully...")
@@ -651,11 +696,16 @@ if __name__ == "__main__":
     signal.signal(signal.SIGINT, handle_signal)
     signal.signal(signal.SIGTERM, handle_signal)
 
-    # 启动服务器
+    # 启动服务器：uvloop事件循环 + httptools解析器（uvicorn[standard]已包含，Windows不支持uvloop）；
+    # 请求日志由log_request_response依赖记录，关闭uvicorn的访问日志；
+    # metrics_collector、alert_manager为进程内单例，保持单worker
     uvicorn.run(
         "main_monitoring:app",
         host="0.0.0.0",
         port=8001,  # 使用不同端口避免冲突
         reload=False,
-        log_level="info"
+        log_level="info",
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        access_log=False
     )
\ No newline at end of file
@@ -8,7 +8,11 @@ from app.models.base import Base
 from app.models.user import User
 from app.models.scenario import Scenario
 from app.models.agent import Agent
+from app.models.agent_perf_summary import AgentPerfSummary
 from app.models.analysis import Analysis
+from app.models.recommendation import Recommendation
+from app.models.data_source import DataSource
+from app.models.external_reference import ExternalReference
 from app.models.decision import Decision
 from app.models.resource import Resource
 from app.models.message import Message
@@ -19,7 +23,11 @@ __all__ = [
     "User",
     "Scenario",
     "Agent",
+    "AgentPerfSummary",
     "Analysis",
+    "Recommendation",
+    "DataSource",
+    "ExternalReference",
     "Decision",
     "Resource",
     "Message",
@@ -4,10 +4,57 @@ Agent Model
 This module contains the Agent SQLAlchemy ORM model for S-A-F-E-R agents.
 """
 
-from sqlalchemy import Column, String, Text, JSON, Index, ForeignKey, Float
+from datetime import datetime
+from types import MappingProxyType
+from typing import Mapping, Optional, Union
+
+from sqlalchemy import Column, String, Text, Index, ForeignKey, Float, DateTime, func, inspect, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import relationship
+from sqlalchemy.orm.attributes import flag_modified, set_committed_value
+
+from app.models.base import BaseModel, JSONType
+
+
+_AGENT_TYPE_DESCRIPTIONS: Mapping[str, str] = MappingProxyType({
+    'S': 'Searcher - Information gathering and reconnaissance specialist',
+    'A': 'Analyst - Data analysis and situation assessment expert',
+    'F': 'Frontline - Tactical response and field operations specialist',
+    'E': 'Executive - Strategic decision making and coordination expert',
+    'R': 'Evaluator - Performance assessment and learning specialist'
+})
+
+
+def _now_iso() -> str:
+    """Return the current UTC time as an ISO 8601 string."""
+    return datetime.utcnow().isoformat()
+
+
+def is_task_index(queue) -> bool:
+    """
+    Check that a task queue has the indexed shape used by Agent
 
-from app.models.base import BaseModel
+    Args:
+        queue: Task queue value
+
+    Returns:
+        True if queue has 'tasks' (dict), 'pending_order' (list) and 'next_id' (int)
+    """
+    return (
+        isinstance(queue, dict)
+        and isinstance(queue.get('tasks'), dict)
+        and isinstance(queue.get('pending_order'), list)
+        and isinstance(queue.get('next_id'), int)
+    )
+
+
+def _index_legacy_tasks(tasks: list) -> dict:
+    """Build an indexed task queue from a legacy list of task dictionaries."""
+    return {
+        'tasks': {str(task['id']): task for task in tasks},
+        'pending_order': [task['id'] for task in tasks if task.get('status') == 'pending'],
+        'next_id': max((task['id'] for task in tasks), default=0) + 1
+    }
 
 
 class Agent(BaseModel):
@@ -29,7 +76,7 @@ class Agent(BaseModel):
         String(20),
         nullable=False,
         index=True,
-        comment="Agent type (S, A, F, E, E)"
+        comment="Agent type (S, A, F, E, R)"
     )
 
     # Agent status
@@ -42,13 +89,13 @@ class Agent(BaseModel):
 
     # Configuration and capabilities
     configuration = Column(
-        JSON,
+        JSONType,
         nullable=True,
         comment="Agent configuration parameters as JSON"
     )
 
     capabilities = Column(
-        JSON,
+        JSONType,
         nullable=True,
         comment="Agent capabilities description as JSON"
     )
@@ -64,7 +111,7 @@ class Agent(BaseModel):
 
     # Activity tracking
     last_activity = Column(
-        JSON,
+        JSONType,
         nullable=True,
         comment="Last activity details as JSON"
     )
@@ -78,7 +125,7 @@ class Agent(BaseModel):
 
     # Performance metrics
     performance_metrics = Column(
-        JSON,
+        JSONType,
         nullable=True,
         comment="Performance metrics as JSON"
     )
@@ -92,20 +139,20 @@ class Agent(BaseModel):
 
     # Agent state and configuration
     state = Column(
-        JSON,
+        JSONType,
         nullable=True,
         comment="Current state of the agent as JSON"
     )
 
     # Task management
     current_task = Column(
-        JSON,
+        JSONType,
         nullable=True,
         comment="Current task being processed as JSON"
     )
 
     task_queue = Column(
-        JSON,
+        JSONType,
         nullable=True,
         comment="Queue of pending tasks as JSON"
     )
@@ -139,7 +186,7 @@ class Agent(BaseModel):
     )
 
     last_error = Column(
-        JSON,
+        JSONType,
         nullable=True,
         comment="Last error details as JSON"
     )
@@ -153,7 +200,7 @@ class Agent(BaseModel):
     )
 
     last_heartbeat = Column(
-        String(50),
+        DateTime(timezone=True),
         nullable=True,
         comment="Timestamp of last heartbeat"
     )
@@ -201,6 +248,9 @@ class Agent(BaseModel):
     __table_args__ = (
         Index('idx_agents_scenario_status', 'scenario_id', 'status'),
         Index('idx_agents_type_status', 'type', 'status'),
+        Index('idx_agents_scenario_type_status', 'scenario_id', 'type', 'status'),
+        # Running agents per scenario (the dispatch hot path) from a much smaller index
+        Index('idx_agents_running', 'scenario_id', postgresql_where=text("status = 'running'")),
         Index('idx_agents_created_at', 'created_at'),
         Index('idx_agents_health_score', 'health_score'),
         Index('idx_agents_last_heartbeat', 'last_heartbeat'),
@@ -216,14 +266,7 @@ class Agent(BaseModel):
         Returns:
             Description of the agent type
         """
-        type_descriptions = {
-            'S': 'Searcher - Information gathering and reconnaissance specialist',
-            'A': 'Analyst - Data analysis and situation assessment expert',
-            'F': 'Frontline - Tactical response and field operations specialist',
-            'E': 'Executive - Strategic decision making and coordination expert',
-            'E': 'Evaluator - Performance assessment and learning specialist'
-        }
-        return type_descriptions.get(self.type, 'Unknown agent type')
+        return _AGENT_TYPE_DESCRIPTIONS.get(self.type, 'Unknown agent type')
 
     def is_active(self) -> bool:
         """
@@ -254,22 +297,45 @@ class Agent(BaseModel):
                 self.is_healthy() and
                 self.error_count < 5)
 
-    def update_status(self, new_status: str, error_details: dict = None) -> None:
+    async def update_status(
+        self,
+        session: AsyncSession,
+        new_status: str,
+        error_details: dict = None
+    ) -> None:
         """
         Update agent status
 
+        The error count is incremented by the database in a separate
+        UPDATE ... RETURNING (error_count = error_count + 1), so concurrent
+        errors are not lost and the attribute holds the new value without a
+        reload.
+
         Args:
+            session: Session the agent belongs to
             new_status: New status to set
             error_details: Optional error details if status is error
         """
         self.status = new_status
 
         if new_status == 'error' and error_details:
-            self.error_count += 1
             self.last_error = error_details
-            self.health_score = max(0, self.health_score - 10)
+            self.health_score = max(0, (self.health_score or 100) - 10)
+
+            if not inspect(self).persistent:
+                # The row must exist before it can be updated
+                session.add(self)
+                await session.flush()
+            result = await session.execute(
+                update(Agent)
+                .where(Agent.id == self.id)
+                .values(error_count=func.coalesce(Agent.error_count, 0) + 1)
+                .returning(Agent.error_count)
+                .execution_options(synchronize_session=False)
+            )
+            set_committed_value(self, 'error_count', result.scalar_one())
         elif new_status == 'running':
-            self.health_score = min(100, self.health_score + 5)
+            self.health_score = min(100, (self.health_score or 100) + 5)
 
     def record_activity(self, activity_type: str, details: dict) -> None:
         """
@@ -279,30 +345,64 @@ class Agent(BaseModel):
             activity_type: Type of activity
             details: Activity details
         """
-        from datetime import datetime
-
         self.last_activity = {
             'type': activity_type,
             'details': details,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': _now_iso()
         }
 
-    def add_task(self, task: dict) -> None:
+    def _task_index(self, for_update: bool = False) -> dict:
+        """
+        Get the indexed task queue, converting legacy list-based queues
+
+        The queue is stored as ``{'tasks': {id: task}, 'pending_order': [ids],
+        'next_id': n}`` so lookups by id and the next pending task are O(1).
+        Task ids are stored as strings in ``tasks`` because JSON object keys
+        are strings.
+
+        A legacy list is converted into a new dictionary that is only stored
+        on the agent when for_update is True, so read-only callers never mark
+        the row dirty.
+
+        Args:
+            for_update: Whether the caller is about to modify the queue
+
+        Returns:
+            Indexed task queue dictionary
+
+        Raises:
+            ValueError: If the stored queue is a dictionary without the indexed shape
+        """
+        queue = self.task_queue
+        if isinstance(queue, dict):
+            if not is_task_index(queue):
+                raise ValueError(f"Agent {self.id} has a malformed task queue")
+            return queue
+
+        queue = _index_legacy_tasks(queue or [])
+        if for_update:
+            self.task_queue = queue
+        return queue
+
+    def add_task(self, task: dict, now_iso: Optional[str] = None) -> None:
         """
         Add a task to the agent's queue
 
         Args:
             task: Task details
+            now_iso: Creation timestamp to reuse when enqueuing tasks in bulk
         """
-        if self.task_queue is None:
-            self.task_queue = []
-
-        self.task_queue.append({
-            'id': len(self.task_queue) + 1,
+        queue = self._task_index(for_update=True)
+        task_id = queue['next_id']
+        queue['tasks'][str(task_id)] = {
+            'id': task_id,
             'task': task,
             'status': 'pending',
-            'created_at': datetime.utcnow().isoformat()
-        })
+            'created_at': now_iso or _now_iso()
+        }
+        queue['pending_order'].append(task_id)
+        queue['next_id'] = task_id + 1
+        flag_modified(self, 'task_queue')
 
     def get_next_task(self) -> dict:
         """
@@ -314,28 +414,38 @@ class Agent(BaseModel):
         if not self.task_queue:
             return None
 
-        # Find first pending task
-        for task in self.task_queue:
-            if task.get('status') == 'pending':
-                return task
-
-        return None
+        queue = self._task_index()
+        if not queue['pending_order']:
+            return None
+        return queue['tasks'].get(str(queue['pending_order'][0]))
 
-    def complete_task(self, task_id: int, result: dict) -> None:
+    def complete_task(self, task_id: Union[int, str], result: dict, now_iso: Optional[str] = None) -> None:
         """
         Mark a task as completed
 
         Args:
-            task_id: ID of the task to complete
+            task_id: ID of the task to complete (as an int or its string form)
             result: Task result
+            now_iso: Completion timestamp to reuse when completing tasks in bulk
         """
-        if self.task_queue:
-            for task in self.task_queue:
-                if task.get('id') == task_id:
-                    task['status'] = 'completed'
-                    task['result'] = result
-                    task['completed_at'] = datetime.utcnow().isoformat()
-                    break
+        if not self.task_queue:
+            return
+
+        queue = self._task_index(for_update=True)
+        key = str(task_id)
+        task = queue['tasks'].get(key)
+        if task is None:
+            return
+
+        if task.get('status') == 'pending':
+            # Compare as strings: ids may arrive as "3" from a URL or JSON key
+            queue['pending_order'] = [
+                pending_id for pending_id in queue['pending_order'] if str(pending_id) != key
+            ]
+        task['status'] = 'completed'
+        task['result'] = result
+        task['completed_at'] = now_iso or _now_iso()
+        flag_modified(self, 'task_queue')
 
     def get_performance_summary(self) -> dict:
         """
@@ -344,12 +454,21 @@ class Agent(BaseModel):
         Returns:
             Performance summary dictionary
         """
+        # Pending tasks are indexed; completed tasks are counted in a single pass
+        tasks_completed = tasks_pending = 0
+        if self.task_queue:
+            queue = self._task_index()
+            tasks_pending = len(queue['pending_order'])
+            for task in queue['tasks'].values():
+                if task.get('status') == 'completed':
+                    tasks_completed += 1
+
         return {
             'health_score': self.health_score,
             'error_count': self.error_count,
             'cpu_usage': self.cpu_usage,
             'memory_usage': self.memory_usage,
-            'tasks_completed': len([t for t in self.task_queue or [] if t.get('status') == 'completed']),
-            'tasks_pending': len([t for t in self.task_queue or [] if t.get('status') == 'pending']),
+            'tasks_completed': tasks_completed,
+            'tasks_pending': tasks_pending,
             'last_activity': self.last_activity
         }
\ No newline at end of file
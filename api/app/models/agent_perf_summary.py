@@ -0,0 +1,83 @@
+"""
+Agent Performance Summary View
+
+This module contains the read-only SQLAlchemy mapping of the agent_perf_summary
+PostgreSQL materialized view, which Alembic revision 0005 creates. The view
+pre-computes the per-agent figures returned by Agent.get_performance_summary so
+dashboards can summarize all agents with a single indexed scan instead of
+parsing every task queue.
+"""
+
+from sqlalchemy import DDL, Column, Float, Integer, event
+from sqlalchemy.ext.declarative import declarative_base
+
+from app.models.agent import Agent
+
+# Views are mapped on their own declarative base so Base.metadata.create_all
+# never tries to create them as tables
+ViewBase = declarative_base()
+
+AGENT_PERF_SUMMARY_VIEW = "agent_perf_summary"
+
+_DROP_AGENT_PERF_SUMMARY = DDL(f"DROP MATERIALIZED VIEW IF EXISTS {AGENT_PERF_SUMMARY_VIEW}")
+
+# The view and its unique index are created by Alembic revision 0005. Dropping
+# the agents table would fail while the view depends on it, so drop_all removes it first
+event.listen(
+    Agent.__table__, "before_drop", _DROP_AGENT_PERF_SUMMARY.execute_if(dialect="postgresql")
+)
+
+REFRESH_AGENT_PERF_SUMMARY = f"REFRESH MATERIALIZED VIEW CONCURRENTLY {AGENT_PERF_SUMMARY_VIEW}"
+
+
+class AgentPerfSummary(ViewBase):
+    """
+    Read-only mapping of the agent_perf_summary materialized view
+
+    Rows reflect the agents table as of the last refresh
+    (see app.db.database.refresh_agent_perf_summary).
+    """
+
+    __tablename__ = AGENT_PERF_SUMMARY_VIEW
+
+    agent_id = Column(
+        Integer,
+        primary_key=True,
+        comment="ID of the summarized agent"
+    )
+
+    health_score = Column(
+        Float,
+        comment="Health score of the agent (0-100)"
+    )
+
+    error_count = Column(
+        Integer,
+        comment="Number of errors encountered"
+    )
+
+    cpu_usage = Column(
+        Float,
+        comment="CPU usage percentage at refresh time"
+    )
+
+    memory_usage = Column(
+        Float,
+        comment="Memory usage in MB at refresh time"
+    )
+
+    tasks_completed = Column(
+        Integer,
+        comment="Number of completed tasks in the agent's queue"
+    )
+
+    tasks_pending = Column(
+        Integer,
+        comment="Number of pending tasks in the agent's queue"
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<AgentPerfSummary(agent_id={self.agent_id}, "
+            f"completed={self.tasks_completed}, pending={self.tasks_pending})>"
+        )
@@ -4,10 +4,43 @@ Analysis Model
 This module contains the Analysis SQLAlchemy ORM model for analysis results.
 """
 
-from sqlalchemy import Column, String, Text, JSON, Index, ForeignKey, Float, Integer
-from sqlalchemy.orm import relationship
+import warnings
+from types import MappingProxyType
+from typing import Iterable, Mapping
 
-from app.models.base import BaseModel
+from sqlalchemy import (
+    JSON, Column, Computed, String, Text, Index, ForeignKey, Float, Integer, Interval, insert, inspect, text
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import deferred, object_session, relationship, selectinload
+
+from app.models.base import BaseModel, JSONType
+from app.models.recommendation import Recommendation
+
+
+# Deferred group for the large JSON columns; list queries skip them, and code that
+# needs them loads them up front with .options(undefer_group(HEAVY_COLUMNS))
+HEAVY_COLUMNS = "heavy"
+
+_QUALITY_SCORE_COLUMNS = ('confidence_score', 'completeness_score', 'accuracy_score', 'relevance_score')
+
+# Average of the non-null quality scores (NULL when none are set); mirrors get_quality_score
+_QUALITY_SCORE_EXPRESSION = "({}) / NULLIF({}, 0)".format(
+    " + ".join(f"COALESCE({column}, 0)" for column in _QUALITY_SCORE_COLUMNS),
+    " + ".join(f"(CASE WHEN {column} IS NULL THEN 0 ELSE 1 END)" for column in _QUALITY_SCORE_COLUMNS)
+)
+
+_ANALYSIS_TYPE_DESCRIPTIONS: Mapping[str, str] = MappingProxyType({
+    'situational': 'Situational awareness and current status analysis',
+    'risk': 'Risk assessment and threat analysis',
+    'resource': 'Resource availability and allocation analysis',
+    'impact': 'Impact assessment and consequence analysis',
+    'trend': 'Trend analysis and forecasting',
+    'vulnerability': 'Vulnerability assessment',
+    'capability': 'Capability assessment and gap analysis',
+    'operational': 'Operational readiness and effectiveness analysis'
+})
 
 
 class Analysis(BaseModel):
@@ -26,11 +59,11 @@ class Analysis(BaseModel):
     )
 
     # Analysis results
-    results = Column(
-        JSON,
+    results = deferred(Column(
+        JSONType,
         nullable=True,
         comment="Analysis results as JSON"
-    )
+    ), group=HEAVY_COLUMNS)
 
     # Confidence metrics
     confidence_score = Column(
@@ -58,11 +91,11 @@ class Analysis(BaseModel):
     )
 
     # Input data
-    input_data = Column(
-        JSON,
+    input_data = deferred(Column(
+        JSONType,
         nullable=True,
         comment="Input data used for analysis as JSON"
-    )
+    ), group=HEAVY_COLUMNS)
 
     # Methodology information
     methodology = Column(
@@ -73,9 +106,9 @@ class Analysis(BaseModel):
 
     # Processing time
     processing_time = Column(
-        String(50),
+        Interval,
         nullable=True,
-        comment="Time taken to process the analysis"
+        comment="Time taken to process the analysis (set as a timedelta)"
     )
 
     # Additional fields
@@ -92,11 +125,11 @@ class Analysis(BaseModel):
     )
 
     # Data sources
-    data_sources = Column(
-        JSON,
+    data_sources = deferred(Column(
+        JSONType,
         nullable=True,
-        comment="Data sources used in the analysis"
-    )
+        comment="Deprecated: data sources used in the analysis (see data_sources table)"
+    ), group=HEAVY_COLUMNS)
 
     # Quality metrics
     completeness_score = Column(
@@ -117,6 +150,12 @@ class Analysis(BaseModel):
         comment="Relevance score of the analysis (0.0-1.0)"
     )
 
+    quality_score = Column(
+        Float,
+        Computed(_QUALITY_SCORE_EXPRESSION, persisted=True),
+        comment="Average of the non-null quality scores, computed by the database"
+    )
+
     # Review and validation
     reviewed_by = Column(
         Integer,
@@ -128,7 +167,6 @@ class Analysis(BaseModel):
     review_status = Column(
         String(20),
         nullable=True,
-        index=True,
         comment="Review status (pending, approved, rejected)"
     )
 
@@ -178,25 +216,27 @@ class Analysis(BaseModel):
     )
 
     # Recommendations
-    recommendations = Column(
-        JSON,
+    recommendations = deferred(Column(
+        JSONType,
         nullable=True,
-        comment="Analysis recommendations as JSON"
-    )
+        comment="Deprecated: analysis recommendations as JSON (see recommendations table)"
+    ), group=HEAVY_COLUMNS)
 
     # Tags and classification
+    # Text array on PostgreSQL so tag filters (Analysis.tags.contains([...]),
+    # i.e. tags @> ARRAY[...]) use the GIN index; JSON list on SQLite
     tags = Column(
-        JSON,
+        ARRAY(String(50)).with_variant(JSON(), "sqlite"),
         nullable=True,
         comment="Tags for classification and search"
     )
 
     # External references
-    external_references = Column(
-        JSON,
+    external_references = deferred(Column(
+        JSONType,
         nullable=True,
-        comment="External references and citations"
-    )
+        comment="Deprecated: external references and citations (see external_references table)"
+    ), group=HEAVY_COLUMNS)
 
     # Relationships
     agent = relationship(
@@ -209,21 +249,54 @@ class Analysis(BaseModel):
         back_populates="analysis"
     )
 
+    # decisions and child_analyses are not eager loaded; queries that need them
+    # add selectinload(...) options rather than paying for them on every select
     decisions = relationship(
         "Decision",
         back_populates="analysis",
         cascade="all, delete-orphan"
     )
 
+    # The child record collections raise instead of emitting SQL on access; code that
+    # needs them loads them up front with .options(*Analysis.child_record_loaders())
+    recommendation_records = relationship(
+        "Recommendation",
+        back_populates="analysis",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql"
+    )
+
+    data_source_records = relationship(
+        "DataSource",
+        back_populates="analysis",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql"
+    )
+
+    external_reference_records = relationship(
+        "ExternalReference",
+        back_populates="analysis",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql"
+    )
+
     reviewer = relationship(
         "User",
         foreign_keys=[reviewed_by]
     )
 
+    parent_analysis = relationship(
+        "Analysis",
+        remote_side="Analysis.id",
+        back_populates="child_analyses"
+    )
+
     child_analyses = relationship(
         "Analysis",
-        backref="parent_analysis",
-        remote_side="Analysis.id"
+        back_populates="parent_analysis"
     )
 
     # Indexes
@@ -232,14 +305,46 @@ class Analysis(BaseModel):
         Index('idx_analysis_agent_created', 'agent_id', 'created_at'),
         Index('idx_analysis_confidence', 'confidence_score'),
         Index('idx_analysis_status', 'status'),
-        Index('idx_analysis_review_status', 'review_status'),
+        # Only pending reviews are looked up by status; reviewed rows dominate the table
+        Index(
+            'idx_analysis_pending_review', 'reviewed_by',
+            postgresql_where=text("review_status = 'pending'")
+        ),
         Index('idx_analysis_impact_urgency', 'impact_level', 'urgency_level'),
         Index('idx_analysis_created_at', 'created_at'),
+        Index('idx_analysis_quality', 'quality_score'),
+        # Scenario list queries filter by status and sort by created_at; the
+        # included columns let PostgreSQL answer summary projections index-only
+        Index(
+            'idx_analysis_scenario_status_created', 'scenario_id', 'status', 'created_at',
+            postgresql_include=['confidence_score', 'title']
+        ),
+        # GIN indexes for containment (@>) lookups on PostgreSQL
+        Index('idx_analysis_tags_gin', 'tags', postgresql_using='gin'),
+        Index(
+            'idx_analysis_results_gin', 'results',
+            postgresql_using='gin',
+            postgresql_ops={'results': 'jsonb_path_ops'}
+        ),
     )
 
     def __repr__(self) -> str:
         return f"<Analysis(type='{self.type}', confidence={self.confidence_score}, status='{self.status}')>"
 
+    @classmethod
+    def child_record_loaders(cls) -> tuple:
+        """
+        Get loader options that select-in load the child record collections
+
+        Returns:
+            Options for recommendation, data source and external reference records
+        """
+        return (
+            selectinload(cls.recommendation_records),
+            selectinload(cls.data_source_records),
+            selectinload(cls.external_reference_records),
+        )
+
     def get_type_description(self) -> str:
         """
         Get human-readable description of analysis type
@@ -247,17 +352,7 @@ class Analysis(BaseModel):
         Returns:
             Description of the analysis type
         """
-        type_descriptions = {
-            'situational': 'Situational awareness and current status analysis',
-            'risk': 'Risk assessment and threat analysis',
-            'resource': 'Resource availability and allocation analysis',
-            'impact': 'Impact assessment and consequence analysis',
-            'trend': 'Trend analysis and forecasting',
-            'vulnerability': 'Vulnerability assessment',
-            'capability': 'Capability assessment and gap analysis',
-            'operational': 'Operational readiness and effectiveness analysis'
-        }
-        return type_descriptions.get(self.type, 'Unknown analysis type')
+        return _ANALYSIS_TYPE_DESCRIPTIONS.get(self.type, 'Unknown analysis type')
 
     def is_high_confidence(self) -> bool:
         """
@@ -290,6 +385,9 @@ class Analysis(BaseModel):
         """
         Calculate overall quality score
 
+        Computed in Python so unsaved score changes are reflected; use the
+        quality_score column for filtering and sorting in queries.
+
         Returns:
             Overall quality score (0.0-1.0)
         """
@@ -325,21 +423,58 @@ class Analysis(BaseModel):
         # This would need proper permission checking in a real implementation
         return True
 
+    async def add_recommendations(self, session: AsyncSession, recommendations: Iterable[dict]) -> None:
+        """
+        Add recommendations to the analysis in a single multi-row INSERT
+
+        The INSERT bypasses the unit of work, so recommendation_records is
+        expired afterwards and reloaded on next access.
+
+        Args:
+            session: Database session
+            recommendations: Recommendation details, one row per item
+        """
+        if not inspect(self).persistent:
+            # The analysis row must exist before recommendations can reference it
+            session.add(self)
+            await session.flush()
+
+        rows = [
+            {
+                'analysis_id': self.id,
+                'priority': recommendation.get('priority'),
+                'payload': recommendation
+            }
+            for recommendation in recommendations
+        ]
+        if rows:
+            await session.execute(insert(Recommendation), rows)
+            session.expire(self, ['recommendation_records'])
+
     def add_recommendation(self, recommendation: dict) -> None:
         """
         Add a recommendation to the analysis
 
+        Deprecated: use add_recommendations. The recommendation is added as a
+        Recommendation row, written on the next flush.
+
         Args:
             recommendation: Recommendation details
         """
-        if self.recommendations is None:
-            self.recommendations = []
-
-        self.recommendations.append({
-            'id': len(self.recommendations) + 1,
-            'recommendation': recommendation,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        })
+        warnings.warn(
+            "Analysis.add_recommendation is deprecated; use add_recommendations",
+            DeprecationWarning,
+            stacklevel=2
+        )
+        # The backref records the row without loading recommendation_records
+        record = Recommendation(
+            analysis=self,
+            priority=recommendation.get('priority'),
+            payload=recommendation
+        )
+        session = object_session(self)
+        if session is not None:
+            session.add(record)
 
     def get_key_findings(self) -> list:
         """
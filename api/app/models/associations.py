@@ -4,13 +4,26 @@ Association Models
 This module contains association table models for many-to-many relationships.
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
+from types import MappingProxyType
+from typing import Mapping
+
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, inspect, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import relationship
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.sql import func
 
 from app.models.base import BaseModel
 
 
+# Scenario permission name -> UserScenario flag attribute
+_PERMISSION_ATTRIBUTES: Mapping[str, str] = MappingProxyType({
+    'edit': 'can_edit',
+    'delete': 'can_delete',
+    'manage_agents': 'can_manage_agents'
+})
+
+
 class UserScenario(BaseModel):
     """
     Association table for users and scenarios (many-to-many relationship)
@@ -139,12 +152,10 @@ class UserScenario(BaseModel):
         Returns:
             True if user has permission, False otherwise
         """
-        permission_map = {
-            'edit': self.can_edit,
-            'delete': self.can_delete,
-            'manage_agents': self.can_manage_agents
-        }
-        return permission_map.get(permission, False)
+        attribute = _PERMISSION_ATTRIBUTES.get(permission)
+        if attribute is None:
+            return False
+        return getattr(self, attribute)
 
     def grant_permission(self, permission: str) -> None:
         """
@@ -153,12 +164,9 @@ class UserScenario(BaseModel):
         Args:
             permission: Permission to grant (edit, delete, manage_agents)
         """
-        if permission == 'edit':
-            self.can_edit = True
-        elif permission == 'delete':
-            self.can_delete = True
-        elif permission == 'manage_agents':
-            self.can_manage_agents = True
+        attribute = _PERMISSION_ATTRIBUTES.get(permission)
+        if attribute is not None:
+            setattr(self, attribute, True)
 
     def revoke_permission(self, permission: str) -> None:
         """
@@ -167,17 +175,37 @@ class UserScenario(BaseModel):
         Args:
             permission: Permission to revoke (edit, delete, manage_agents)
         """
-        if permission == 'edit':
-            self.can_edit = False
-        elif permission == 'delete':
-            self.can_delete = False
-        elif permission == 'manage_agents':
-            self.can_manage_agents = False
-
-    def update_access(self) -> None:
+        attribute = _PERMISSION_ATTRIBUTES.get(permission)
+        if attribute is not None:
+            setattr(self, attribute, False)
+
+    async def update_access(self, session: AsyncSession) -> None:
         """
         Update access tracking information
+
+        Both values are computed by the database in an UPDATE ... RETURNING
+        (access_count = access_count + 1, last_accessed = now()), so
+        concurrent accesses are not lost; the returned values are set on
+        this object without a reload.
+
+        Args:
+            session: Session the association belongs to
         """
-        from datetime import datetime
-        self.last_accessed = datetime.utcnow()
-        self.access_count += 1
\ No newline at end of file
+        if not inspect(self).persistent:
+            # The row must exist before it can be updated
+            session.add(self)
+            await session.flush()
+
+        result = await session.execute(
+            update(UserScenario)
+            .where(
+                UserScenario.user_id == self.user_id,
+                UserScenario.scenario_id == self.scenario_id
+            )
+            .values(access_count=UserScenario.access_count + 1, last_accessed=func.now())
+            .returning(UserScenario.access_count, UserScenario.last_accessed)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one()
+        set_committed_value(self, 'access_count', row.access_count)
+        set_committed_value(self, 'last_accessed', row.last_accessed)
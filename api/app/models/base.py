@@ -7,12 +7,17 @@ This module contains the base SQLAlchemy model class with common fields and meth
 from datetime import datetime
 from typing import Any, Dict
 
-from sqlalchemy import Column, Integer, DateTime, Boolean, text
+from sqlalchemy import Column, Integer, DateTime, Boolean, JSON, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base, declared_attr
 from sqlalchemy.sql import func
 
 Base = declarative_base()
 
+# JSON column type stored as binary JSONB on PostgreSQL (no reparse on read,
+# GIN-indexable) and as generic JSON on other dialects such as SQLite in tests
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 
 class BaseModel(Base):
     """
@@ -0,0 +1,54 @@
+"""
+Data Source Model
+
+This module contains the DataSource SQLAlchemy ORM model for analysis data sources.
+"""
+
+from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy.orm import relationship
+
+from app.models.base import BaseModel, JSONType
+
+
+class DataSource(BaseModel):
+    """
+    DataSource model storing one data source per row for an analysis
+    """
+
+    __tablename__ = "data_sources"
+
+    analysis_id = Column(
+        Integer,
+        ForeignKey("analysis.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+        comment="ID of the analysis this data source belongs to"
+    )
+
+    name = Column(
+        String(200),
+        nullable=False,
+        comment="Name of the data source"
+    )
+
+    source_type = Column(
+        String(50),
+        nullable=True,
+        index=True,
+        comment="Type of data source (sensor, report, database, api)"
+    )
+
+    details = Column(
+        JSONType,
+        nullable=True,
+        comment="Additional data source details as JSON"
+    )
+
+    # Relationships
+    analysis = relationship(
+        "Analysis",
+        back_populates="data_source_records"
+    )
+
+    def __repr__(self) -> str:
+        return f"<DataSource(analysis_id={self.analysis_id}, name='{self.name}')>"
@@ -0,0 +1,53 @@
+"""
+External Reference Model
+
+This module contains the ExternalReference SQLAlchemy ORM model for analysis external references.
+"""
+
+from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy.orm import relationship
+
+from app.models.base import BaseModel, JSONType
+
+
+class ExternalReference(BaseModel):
+    """
+    ExternalReference model storing one external reference per row for an analysis
+    """
+
+    __tablename__ = "external_references"
+
+    analysis_id = Column(
+        Integer,
+        ForeignKey("analysis.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+        comment="ID of the analysis this external reference belongs to"
+    )
+
+    title = Column(
+        String(200),
+        nullable=False,
+        comment="Title of the referenced document"
+    )
+
+    url = Column(
+        String(500),
+        nullable=True,
+        comment="URL of the referenced document"
+    )
+
+    details = Column(
+        JSONType,
+        nullable=True,
+        comment="Additional external reference details as JSON"
+    )
+
+    # Relationships
+    analysis = relationship(
+        "Analysis",
+        back_populates="external_reference_records"
+    )
+
+    def __repr__(self) -> str:
+        return f"<ExternalReference(analysis_id={self.analysis_id}, title='{self.title}')>"
@@ -0,0 +1,58 @@
+"""
+Recommendation Model
+
+This module contains the Recommendation SQLAlchemy ORM model for analysis recommendations.
+"""
+
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from sqlalchemy.orm import relationship
+
+from app.models.base import BaseModel, JSONType
+
+
+class Recommendation(BaseModel):
+    """
+    Recommendation model storing one recommendation per row for an analysis
+    """
+
+    __tablename__ = "recommendations"
+
+    analysis_id = Column(
+        Integer,
+        ForeignKey("analysis.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+        comment="ID of the analysis this recommendation belongs to"
+    )
+
+    priority = Column(
+        String(20),
+        nullable=True,
+        index=True,
+        comment="Recommendation priority (low, medium, high, critical)"
+    )
+
+    payload = Column(
+        JSONType,
+        nullable=False,
+        comment="Recommendation details as JSON"
+    )
+
+    # Relationships
+    analysis = relationship(
+        "Analysis",
+        back_populates="recommendation_records"
+    )
+
+    # Indexes
+    __table_args__ = (
+        # GIN index for JSONB containment (@>) search inside recommendations
+        Index(
+            'idx_recommendations_payload_gin', 'payload',
+            postgresql_using='gin',
+            postgresql_ops={'payload': 'jsonb_path_ops'}
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<Recommendation(analysis_id={self.analysis_id})>"
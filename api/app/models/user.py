@@ -10,6 +10,34 @@ from datetime import datetime
 
 from app.models.base import BaseModel
 
+# Fine-grained permissions granted by each user role
+ROLE_PERMISSIONS = {
+    'admin': frozenset([
+        'create_user', 'read_user', 'update_user', 'delete_user',
+        'create_scenario', 'read_scenario', 'update_scenario', 'delete_scenario',
+        'create_agent', 'read_agent', 'update_agent', 'delete_agent',
+        'create_analysis', 'read_analysis', 'update_analysis', 'delete_analysis',
+        'create_decision', 'read_decision', 'update_decision', 'delete_decision',
+        'create_resource', 'read_resource', 'update_resource', 'delete_resource',
+        'system_admin', 'view_logs'
+    ]),
+    'operator': frozenset([
+        'create_scenario', 'read_scenario', 'update_scenario',
+        'create_agent', 'read_agent', 'update_agent',
+        'create_analysis', 'read_analysis', 'update_analysis',
+        'create_decision', 'read_decision', 'update_decision',
+        'create_resource', 'read_resource', 'update_resource'
+    ]),
+    'analyst': frozenset([
+        'read_scenario', 'create_analysis', 'read_analysis', 'update_analysis',
+        'read_decision', 'create_decision', 'read_decision', 'update_decision',
+        'read_resource'
+    ]),
+    'viewer': frozenset([
+        'read_scenario', 'read_analysis', 'read_decision', 'read_resource'
+    ])
+}
+
 
 class User(BaseModel):
     """
@@ -188,34 +216,7 @@ class User(BaseModel):
         Returns:
             True if user has permission, False otherwise
         """
-        role_permissions = {
-            'admin': [
-                'create_user', 'read_user', 'update_user', 'delete_user',
-                'create_scenario', 'read_scenario', 'update_scenario', 'delete_scenario',
-                'create_agent', 'read_agent', 'update_agent', 'delete_agent',
-                'create_analysis', 'read_analysis', 'update_analysis', 'delete_analysis',
-                'create_decision', 'read_decision', 'update_decision', 'delete_decision',
-                'create_resource', 'read_resource', 'update_resource', 'delete_resource',
-                'system_admin', 'view_logs'
-            ],
-            'operator': [
-                'create_scenario', 'read_scenario', 'update_scenario',
-                'create_agent', 'read_agent', 'update_agent',
-                'create_analysis', 'read_analysis', 'update_analysis',
-                'create_decision', 'read_decision', 'update_decision',
-                'create_resource', 'read_resource', 'update_resource'
-            ],
-            'analyst': [
-                'read_scenario', 'create_analysis', 'read_analysis', 'update_analysis',
-                'read_decision', 'create_decision', 'read_decision', 'update_decision',
-                'read_resource'
-            ],
-            'viewer': [
-                'read_scenario', 'read_analysis', 'read_decision', 'read_resource'
-            ]
-        }
-
-        return permission in role_permissions.get(self.role, [])
+        return permission in ROLE_PERMISSIONS.get(self.role, frozenset())
 
     def can_access_scenario(self, scenario) -> bool:
         """
@@ -127,6 +127,19 @@ class AgentUpdate(BaseModel):
             raise ValueError("Health score must be between 0 and 100")
         return v
 
+    @validator("task_queue")
+    def validate_task_queue(cls, v):
+        """Validate task queue shape if provided"""
+        if v is not None and not (
+            isinstance(v.get("tasks"), dict)
+            and isinstance(v.get("pending_order"), list)
+            and isinstance(v.get("next_id"), int)
+        ):
+            raise ValueError(
+                "Task queue must contain 'tasks' (object), 'pending_order' (list) and 'next_id' (integer)"
+            )
+        return v
+
     class Config:
         schema_extra = {
             "example": {
@@ -161,7 +174,7 @@ class AgentInDB(AgentBase):
     error_count: Optional[float] = None
     last_error: Optional[Dict[str, Any]] = None
     health_score: Optional[float] = None
-    last_heartbeat: Optional[str] = None
+    last_heartbeat: Optional[datetime] = None
     version: Optional[str] = None
     update_available: Optional[str] = None
 
@@ -188,7 +201,7 @@ class AgentResponse(AgentBase):
     memory_usage: Optional[float] = None
     error_count: Optional[float] = None
     health_score: Optional[float] = None
-    last_heartbeat: Optional[str] = None
+    last_heartbeat: Optional[datetime] = None
     version: Optional[str] = None
 
     class Config:
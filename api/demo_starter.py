@@ -38,7 +38,7 @@ def check_dependencies():
     # 检查Python包
     required_packages = [
         "fastapi", "uvicorn", "sqlalchemy", "pydantic",
-        "python-jose", "passlib", "pytest", "requests"
+        "jwt", "passlib", "pytest", "requests"
     ]
 
     missing_packages = []
@@ -5,7 +5,7 @@ S3DA2 - SAFE BMAD System with S-A-F-E-R Agent Framework
 
 from fastapi import FastAPI, Request, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 import os
 import sys
@@ -29,9 +29,15 @@ from shared.utils.redis_client import get_redis_connection
 from app.core.config import get_settings as app_get_settings
 from app.core.exceptions import BaseCustomException, HTTPExceptionExtensions, get_http_status_code
 from app.api.v1.api import api_router
-from app.db.database import create_database_engines, close_database_connections
+from app.db.database import (
+    create_database_engines,
+    close_database_connections,
+    start_perf_summary_refresher,
+    stop_perf_summary_refresher,
+)
 from shared.utils.redis_client import check_redis_health
 from app.db.database import check_database_connection
+from app.dependencies.database import record_db_health, start_db_health_monitor, stop_db_health_monitor
 
 # Setup logging
 setup_logging()
@@ -48,6 +54,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse,
     contact={
         "name": "SAFE-BMAD Team",
         "email": "team@safe-bmad.com",
@@ -130,7 +137,7 @@ async def custom_exception_handler(request: Request, exc: BaseCustomException):
         }
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content={
             "error": exc.message,
@@ -153,9 +160,10 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         }
     )
 
-    # Extract detail content if it's a dict
+    # Extract detail content if it's a dict; copy it, since dependencies
+    # raise exceptions that share module-level detail dicts
     if isinstance(exc.detail, dict):
-        content = exc.detail
+        content = {**exc.detail}
     else:
         content = {
             "error": exc.detail,
@@ -167,7 +175,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         "path": str(request.url)
     })
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=content
     )
@@ -184,7 +192,7 @@ async def global_exception_handler(request: Request, exc: Exception):
         }
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
@@ -219,6 +227,13 @@ async def startup_event():
         else:
             logger.warning(f"Database connection issue: {db_health.get('message', 'Unknown error')}")
 
+        # Keep database liveness fresh in the background for request dependencies
+        record_db_health(db_health)
+        start_db_health_monitor()
+
+        # Keep the agent performance summary view current for dashboards
+        start_perf_summary_refresher()
+
         # Initialize Redis connection
         logger.info("Initializing Redis connection...")
         redis_client = get_redis_connection()
@@ -246,6 +261,8 @@ async def shutdown_event():
     try:
         # Close database connections
         logger.info("Closing database connections...")
+        await stop_db_health_monitor()
+        await stop_perf_summary_refresher()
         await close_database_connections()
 
         # Close Redis connections
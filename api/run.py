@@ -18,7 +18,7 @@ sys.path.insert(0, str(current_dir.parent / "shared"))
 import uvicorn
 from fastapi import FastAPI
 from fastapi.openapi.docs import get_swagger_ui_html
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 
 # Import application
 from app.api.v1.api import api_router
@@ -43,6 +43,7 @@ def create_app() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         openapi_url="/openapi.json",
+        default_response_class=ORJSONResponse,
         contact={
             "name": "SAFE-BMAD Team",
             "email": "team@safe-bmad.com",
@@ -0,0 +1,148 @@
+"""
+Agent任务队列测试
+"""
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import inspect
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.agent import Agent, is_task_index
+from app.schemas.agent import AgentUpdate
+
+NOW = "2025-01-21T13:00:00"
+
+
+def _loaded_agent(task_queue) -> Agent:
+    """创建task_queue已从数据库加载（无未提交修改）的Agent"""
+    agent = Agent(name="SAR-001", type="S", status="running")
+    set_committed_value(agent, "task_queue", task_queue)
+    return agent
+
+
+def _legacy_queue() -> list:
+    return [
+        {"id": 1, "task": {"name": "a"}, "status": "completed", "created_at": NOW},
+        {"id": 2, "task": {"name": "b"}, "status": "pending", "created_at": NOW},
+        {"id": 3, "task": {"name": "c"}, "status": "pending", "created_at": NOW},
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.database
+def test_add_and_next_task():
+    """测试添加任务后按顺序取出下一个待处理任务"""
+    agent = _loaded_agent(None)
+    agent.add_task({"name": "a"}, now_iso=NOW)
+    agent.add_task({"name": "b"}, now_iso=NOW)
+
+    assert is_task_index(agent.task_queue)
+    assert agent.task_queue["pending_order"] == [1, 2]
+    assert agent.task_queue["next_id"] == 3
+    assert agent.get_next_task() == {"id": 1, "task": {"name": "a"}, "status": "pending", "created_at": NOW}
+    assert inspect(agent).attrs.task_queue.history.has_changes()
+
+
+@pytest.mark.unit
+@pytest.mark.database
+def test_next_task_empty_queue():
+    """测试空队列没有下一个任务"""
+    assert _loaded_agent(None).get_next_task() is None
+    assert _loaded_agent({"tasks": {}, "pending_order": [], "next_id": 1}).get_next_task() is None
+
+
+@pytest.mark.unit
+@pytest.mark.database
+@pytest.mark.parametrize("task_id", [1, "1"])
+def test_complete_task(task_id):
+    """测试完成任务（整数或字符串ID）后从待处理顺序中移除"""
+    agent = _loaded_agent(None)
+    agent.add_task({"name": "a"}, now_iso=NOW)
+    agent.add_task({"name": "b"}, now_iso=NOW)
+
+    agent.complete_task(task_id, {"ok": True}, now_iso=NOW)
+
+    task = agent.task_queue["tasks"]["1"]
+    assert task["status"] == "completed"
+    assert task["result"] == {"ok": True}
+    assert task["completed_at"] == NOW
+    assert agent.task_queue["pending_order"] == [2]
+    assert agent.get_next_task()["id"] == 2
+
+
+@pytest.mark.unit
+@pytest.mark.database
+def test_complete_unknown_or_completed_task():
+    """测试完成不存在或已完成的任务不报错"""
+    agent = _loaded_agent(None)
+    agent.add_task({"name": "a"}, now_iso=NOW)
+    agent.complete_task(1, {"ok": True}, now_iso=NOW)
+
+    agent.complete_task(99, {}, now_iso=NOW)
+    agent.complete_task("1", {"again": True}, now_iso=NOW)
+
+    assert agent.task_queue["pending_order"] == []
+    assert agent.task_queue["tasks"]["1"]["result"] == {"again": True}
+
+
+@pytest.mark.unit
+@pytest.mark.database
+def test_legacy_queue_read_does_not_dirty_row():
+    """测试读取旧版列表队列时不修改Agent"""
+    agent = _loaded_agent(_legacy_queue())
+
+    assert agent.get_next_task()["id"] == 2
+    summary = agent.get_performance_summary()
+
+    assert summary["tasks_completed"] == 1
+    assert summary["tasks_pending"] == 2
+    assert isinstance(agent.task_queue, list)
+    assert not inspect(agent).attrs.task_queue.history.has_changes()
+
+
+@pytest.mark.unit
+@pytest.mark.database
+def test_legacy_queue_converted_on_write():
+    """测试写入旧版列表队列时转换为索引格式"""
+    agent = _loaded_agent(_legacy_queue())
+
+    agent.complete_task(2, {"ok": True}, now_iso=NOW)
+    agent.add_task({"name": "d"}, now_iso=NOW)
+
+    queue = agent.task_queue
+    assert is_task_index(queue)
+    assert queue["pending_order"] == [3, 4]
+    assert queue["tasks"]["2"]["status"] == "completed"
+    assert queue["tasks"]["4"]["task"] == {"name": "d"}
+    assert inspect(agent).attrs.task_queue.history.has_changes()
+
+
+@pytest.mark.unit
+@pytest.mark.database
+@pytest.mark.parametrize("task_queue", [
+    {"foo": 1},
+    {"tasks": [], "pending_order": [], "next_id": 1},
+    {"tasks": {}, "pending_order": []},
+])
+def test_malformed_queue(task_queue):
+    """测试格式错误的字典队列抛出ValueError而不是KeyError"""
+    agent = _loaded_agent(task_queue)
+
+    with pytest.raises(ValueError):
+        agent.get_next_task()
+    with pytest.raises(ValueError):
+        agent.add_task({"name": "a"})
+    with pytest.raises(ValueError):
+        agent.get_performance_summary()
+
+
+@pytest.mark.unit
+@pytest.mark.api
+def test_agent_update_validates_task_queue():
+    """测试更新Agent时校验任务队列格式"""
+    queue = {"tasks": {}, "pending_order": [], "next_id": 1}
+    assert AgentUpdate(task_queue=queue).task_queue == queue
+    assert AgentUpdate().task_queue is None
+
+    with pytest.raises(ValidationError):
+        AgentUpdate(task_queue={"foo": 1})
@@ -0,0 +1,145 @@
+"""
+分析建议存储测试
+"""
+
+import pytest
+from sqlalchemy import func, inspect, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.analysis import Analysis
+from app.models.recommendation import Recommendation
+
+RECOMMENDATIONS = [
+    {"priority": "high", "action": "Evacuate zone A"},
+    {"priority": "low", "action": "Monitor river levels"},
+    {"action": "Notify shelters"},
+]
+
+
+async def _recommendation_rows(db_session: AsyncSession, analysis_id: int) -> list:
+    result = await db_session.execute(
+        select(Recommendation.priority, Recommendation.payload)
+        .where(Recommendation.analysis_id == analysis_id)
+        .order_by(Recommendation.id)
+    )
+    return result.all()
+
+
+@pytest.mark.unit
+@pytest.mark.database
+@pytest.mark.asyncio
+async def test_add_recommendations_bulk(db_session: AsyncSession):
+    """测试批量写入建议，每条建议一行并提取优先级"""
+    analysis = Analysis(type="risk", title="Flood risk")
+    db_session.add(analysis)
+    await db_session.commit()
+
+    await analysis.add_recommendations(db_session, RECOMMENDATIONS)
+
+    rows = await _recommendation_rows(db_session, analysis.id)
+    assert [row.priority for row in rows] == ["high", "low", None]
+    assert [row.payload for row in rows] == RECOMMENDATIONS
+
+
+@pytest.mark.unit
+@pytest.mark.database
+@pytest.mark.asyncio
+async def test_add_recommendations_pending_analysis(db_session: AsyncSession):
+    """测试未写入数据库的分析先写入再关联建议"""
+    analysis = Analysis(type="risk")
+
+    await analysis.add_recommendations(db_session, RECOMMENDATIONS[:1])
+
+    assert analysis.id is not None
+    rows = await _recommendation_rows(db_session, analysis.id)
+    assert [row.payload for row in rows] == RECOMMENDATIONS[:1]
+
+
+@pytest.mark.unit
+@pytest.mark.database
+@pytest.mark.asyncio
+async def test_add_recommendations_expires_collection(db_session: AsyncSession):
+    """测试批量写入后建议集合被过期，重新加载时包含新行"""
+    analysis = Analysis(type="risk")
+    db_session.add(analysis)
+    await db_session.commit()
+    await db_session.refresh(analysis, attribute_names=["recommendation_records"])
+    assert analysis.recommendation_records == []
+
+    await analysis.add_recommendations(db_session, RECOMMENDATIONS)
+
+    assert "recommendation_records" in inspect(analysis).unloaded
+    await db_session.refresh(analysis, attribute_names=["recommendation_records"])
+    assert len(analysis.recommendation_records) == len(RECOMMENDATIONS)
+
+
+@pytest.mark.unit
+@pytest.mark.database
+@pytest.mark.asyncio
+async def test_add_recommendations_empty(db_session: AsyncSession):
+    """测试没有建议时不执行写入"""
+    analysis = Analysis(type="risk")
+    db_session.add(analysis)
+    await db_session.commit()
+
+    await analysis.add_recommendations(db_session, [])
+
+    count = await db_session.scalar(select(func.count()).select_from(Recommendation))
+    assert count == 0
+
+
+@pytest.mark.unit
+@pytest.mark.database
+@pytest.mark.asyncio
+async def test_add_recommendation_deprecated(db_session: AsyncSession):
+    """测试旧的单条写入接口发出弃用警告，并在flush时写入建议表"""
+    analysis = Analysis(type="risk")
+    db_session.add(analysis)
+    await db_session.commit()
+
+    with pytest.warns(DeprecationWarning):
+        analysis.add_recommendation({"priority": "critical", "action": "Open shelters"})
+    await db_session.flush()
+
+    rows = await _recommendation_rows(db_session, analysis.id)
+    assert [(row.priority, row.payload["action"]) for row in rows] == [("critical", "Open shelters")]
+
+
+@pytest.mark.unit
+@pytest.mark.database
+@pytest.mark.asyncio
+async def test_child_records_raise_without_loader(db_session: AsyncSession):
+    """测试未预加载时访问子记录集合抛出异常而不是隐式查询"""
+    analysis = Analysis(type="risk")
+    db_session.add(analysis)
+    await db_session.commit()
+    await analysis.add_recommendations(db_session, RECOMMENDATIONS)
+    db_session.expunge_all()
+
+    loaded = await db_session.scalar(select(Analysis).where(Analysis.id == analysis.id))
+
+    with pytest.raises(InvalidRequestError):
+        loaded.recommendation_records
+
+
+@pytest.mark.unit
+@pytest.mark.database
+@pytest.mark.asyncio
+async def test_child_record_loaders(db_session: AsyncSession):
+    """测试子记录加载选项一次性加载建议、数据源和外部引用"""
+    analysis = Analysis(type="risk")
+    db_session.add(analysis)
+    await db_session.commit()
+    await analysis.add_recommendations(db_session, RECOMMENDATIONS)
+    db_session.expunge_all()
+
+    loaded = await db_session.scalar(
+        select(Analysis)
+        .where(Analysis.id == analysis.id)
+        .options(*Analysis.child_record_loaders())
+    )
+
+    assert len(loaded.recommendation_records) == len(RECOMMENDATIONS)
+    assert loaded.data_source_records == []
+    assert loaded.external_reference_records == []
@@ -391,4 +391,83 @@ def test_login_rate_limiting(client: TestClient):
         if response.status_code == 429:
             data = response.json()
             assert data["error_code"] == "RATE_LIMIT_EXCEEDED"
-            break
\ No newline at end of file
+            break
+
+
+@pytest.mark.unit
+@pytest.mark.auth
+def test_verified_token_cache(monkeypatch):
+    """测试已验证Token缓存"""
+    import time
+    from datetime import timedelta
+    from types import SimpleNamespace
+    from app.core import security
+    from app.core.security import (
+        _token_cache, clear_token_cache, create_access_token, create_refresh_token, verify_token
+    )
+
+    # 缓存使用可控时钟，token本身的过期时间不受影响
+    now = [time.time()]
+    monkeypatch.setattr(security, "time", SimpleNamespace(time=lambda: now[0]))
+
+    clear_token_cache()
+    token = create_access_token(subject="cacheduser")
+    assert verify_token(token) == "cacheduser"
+    assert _token_cache.get(_token_cache.key_for(token)) == ("cacheduser", None)
+
+    # 缓存有效期不超过配置的TTL，限制已吊销token的可用时间
+    now[0] += _token_cache.ttl - 1
+    assert _token_cache.get(_token_cache.key_for(token)) == ("cacheduser", None)
+    now[0] += 2
+    assert _token_cache.get(_token_cache.key_for(token)) is None
+    # token仍然有效，重新验证后再次缓存
+    assert verify_token(token) == "cacheduser"
+    assert _token_cache.get(_token_cache.key_for(token)) == ("cacheduser", None)
+
+    # 缓存命中时仍然校验token类型
+    assert verify_token(token, token_type="refresh") is None
+    refresh_token = create_refresh_token(subject="cacheduser")
+    assert verify_token(refresh_token, token_type="refresh") == "cacheduser"
+
+    # 验证失败的token不会被缓存
+    expired = create_access_token(subject="cacheduser", expires_delta=timedelta(seconds=-1))
+    assert verify_token(expired) is None
+    assert _token_cache.get(_token_cache.key_for(expired)) is None
+
+    clear_token_cache()
+    assert _token_cache.get(_token_cache.key_for(token)) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+@pytest.mark.auth
+async def test_async_password_hashing():
+    """测试异步密码哈希"""
+    from app.core.security import aget_password_hash, averify_password
+
+    hashed = await aget_password_hash("testpassword123")
+    assert hashed.startswith("$2b$")
+    assert await averify_password("testpassword123", hashed) == True
+    assert await averify_password("wrongpassword", hashed) == False
+
+
+@pytest.mark.unit
+@pytest.mark.auth
+def test_rate_limiter_window():
+    """测试速率限制窗口"""
+    from app.core.security import RateLimiter
+
+    limiter = RateLimiter()
+    for remaining in (1, 0):
+        allowed, info = limiter.is_allowed("client", limit=2, window=60)
+        assert allowed
+        assert info["remaining"] == remaining
+
+    allowed, info = limiter.is_allowed("client", limit=2, window=60)
+    assert not allowed
+    assert info["remaining"] == 0
+
+    # 其他键不受影响，窗口过期后重新放行
+    assert limiter.is_allowed("other", limit=2, window=60)[0]
+    limiter.requests["client"][0] -= 61
+    assert limiter.is_allowed("client", limit=2, window=60)[0]
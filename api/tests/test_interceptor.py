@@ -0,0 +1,142 @@
+"""
+探针拦截器测试
+"""
+
+import orjson
+import pytest
+
+from app.core.monitoring.interceptor import (
+    HEALTH_BODY,
+    LIVE_BODY,
+    READY_BODY,
+    HealthCheckInterceptor,
+)
+
+
+class _DownstreamApp:
+    """记录被转发请求的ASGI应用"""
+
+    def __init__(self):
+        self.scopes = []
+
+    async def __call__(self, scope, receive, send):
+        self.scopes.append(scope)
+        if scope["type"] == "http":
+            await send({"type": "http.response.start", "status": 204, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _call(app, method: str, path: str, scope_type: str = "http"):
+    """调用ASGI应用，返回(状态码, 头部字典, 响应体)"""
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": scope_type, "path": path}
+    if scope_type == "http":
+        scope["method"] = method
+    await app(scope, _receive, send)
+
+    if not messages:
+        return None, {}, b""
+    start, body = messages
+    headers = {name.decode(): value.decode() for name, value in start["headers"]}
+    return start["status"], headers, body["body"]
+
+
+@pytest.fixture
+def downstream() -> _DownstreamApp:
+    return _DownstreamApp()
+
+
+@pytest.fixture
+def interceptor(downstream: _DownstreamApp) -> HealthCheckInterceptor:
+    return HealthCheckInterceptor(downstream)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path, body", [
+    ("/health", HEALTH_BODY),
+    ("/ready", READY_BODY),
+    ("/live", LIVE_BODY),
+])
+async def test_probe_get(interceptor, downstream, path, body):
+    """测试探针GET请求直接返回预序列化的响应体"""
+    status, headers, response_body = await _call(interceptor, "GET", path)
+
+    assert status == 200
+    assert response_body == body
+    assert headers["content-type"] == "application/json"
+    assert headers["content-length"] == str(len(body))
+    assert downstream.scopes == []
+
+
+@pytest.mark.unit
+def test_probe_bodies():
+    """测试探针响应体内容"""
+    assert orjson.loads(HEALTH_BODY)["status"] == "healthy"
+    assert orjson.loads(READY_BODY)["status"] == "ready"
+    assert orjson.loads(LIVE_BODY) == {"status": "alive"}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_probe_head(interceptor):
+    """测试HEAD请求返回空响应体，content-length与GET一致"""
+    status, headers, body = await _call(interceptor, "HEAD", "/health")
+
+    assert status == 200
+    assert body == b""
+    assert headers["content-length"] == str(len(HEALTH_BODY))
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@pytest.mark.parametrize("method", ["POST", "PUT", "DELETE"])
+async def test_probe_method_not_allowed(interceptor, downstream, method):
+    """测试探针路径上的其他方法返回405并带Allow头"""
+    status, headers, body = await _call(interceptor, method, "/ready")
+
+    assert status == 405
+    assert headers["allow"] == "GET, HEAD"
+    assert orjson.loads(body) == {"detail": "Method Not Allowed"}
+    assert headers["content-length"] == str(len(body))
+    assert downstream.scopes == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/", "/health/", "/api/v1/agents", "/version"])
+async def test_other_paths_pass_through(interceptor, downstream, path):
+    """测试非探针路径交给下游应用处理"""
+    status, _, _ = await _call(interceptor, "GET", path)
+
+    assert status == 204
+    assert [scope["path"] for scope in downstream.scopes] == [path]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@pytest.mark.parametrize("scope_type", ["websocket", "lifespan"])
+async def test_non_http_scopes_pass_through(interceptor, downstream, scope_type):
+    """测试非HTTP请求（包括探针路径）交给下游应用处理"""
+    status, _, _ = await _call(interceptor, None, "/health", scope_type=scope_type)
+
+    assert status is None
+    assert [scope["type"] for scope in downstream.scopes] == [scope_type]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_custom_bodies(downstream):
+    """测试自定义探针路径和响应体"""
+    interceptor = HealthCheckInterceptor(downstream, bodies={"/healthz": b'{"ok":true}'})
+
+    assert (await _call(interceptor, "GET", "/healthz"))[2] == b'{"ok":true}'
+    assert (await _call(interceptor, "GET", "/health"))[0] == 204
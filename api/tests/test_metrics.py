@@ -0,0 +1,267 @@
+"""
+性能指标存储测试
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.core.monitoring.metrics import (
+    MetricsCollector,
+    PerformanceMetric,
+    SUMMARY_MAX_MINUTES,
+    _LOCK_SHARDS,
+    _MinuteRollup,
+    _NS_PER_MINUTE,
+    _SeriesRing,
+)
+
+
+@pytest.fixture
+def collector() -> MetricsCollector:
+    """使用独立registry的指标收集器"""
+    return MetricsCollector(mirror_to_store={"api_request", "workflow_duration", "error"})
+
+
+def _sample_value(collector: MetricsCollector, name: str, labels: dict) -> float:
+    """读取Prometheus样本值"""
+    value = collector.registry.get_sample_value(name, labels)
+    return 0.0 if value is None else value
+
+
+@pytest.mark.unit
+def test_series_ring_wraparound():
+    """测试环形缓冲区写满后覆盖最旧的数据点"""
+    ring = _SeriesRing(capacity=3, unit="seconds")
+    for i in range(5):
+        ring.append(float(i), i)
+
+    assert ring.size == 3
+    assert ring.write_index == 2
+    assert ring.latest() == (4.0, 4)
+    assert ring.timestamps[ring.oldest_index()] == 2
+    assert sorted(ring.values) == [2.0, 3.0, 4.0]
+
+
+@pytest.mark.unit
+def test_series_ring_labels_allocated_lazily():
+    """测试标签列仅在写入带标签的数据点时分配，覆盖时清除旧标签"""
+    ring = _SeriesRing(capacity=2)
+    ring.append(1.0, 1)
+    assert ring.labels is None
+
+    ring.append(2.0, 2, {"method": "GET"})
+    ring.append(3.0, 3)
+
+    assert ring.labels == [None, {"method": "GET"}]
+
+
+@pytest.mark.unit
+def test_series_ring_discard_before_after_wraparound():
+    """测试回绕后按时间截断最旧的数据点"""
+    ring = _SeriesRing(capacity=4)
+    for i in range(6):
+        ring.append(float(i), i * 10, {"i": str(i)})
+
+    assert ring.discard_before(35) == 2
+    assert ring.size == 2
+    assert ring.timestamps[ring.oldest_index()] == 40
+    assert ring.latest() == (5.0, 50)
+
+    assert ring.discard_before(100) == 2
+    assert ring.size == 0
+    assert all(labels is None for labels in ring.labels)
+
+
+@pytest.mark.unit
+def test_minute_rollup_aggregates_window():
+    """测试分钟聚合只汇总窗口内的桶"""
+    rollup = _MinuteRollup()
+    rollup.add(100, 1.0)
+    rollup.add(100, 5.0)
+    rollup.add(101, 3.0)
+    rollup.add(103, 10.0)
+
+    assert rollup.aggregate(103, 1) == (1, 10.0, 10.0, 10.0)
+    assert rollup.aggregate(103, 5) == (4, 19.0, 1.0, 10.0)
+    assert rollup.aggregate(103, 3) == (2, 13.0, 3.0, 10.0)
+    assert rollup.aggregate(110, 5) is None
+
+
+@pytest.mark.unit
+def test_minute_rollup_bucket_rotation():
+    """测试60分钟后复用同一个桶时丢弃过期数据"""
+    rollup = _MinuteRollup()
+    rollup.add(5, 100.0)
+    rollup.add(5, 200.0)
+    rollup.add(5 + _MinuteRollup.BUCKETS, 1.0)
+
+    i = 5 % _MinuteRollup.BUCKETS
+    assert rollup.minutes[i] == 5 + _MinuteRollup.BUCKETS
+    assert rollup.counts[i] == 1
+    assert rollup.aggregate(5 + _MinuteRollup.BUCKETS, 60) == (1, 1.0, 1.0, 1.0)
+    # 过期的分钟不再计入窗口
+    assert rollup.aggregate(5, 1) is None
+
+
+@pytest.mark.unit
+def test_summarize_uses_rollup(collector: MetricsCollector):
+    """测试指标摘要基于分钟聚合计算"""
+    for duration in (0.1, 0.3, 0.2):
+        collector.record_api_request("GET", "/api/v1/agents", 200, duration)
+
+    minute = collector._series["api_request"].latest()[1] // _NS_PER_MINUTE
+    summary = collector._summarize("api_request", 5, minute)
+
+    assert summary["count"] == 3
+    assert summary["min"] == pytest.approx(0.1)
+    assert summary["max"] == pytest.approx(0.3)
+    assert summary["avg"] == pytest.approx(0.2)
+    assert summary["latest"] == pytest.approx(0.2)
+    assert summary["unit"] == "seconds"
+    assert summary["time_range_minutes"] == 5
+    assert collector._summarize("api_request", 5, minute + 10) == {}
+    assert collector.get_metrics_summary("unknown_metric") == {}
+
+
+@pytest.mark.unit
+def test_summarize_reports_effective_window(collector: MetricsCollector):
+    """测试超过上限的时间窗口按上限计算并如实返回"""
+    collector.record_api_request("GET", "/api/v1/agents", 200, 0.1)
+    minute = collector._series["api_request"].latest()[1] // _NS_PER_MINUTE
+
+    summary = collector._summarize("api_request", 1440, minute)
+
+    assert summary["time_range_minutes"] == SUMMARY_MAX_MINUTES
+    assert summary["count"] == 1
+
+
+@pytest.mark.unit
+def test_summarize_counts_points_evicted_from_ring(collector: MetricsCollector):
+    """测试分钟聚合计数包含已被环形缓冲区淘汰的数据点"""
+    collector._series_capacity = 2
+    for duration in (0.1, 0.2, 0.3):
+        collector.record_api_request("GET", "/api/v1/agents", 200, duration)
+    minute = collector._series["api_request"].latest()[1] // _NS_PER_MINUTE
+
+    summary = collector._summarize("api_request", 5, minute)
+
+    assert collector._series["api_request"].size == 2
+    assert summary["count"] == 3
+    assert summary["min"] == pytest.approx(0.1)
+
+
+@pytest.mark.unit
+def test_unmirrored_metric_not_stored(collector: MetricsCollector):
+    """测试未镜像的指标只写入Prometheus"""
+    collector.record_agent_processing_time("analyst", "analysis", 1.5)
+
+    assert "agent_processing_time" not in collector._series
+    assert _sample_value(
+        collector,
+        "agent_processing_duration_seconds_count",
+        {"agent_type": "analyst", "task_type": "analysis", "status": "success"},
+    ) == 1
+
+
+@pytest.mark.unit
+def test_record_batch(collector: MetricsCollector):
+    """测试批量记录在结束时统一写入内部存储"""
+    collector.record_batch([
+        ("record_api_request", {"method": "GET", "endpoint": "/a", "status_code": 200, "duration_seconds": 0.5}),
+        ("record_workflow_duration", {"workflow_name": "sop", "severity_level": "high", "duration_seconds": 2.0}),
+        ("record_error", {"error_type": "timeout", "component": "agent"}),
+    ])
+
+    assert collector._series["api_request"].size == 1
+    assert collector._series["workflow_duration"].latest()[0] == 2.0
+    assert collector._series["error"].size == 1
+    assert collector._batch_state.pending is None
+    assert _sample_value(
+        collector, "errors_total", {"error_type": "timeout", "component": "agent"}
+    ) == 1
+
+
+@pytest.mark.unit
+def test_record_batch_rejects_unknown_recorder(collector: MetricsCollector):
+    """测试批量记录拒绝未知的记录方法，已记录的指标仍会写入"""
+    with pytest.raises(ValueError):
+        collector.record_batch([
+            ("record_error", {"error_type": "timeout", "component": "agent"}),
+            ("cleanup_old_metrics", {}),
+        ])
+
+    assert collector._series["error"].size == 1
+    assert collector._batch_state.pending is None
+
+
+@pytest.mark.unit
+def test_lock_sharding(collector: MetricsCollector):
+    """测试同一指标始终映射到同一个分片锁"""
+    assert len(collector._locks) == _LOCK_SHARDS
+    assert collector._lock_for("api_request") is collector._lock_for("api_request")
+    assert any(collector._lock_for(f"metric_{i}") is not collector._lock_for("api_request") for i in range(64))
+
+
+@pytest.mark.unit
+def test_concurrent_writes_across_shards(collector: MetricsCollector):
+    """测试多线程并发写入不同指标时不丢失数据点"""
+    names = [f"metric_{i}" for i in range(8)]
+    for name in names:
+        collector.enable_store_mirroring(name)
+
+    def write(name: str):
+        for i in range(200):
+            collector._store_metric(PerformanceMetric(name=name, value=float(i), timestamp=time.time_ns()))
+
+    threads = [threading.Thread(target=write, args=(name,)) for name in names]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for name in names:
+        series = collector._series[name]
+        assert series.size == 200
+        assert collector._rollups[name].aggregate(series.latest()[1] // _NS_PER_MINUTE, 60)[0] == 200
+
+
+@pytest.mark.unit
+def test_flush_pending_observations_merges_counts(collector: MetricsCollector):
+    """测试缓冲的API请求按标签合并后写入Prometheus"""
+    collector._batch_observations = True
+    for _ in range(3):
+        collector.record_api_request("GET", "/a", 200, 0.1)
+    collector.record_api_request("POST", "/a", 201, 0.2)
+
+    labels = {"method": "GET", "endpoint": "/a", "status_code": "200"}
+    assert _sample_value(collector, "api_requests_total", labels) == 0
+
+    assert collector.flush_pending_observations() == 4
+    assert _sample_value(collector, "api_requests_total", labels) == 3
+    assert _sample_value(
+        collector, "api_request_duration_seconds_count", {"method": "POST", "endpoint": "/a"}
+    ) == 1
+    assert collector.flush_pending_observations() == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_stop_flushes_pending_api_requests(collector: MetricsCollector):
+    """测试停止后台收集时写出剩余的API请求观测值"""
+    # 拉长刷新间隔，确保停止前后台任务不会先写出
+    collector._flush_interval_seconds = 3600
+    await collector.start_background_collection()
+    assert collector._batch_observations
+
+    collector.record_api_request("GET", "/a", 200, 0.1)
+    labels = {"method": "GET", "endpoint": "/a", "status_code": "200"}
+    assert len(collector._pending_api_requests) == 1
+
+    await collector.stop()
+
+    assert not collector._batch_observations
+    assert not collector._pending_api_requests
+    assert collector._background_tasks == []
+    assert _sample_value(collector, "api_requests_total", labels) == 1
@@ -0,0 +1,102 @@
+"""
+模型计数器更新测试
+"""
+
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.agent import Agent
+from app.models.associations import UserScenario
+from app.models.scenario import Scenario
+from app.models.user import User
+
+
+async def _user_scenario(db_session: AsyncSession) -> UserScenario:
+    user = User(username="testuser", email="test@example.com", hashed_password="x")
+    scenario = Scenario(title="Flood response", status="active", priority="high")
+    db_session.add_all([user, scenario])
+    await db_session.flush()
+    return UserScenario(user_id=user.id, scenario_id=scenario.id)
+
+
+@pytest.mark.unit
+@pytest.mark.database
+@pytest.mark.asyncio
+async def test_update_access_pending(db_session: AsyncSession):
+    """测试未写入数据库的关联对象可以更新访问计数"""
+    user_scenario = await _user_scenario(db_session)
+
+    await user_scenario.update_access(db_session)
+
+    assert inspect(user_scenario).persistent
+    assert user_scenario.access_count == 1
+    assert user_scenario.last_accessed is not None
+
+
+@pytest.mark.unit
+@pytest.mark.database
+@pytest.mark.asyncio
+async def test_update_access_increments(db_session: AsyncSession):
+    """测试访问计数由数据库递增，读取属性无需重新加载"""
+    user_scenario = await _user_scenario(db_session)
+    db_session.add(user_scenario)
+    await db_session.commit()
+
+    await user_scenario.update_access(db_session)
+    await user_scenario.update_access(db_session)
+
+    # 属性未过期，在异步会话中直接读取不会触发隐式IO
+    assert user_scenario.access_count == 2
+    await db_session.refresh(user_scenario)
+    assert user_scenario.access_count == 2
+
+
+@pytest.mark.unit
+@pytest.mark.database
+@pytest.mark.asyncio
+async def test_agent_update_status_error(db_session: AsyncSession):
+    """测试错误状态递增错误计数并降低健康分"""
+    agent = Agent(name="SAR-001", type="S", status="running", health_score=100.0, error_count=0)
+    db_session.add(agent)
+    await db_session.commit()
+
+    await agent.update_status(db_session, "error", {"message": "timeout"})
+    await agent.update_status(db_session, "error", {"message": "timeout"})
+
+    assert agent.error_count == 2
+    assert agent.health_score == 80
+    assert agent.last_error == {"message": "timeout"}
+    await db_session.commit()
+    await db_session.refresh(agent)
+    assert agent.error_count == 2
+    assert agent.status == "error"
+
+
+@pytest.mark.unit
+@pytest.mark.database
+@pytest.mark.asyncio
+async def test_agent_update_status_pending(db_session: AsyncSession):
+    """测试未写入数据库的Agent可以记录错误"""
+    agent = Agent(name="SAR-002", type="S", status="idle", error_count=0)
+
+    await agent.update_status(db_session, "error", {"message": "crash"})
+
+    assert inspect(agent).persistent
+    assert agent.error_count == 1
+
+
+@pytest.mark.unit
+@pytest.mark.database
+@pytest.mark.asyncio
+async def test_agent_update_status_running(db_session: AsyncSession):
+    """测试恢复运行时提高健康分且不修改错误计数"""
+    agent = Agent(name="SAR-003", type="S", status="paused", health_score=90.0, error_count=3)
+    db_session.add(agent)
+    await db_session.commit()
+
+    await agent.update_status(db_session, "running")
+
+    assert agent.status == "running"
+    assert agent.health_score == 95
+    assert agent.error_count == 3
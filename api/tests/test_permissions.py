@@ -0,0 +1,193 @@
+"""
+权限依赖测试
+"""
+
+from collections import namedtuple
+
+import pytest
+from fastapi import HTTPException
+
+from app.dependencies.security import (
+    AuthContext,
+    _PERMISSIONS,
+    _ROLE_HIERARCHY,
+    _ROLE_PERMISSION_SETS,
+    _known_permission,
+    get_auth_context,
+    invalidate_user_permissions,
+    require_permission,
+    require_same_user_or_permission,
+)
+from app.models.user import ROLE_PERMISSIONS
+
+_UserRow = namedtuple("_UserRow", ["role", "is_superuser", "is_active"])
+
+
+class _FakeResult:
+    def __init__(self, row):
+        self._row = row
+
+    def first(self):
+        return self._row
+
+
+class _FakeSession:
+    """按用户ID返回预设角色的只读会话"""
+
+    def __init__(self, users):
+        self.users = users
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        user_id = statement.whereclause.right.value
+        return _FakeResult(self.users.get(user_id))
+
+
+@pytest.fixture
+def fake_users():
+    """提供按用户返回角色的请求会话，并在测试前后清空权限缓存"""
+    session = _FakeSession({})
+    invalidate_user_permissions()
+    yield session
+    invalidate_user_permissions()
+
+
+def _context(role: str, user_id: int = 1) -> AuthContext:
+    return AuthContext(
+        user_id=user_id, session=None, permissions=_ROLE_PERMISSION_SETS[role]
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.auth
+@pytest.mark.asyncio
+async def test_require_permission_allowed():
+    """测试拥有权限时返回用户ID"""
+    dependency = require_permission("create_agent")
+
+    assert await dependency(ctx=_context("operator", user_id=7)) == 7
+
+
+@pytest.mark.unit
+@pytest.mark.auth
+@pytest.mark.asyncio
+async def test_require_permission_denied():
+    """测试缺少权限时返回403"""
+    dependency = require_permission("delete_user")
+
+    with pytest.raises(HTTPException) as exc_info:
+        await dependency(ctx=_context("analyst", user_id=7))
+
+    assert exc_info.value.status_code == 403
+    assert exc_info.value.detail["error_code"] == "INSUFFICIENT_PERMISSIONS"
+
+
+@pytest.mark.unit
+@pytest.mark.auth
+def test_unknown_permission_rejected_at_build_time():
+    """测试未知权限在构建依赖时即报错"""
+    with pytest.raises(ValueError):
+        require_permission("launch_missiles")
+    with pytest.raises(ValueError):
+        require_same_user_or_permission(1, "launch_missiles")
+    with pytest.raises(ValueError):
+        _known_permission("")
+
+
+@pytest.mark.unit
+@pytest.mark.auth
+def test_known_permission_interned():
+    """测试权限名被驻留，检查时只需一次哈希查找"""
+    name = "".join(["read_", "scenario"])
+
+    assert _known_permission(name) is _known_permission("read_scenario")
+    assert _known_permission("operator") == "operator"
+
+
+@pytest.mark.unit
+@pytest.mark.auth
+def test_role_hierarchy():
+    """测试角色权限集合包含其所有下级角色名"""
+    for rank, role in enumerate(_ROLE_HIERARCHY):
+        permissions = _ROLE_PERMISSION_SETS[role]
+        assert ROLE_PERMISSIONS[role] <= permissions
+        for lower in _ROLE_HIERARCHY[:rank + 1]:
+            assert lower in permissions
+        for higher in _ROLE_HIERARCHY[rank + 1:]:
+            assert higher not in permissions
+
+    assert _PERMISSIONS == (
+        _ROLE_PERMISSION_SETS["admin"] | _ROLE_PERMISSION_SETS["operator"]
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.auth
+@pytest.mark.asyncio
+async def test_role_requirement_admits_higher_roles():
+    """测试按角色名要求权限时允许更高级别的角色"""
+    dependency = require_permission("analyst")
+
+    assert await dependency(ctx=_context("admin")) == 1
+    assert await dependency(ctx=_context("analyst")) == 1
+    with pytest.raises(HTTPException):
+        await dependency(ctx=_context("viewer"))
+
+
+@pytest.mark.unit
+@pytest.mark.auth
+@pytest.mark.asyncio
+async def test_same_user_or_permission():
+    """测试用户可访问自己的数据，访问他人数据需要权限"""
+    dependency = require_same_user_or_permission(target_user_id=5)
+
+    assert await dependency(ctx=_context("viewer", user_id=5)) == 5
+    assert await dependency(ctx=_context("admin", user_id=1)) == 1
+    with pytest.raises(HTTPException) as exc_info:
+        await dependency(ctx=_context("operator", user_id=1))
+    assert exc_info.value.status_code == 403
+
+
+@pytest.mark.unit
+@pytest.mark.auth
+@pytest.mark.asyncio
+async def test_auth_context_superuser_and_inactive(fake_users):
+    """测试超级用户获得管理员权限，停用或不存在的用户没有权限"""
+    fake_users.users.update({
+        1: _UserRow("viewer", True, True),
+        2: _UserRow("admin", False, False),
+    })
+
+    async def permissions(user_id):
+        ctx = await get_auth_context(user_id=user_id, session=fake_users)
+        assert ctx.session is fake_users
+        return ctx.permissions
+
+    assert await permissions(1) == _ROLE_PERMISSION_SETS["admin"]
+    assert await permissions(2) == frozenset()
+    assert await permissions(3) == frozenset()
+
+
+@pytest.mark.unit
+@pytest.mark.auth
+@pytest.mark.asyncio
+async def test_invalidate_after_role_update(fake_users):
+    """测试角色变更后清除缓存即生效"""
+    fake_users.users[1] = _UserRow("analyst", False, True)
+    dependency = require_permission("create_agent")
+
+    with pytest.raises(HTTPException):
+        await dependency(ctx=await get_auth_context(user_id=1, session=fake_users))
+
+    # 角色已更新，但缓存中仍是旧的权限集合
+    fake_users.users[1] = _UserRow("operator", False, True)
+    with pytest.raises(HTTPException):
+        await dependency(ctx=await get_auth_context(user_id=1, session=fake_users))
+    assert fake_users.queries == 1
+
+    invalidate_user_permissions(1)
+
+    ctx = await get_auth_context(user_id=1, session=fake_users)
+    assert await dependency(ctx=ctx) == 1
+    assert fake_users.queries == 2